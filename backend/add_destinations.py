@@ -2,13 +2,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import SessionLocal, engine, Base
+from sqlalchemy import func
+from app.database import SessionLocal
 from app.models.destination import Destination
+from app.services.ingest import ingest_rows
 import json
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
 # Comprehensive list of 100+ Nepal destinations
 destinations_data = [
     # Trekking Destinations (30)
@@ -196,37 +195,42 @@ destinations_data = [
 ]
 
 def add_destinations():
+    """Upsert the destinations above, matched to existing rows by name"""
     db = SessionLocal()
     try:
         # Check existing count
         existing_count = db.query(Destination).count()
         print(f"Current destinations in database: {existing_count}")
 
-        # Add new destinations
-        added = 0
+        # Existing destinations keep their id; new ones are numbered after the last
+        ids_by_name = dict(db.query(Destination.name, Destination.destination_id).all())
+        next_id = (db.query(func.max(Destination.destination_id)).scalar() or 0) + 1
+        rows = []
         for dest_data in destinations_data:
-            # Check if destination already exists
-            existing = db.query(Destination).filter(
-                Destination.name == dest_data['name']
-            ).first()
-
-            if not existing:
-                destination = Destination(**dest_data)
-                db.add(destination)
-                added += 1
+            destination_id = ids_by_name.get(dest_data['name'])
+            if destination_id is None:
+                destination_id = next_id
+                next_id += 1
+            rows.append({**dest_data, 'destination_id': destination_id})
+    finally:
+        db.close()
 
-        db.commit()
-        print(f"Successfully added {added} new destinations!")
+    try:
+        report = ingest_rows(rows)
+        added = sum(1 for dest_data in destinations_data if dest_data['name'] not in ids_by_name)
+        print(f"Successfully added {added} new destinations ({report.rows} upserted, {report.rejected} rejected)")
+        for error in report.errors:
+            print(f"  ⚠️  {error}")
 
         # Print final count
-        final_count = db.query(Destination).count()
-        print(f"Total destinations now: {final_count}")
+        db = SessionLocal()
+        try:
+            print(f"Total destinations now: {db.query(Destination).count()}")
+        finally:
+            db.close()
 
     except Exception as e:
         print(f"Error adding destinations: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     add_destinations()
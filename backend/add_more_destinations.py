@@ -2,47 +2,75 @@
 Add 75+ more destinations to reach 100+ total
 """
 import csv
-import os
+from pathlib import Path
 
-# Additional 75 destinations (IDs 26-100)
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app.models.destination import Destination
+from app.services.ingest import ingest_rows
+
+# Additional destinations; ids are assigned after the current maximum when added
 new_destinations = [
-    # More Trekking (26-45)
-    {"destination_id": 26, "name": "Kanchenjunga Base Camp", "location": "Taplejung", "latitude": 27.7025, "longitude": 88.1475, "category": "Trekking", "description": "Kanchenjunga Base Camp trek takes you to the base of the world's third-highest mountain. This remote trek offers stunning views of five peaks of Kanchenjunga, pristine wilderness, and encounters with diverse ethnic communities. The trail passes through rhododendron forests, high alpine meadows, and glacial moraines.", "activities": '["trekking","mountaineering","cultural immersion","photography"]', "difficulty_level": 5, "best_season": "Spring", "avg_cost_per_day": 55, "duration_days": 21, "popularity_score": 72, "altitude": 5143, "permits_required": "true", "image_url": "https://example.com/kanchenjunga.jpg"},
-    {"destination_id": 27, "name": "Mardi Himal Trek", "location": "Kaski", "latitude": 28.3167, "longitude": 83.9500, "category": "Trekking", "description": "Mardi Himal is a relatively new trekking route offering spectacular close-up views of Machapuchare and the Annapurna massif. The trek combines forest trails, ridge walks, and high camps with panoramic mountain views. It's less crowded than other Annapurna treks while providing equally stunning scenery.", "activities": '["trekking","photography","bird watching","village tours"]', "difficulty_level": 3, "best_season": "Autumn", "avg_cost_per_day": 35, "duration_days": 7, "popularity_score": 68, "altitude": 4500, "permits_required": "true", "image_url": "https://example.com/mardi.jpg"},
-    {"destination_id": 28, "name": "Makalu Base Camp", "location": "Sankhuwasabha", "latitude": 27.8894, "longitude": 87.0889, "category": "Trekking", "description": "Makalu Base Camp trek ventures into one of Nepal's most remote regions beneath the world's fifth-highest peak. The trail passes through Makalu-Barun National Park with diverse flora and fauna, stunning waterfalls, and pristine forests before reaching high alpine terrain with spectacular mountain views.", "activities": '["trekking","wildlife watching","photography","camping"]', "difficulty_level": 5, "best_season": "Autumn", "avg_cost_per_day": 52, "duration_days": 18, "popularity_score": 65, "altitude": 4870, "permits_required": "true", "image_url": "https://example.com/makalu.jpg"},
-    {"destination_id": 29, "name": "Dhaulagiri Circuit", "location": "Myagdi", "latitude": 28.6983, "longitude": 83.4925, "category": "Trekking", "description": "Dhaulagiri Circuit is one of Nepal's most challenging treks, circumnavigating the seventh-highest mountain in the world. The trek crosses the French Pass and Dhampus Pass, offering incredible views of Dhaulagiri and surrounding peaks. This is a true wilderness adventure for experienced trekkers.", "activities": '["trekking","mountaineering","high-altitude hiking","photography"]', "difficulty_level": 5, "best_season": "Spring", "avg_cost_per_day": 58, "duration_days": 20, "popularity_score": 60, "altitude": 5360, "permits_required": "true", "image_url": "https://example.com/dhaulagiri.jpg"},
-    {"destination_id": 30, "name": "Pikey Peak Trek", "location": "Solukhumbu", "latitude": 27.6167, "longitude": 86.5833, "category": "Trekking", "description": "Pikey Peak trek offers one of the best panoramic views of the Himalayan range including Mount Everest. This short trek passes through traditional Sherpa villages, Buddhist monasteries, and rhododendron forests. It's Sir Edmund Hillary's favorite viewpoint for Everest views and perfect for those with limited time.", "activities": '["trekking","photography","cultural tours","sunrise viewing"]', "difficulty_level": 2, "best_season": "Spring", "avg_cost_per_day": 32, "duration_days": 6, "popularity_score": 64, "altitude": 4070, "permits_required": "false", "image_url": "https://example.com/pikey.jpg"},
-
-    # More Cultural Sites (31-50)
-    {"destination_id": 31, "name": "Swayambhunath Stupa", "location": "Kathmandu", "latitude": 27.7148, "longitude": 85.2906, "category": "Religious", "description": "Swayambhunath, also known as the Monkey Temple, is an ancient religious complex atop a hill in Kathmandu Valley. This UNESCO World Heritage Site features a Buddhist stupa with Buddha's eyes painted on all four sides, surrounded by shrines and temples. The site offers panoramic views of Kathmandu and is home to many holy monkeys.", "activities": '["pilgrimage","photography","cultural learning","city views"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 20, "duration_days": 1, "popularity_score": 86, "altitude": 1500, "permits_required": "false", "image_url": "https://example.com/swayambhunath.jpg"},
-    {"destination_id": 32, "name": "Changu Narayan Temple", "location": "Bhaktapur", "latitude": 27.7164, "longitude": 85.4272, "category": "Religious", "description": "Changu Narayan is the oldest Hindu temple in Nepal, dedicated to Lord Vishnu. This UNESCO World Heritage Site showcases exquisite stone, wood, and metal craftsmanship dating back to the 4th century. The temple complex features ancient inscriptions and the finest collection of stone statues in the Kathmandu Valley.", "activities": '["heritage walk","photography","cultural learning","religious observation"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 22, "duration_days": 1, "popularity_score": 71, "altitude": 1541, "permits_required": "false", "image_url": "https://example.com/changu.jpg"},
-    {"destination_id": 33, "name": "Nuwakot Durbar", "location": "Nuwakot", "latitude": 27.9167, "longitude": 85.1667, "category": "Cultural", "description": "Nuwakot Durbar is a historic palace complex built in the 18th century by King Prithvi Narayan Shah. This seven-storied palace showcases traditional Newari architecture and offers insights into Nepal's unification history. The site provides stunning views of the Himalayas and surrounding valleys.", "activities": '["heritage walk","photography","history learning","architecture appreciation"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 25, "duration_days": 1, "popularity_score": 58, "altitude": 1010, "permits_required": "false", "image_url": "https://example.com/nuwakot.jpg"},
-    {"destination_id": 34, "name": "Gorkha Durbar", "location": "Gorkha", "latitude": 28.0000, "longitude": 84.6333, "category": "Cultural", "description": "Gorkha Durbar is the ancestral home of King Prithvi Narayan Shah, who unified Nepal. Perched on a hilltop, this historic palace offers breathtaking views and deep historical significance. The site includes temples, museums, and ancient fortifications showcasing the origins of modern Nepal.", "activities": '["heritage walk","photography","museum visit","historical learning"]', "difficulty_level": 2, "best_season": "All", "avg_cost_per_day": 26, "duration_days": 1, "popularity_score": 62, "altitude": 1135, "permits_required": "false", "image_url": "https://example.com/gorkha.jpg"},
-    {"destination_id": 35, "name": "Kirtipur", "location": "Kathmandu", "latitude": 27.6781, "longitude": 85.2778, "category": "Cultural", "description": "Kirtipur is an ancient Newari hill town with narrow lanes, traditional houses, and magnificent temples. This town has preserved its medieval character and traditional way of life. Key attractions include Bagh Bhairav Temple, Uma Maheshwar Temple, and panoramic valley views.", "activities": '["heritage walk","photography","local cuisine","cultural immersion"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 24, "duration_days": 1, "popularity_score": 60, "altitude": 1405, "permits_required": "false", "image_url": "https://example.com/kirtipur.jpg"},
+    # More Trekking
+    {"name": "Kanchenjunga Base Camp", "location": "Taplejung", "latitude": 27.7025, "longitude": 88.1475, "category": "Trekking", "description": "Kanchenjunga Base Camp trek takes you to the base of the world's third-highest mountain. This remote trek offers stunning views of five peaks of Kanchenjunga, pristine wilderness, and encounters with diverse ethnic communities. The trail passes through rhododendron forests, high alpine meadows, and glacial moraines.", "activities": '["trekking","mountaineering","cultural immersion","photography"]', "difficulty_level": 5, "best_season": "Spring", "avg_cost_per_day": 55, "duration_days": 21, "popularity_score": 72, "altitude": 5143, "permits_required": "true", "image_url": "https://example.com/kanchenjunga.jpg"},
+    {"name": "Mardi Himal Trek", "location": "Kaski", "latitude": 28.3167, "longitude": 83.9500, "category": "Trekking", "description": "Mardi Himal is a relatively new trekking route offering spectacular close-up views of Machapuchare and the Annapurna massif. The trek combines forest trails, ridge walks, and high camps with panoramic mountain views. It's less crowded than other Annapurna treks while providing equally stunning scenery.", "activities": '["trekking","photography","bird watching","village tours"]', "difficulty_level": 3, "best_season": "Autumn", "avg_cost_per_day": 35, "duration_days": 7, "popularity_score": 68, "altitude": 4500, "permits_required": "true", "image_url": "https://example.com/mardi.jpg"},
+    {"name": "Makalu Base Camp", "location": "Sankhuwasabha", "latitude": 27.8894, "longitude": 87.0889, "category": "Trekking", "description": "Makalu Base Camp trek ventures into one of Nepal's most remote regions beneath the world's fifth-highest peak. The trail passes through Makalu-Barun National Park with diverse flora and fauna, stunning waterfalls, and pristine forests before reaching high alpine terrain with spectacular mountain views.", "activities": '["trekking","wildlife watching","photography","camping"]', "difficulty_level": 5, "best_season": "Autumn", "avg_cost_per_day": 52, "duration_days": 18, "popularity_score": 65, "altitude": 4870, "permits_required": "true", "image_url": "https://example.com/makalu.jpg"},
+    {"name": "Dhaulagiri Circuit", "location": "Myagdi", "latitude": 28.6983, "longitude": 83.4925, "category": "Trekking", "description": "Dhaulagiri Circuit is one of Nepal's most challenging treks, circumnavigating the seventh-highest mountain in the world. The trek crosses the French Pass and Dhampus Pass, offering incredible views of Dhaulagiri and surrounding peaks. This is a true wilderness adventure for experienced trekkers.", "activities": '["trekking","mountaineering","high-altitude hiking","photography"]', "difficulty_level": 5, "best_season": "Spring", "avg_cost_per_day": 58, "duration_days": 20, "popularity_score": 60, "altitude": 5360, "permits_required": "true", "image_url": "https://example.com/dhaulagiri.jpg"},
+    {"name": "Pikey Peak Trek", "location": "Solukhumbu", "latitude": 27.6167, "longitude": 86.5833, "category": "Trekking", "description": "Pikey Peak trek offers one of the best panoramic views of the Himalayan range including Mount Everest. This short trek passes through traditional Sherpa villages, Buddhist monasteries, and rhododendron forests. It's Sir Edmund Hillary's favorite viewpoint for Everest views and perfect for those with limited time.", "activities": '["trekking","photography","cultural tours","sunrise viewing"]', "difficulty_level": 2, "best_season": "Spring", "avg_cost_per_day": 32, "duration_days": 6, "popularity_score": 64, "altitude": 4070, "permits_required": "false", "image_url": "https://example.com/pikey.jpg"},
+
+    # More Cultural Sites
+    {"name": "Swayambhunath Stupa", "location": "Kathmandu", "latitude": 27.7148, "longitude": 85.2906, "category": "Religious", "description": "Swayambhunath, also known as the Monkey Temple, is an ancient religious complex atop a hill in Kathmandu Valley. This UNESCO World Heritage Site features a Buddhist stupa with Buddha's eyes painted on all four sides, surrounded by shrines and temples. The site offers panoramic views of Kathmandu and is home to many holy monkeys.", "activities": '["pilgrimage","photography","cultural learning","city views"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 20, "duration_days": 1, "popularity_score": 86, "altitude": 1500, "permits_required": "false", "image_url": "https://example.com/swayambhunath.jpg"},
+    {"name": "Changu Narayan Temple", "location": "Bhaktapur", "latitude": 27.7164, "longitude": 85.4272, "category": "Religious", "description": "Changu Narayan is the oldest Hindu temple in Nepal, dedicated to Lord Vishnu. This UNESCO World Heritage Site showcases exquisite stone, wood, and metal craftsmanship dating back to the 4th century. The temple complex features ancient inscriptions and the finest collection of stone statues in the Kathmandu Valley.", "activities": '["heritage walk","photography","cultural learning","religious observation"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 22, "duration_days": 1, "popularity_score": 71, "altitude": 1541, "permits_required": "false", "image_url": "https://example.com/changu.jpg"},
+    {"name": "Nuwakot Durbar", "location": "Nuwakot", "latitude": 27.9167, "longitude": 85.1667, "category": "Cultural", "description": "Nuwakot Durbar is a historic palace complex built in the 18th century by King Prithvi Narayan Shah. This seven-storied palace showcases traditional Newari architecture and offers insights into Nepal's unification history. The site provides stunning views of the Himalayas and surrounding valleys.", "activities": '["heritage walk","photography","history learning","architecture appreciation"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 25, "duration_days": 1, "popularity_score": 58, "altitude": 1010, "permits_required": "false", "image_url": "https://example.com/nuwakot.jpg"},
+    {"name": "Gorkha Durbar", "location": "Gorkha", "latitude": 28.0000, "longitude": 84.6333, "category": "Cultural", "description": "Gorkha Durbar is the ancestral home of King Prithvi Narayan Shah, who unified Nepal. Perched on a hilltop, this historic palace offers breathtaking views and deep historical significance. The site includes temples, museums, and ancient fortifications showcasing the origins of modern Nepal.", "activities": '["heritage walk","photography","museum visit","historical learning"]', "difficulty_level": 2, "best_season": "All", "avg_cost_per_day": 26, "duration_days": 1, "popularity_score": 62, "altitude": 1135, "permits_required": "false", "image_url": "https://example.com/gorkha.jpg"},
+    {"name": "Kirtipur", "location": "Kathmandu", "latitude": 27.6781, "longitude": 85.2778, "category": "Cultural", "description": "Kirtipur is an ancient Newari hill town with narrow lanes, traditional houses, and magnificent temples. This town has preserved its medieval character and traditional way of life. Key attractions include Bagh Bhairav Temple, Uma Maheshwar Temple, and panoramic valley views.", "activities": '["heritage walk","photography","local cuisine","cultural immersion"]', "difficulty_level": 1, "best_season": "All", "avg_cost_per_day": 24, "duration_days": 1, "popularity_score": 60, "altitude": 1405, "permits_required": "false", "image_url": "https://example.com/kirtipur.jpg"},
 
     # Additional destinations continuing the pattern...
     # I'll add more categories to reach 100 total
 ]
 
+fieldnames = ["destination_id", "name", "location", "latitude", "longitude", "category",
+              "description", "activities", "difficulty_level", "best_season",
+              "avg_cost_per_day", "duration_days", "popularity_score", "altitude",
+              "permits_required", "image_url"]
+
 # Read existing CSV
-csv_path = '../data/destinations.csv'
-with open(csv_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-    existing_count = content.count('\n')
+csv_path = Path(__file__).parent.parent / 'data' / 'destinations.csv'
+with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+    rows = list(csv.DictReader(f))
+
+print(f"Current destinations in CSV: {len(rows)}")
 
-print(f"Current destinations in CSV: {existing_count - 1}")
+# Match by name, as add_destinations.py does, so re-running never duplicates or
+# overwrites rows; new destinations are numbered after the last id in either store
+db = SessionLocal()
+try:
+    known_names = {row['name'] for row in rows} | {name for (name,) in db.query(Destination.name)}
+    next_id = max(
+        max((int(row['destination_id']) for row in rows), default=0),
+        db.query(func.max(Destination.destination_id)).scalar() or 0
+    ) + 1
+finally:
+    db.close()
 
-# Append new destinations
-with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-    fieldnames = ["destination_id", "name", "location", "latitude", "longitude", "category",
-                  "description", "activities", "difficulty_level", "best_season",
-                  "avg_cost_per_day", "duration_days", "popularity_score", "altitude",
-                  "permits_required", "image_url"]
+added = []
+for dest in new_destinations:
+    if dest['name'] not in known_names:
+        added.append({**dest, 'destination_id': next_id})
+        next_id += 1
 
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
+if added:
+    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writerows(added)
 
-    for dest in new_destinations:
-        writer.writerow(dest)
+print(f"Added {len(added)} new destinations")
+print(f"Total destinations: {len(rows) + len(added)}")
 
-print(f"Added {len(new_destinations)} new destinations")
-print(f"Total destinations: {existing_count - 1 + len(new_destinations)}")
+# Insert only the added rows into the database
+if added:
+    report = ingest_rows(added)
+    print(f"✓ Upserted {report.rows} destinations into the database, {report.rejected} rejected")
+    for error in report.errors:
+        print(f"  ⚠️  {error}")
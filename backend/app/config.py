@@ -11,6 +11,58 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Authenticated-user cache (decoded tokens and user rows)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # Password hashing (bcrypt on a dedicated process pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_DEPTH: int = 64
+
+    # In-memory destination catalog: how often (seconds) it is reloaded to pick
+    # up writes made by other processes (local writes reload it immediately)
+    CATALOG_REFRESH_INTERVAL_SECONDS: int = 30
+
+    # ML model artifact (fitted recommender persisted between restarts)
+    MODEL_ARTIFACT_PATH: str = "./artifacts/recommender.joblib"
+    # How often (seconds) a worker checks the destinations table for changes
+    MODEL_REFRESH_INTERVAL_SECONDS: int = 60
+    # Out-of-vocabulary rate increase (0-1) that forces a full TF-IDF refit
+    MODEL_VOCAB_DRIFT_THRESHOLD: float = 0.15
+    # Number of "more like this" neighbours precomputed per destination
+    SIMILAR_TOP_K: int = 20
+
+    # Location-aware recommendations (near=lat,lon): destinations within the
+    # radius get their score multiplied by up to 1 + weight, fading with distance
+    NEARBY_BOOST_RADIUS_KM: float = 100.0
+    NEARBY_BOOST_WEIGHT: float = 0.5
+
+    # Itinerary route ordering: time budget for the optimizer, and how travel
+    # distance (straight-line km) turns into transfer days
+    ITINERARY_ROUTE_TIME_BUDGET_MS: float = 5.0
+    ITINERARY_SAME_DAY_TRANSFER_KM: float = 50.0
+    ITINERARY_TRANSFER_KM_PER_DAY: float = 150.0
+
+    # Itinerary auto-generation: hard time budget for the knapsack selection,
+    # and the number of buckets the trip budget is split into
+    ITINERARY_SELECTION_TIME_BUDGET_MS: float = 50.0
+    ITINERARY_SELECTION_COST_BUCKETS: int = 200
+
+    # Bulk destination ingest (ingest_destinations.py): rows per upsert transaction
+    INGEST_BATCH_SIZE: int = 1000
+
+    # Bulk export routes: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Recommendation result cache
+    RECOMMENDATION_CACHE_SIZE: int = 10000
+    RECOMMENDATION_CACHE_TTL_SECONDS: int = 300
+
+    # Materialized recommendations (precompute_recommendations.py)
+    PRECOMPUTE_TOP_N: int = 50
+    PRECOMPUTE_CHUNK_SIZE: int = 500
+
     # CORS
     ALLOWED_ORIGINS: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.database import SessionLocal
+from app.ml_engine.recommender import recommender
+from app.services.catalog import catalog
 from app.routes import auth, destinations, recommendations, itineraries
+from app.utils.auth import password_hasher
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -17,6 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Register routers
@@ -26,6 +31,40 @@ app.include_router(recommendations.router, prefix="/api/recommendations", tags=[
 app.include_router(itineraries.router, prefix="/api/itineraries", tags=["Itineraries"])
 
 
+@app.on_event("startup")
+def load_recommender():
+    """Load the persisted recommender so the first request does not pay for training"""
+    db = SessionLocal()
+    try:
+        recommender.load_or_train(db, settings.MODEL_ARTIFACT_PATH)
+    except ValueError as e:
+        # Empty catalog: the model will be trained lazily once data exists
+        print(f"Warning: recommender not loaded at startup: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def load_catalog():
+    """Build the in-memory destination catalog used by the browse routes"""
+    try:
+        catalog.ensure_fresh()
+    except Exception as e:
+        print(f"Warning: destination catalog not loaded at startup: {e}")
+
+
+@app.on_event("startup")
+def start_password_hasher():
+    """Spawn the password hashing workers before traffic arrives"""
+    password_hasher.start()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    """Stop the password hashing process pool"""
+    password_hasher.shutdown()
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -0,0 +1,79 @@
+"""
+Model artifact store for NepalTourAI
+Persists the fitted recommender to disk so workers load it instead of retraining.
+Per-row content hashes let the recommender detect catalog changes incrementally.
+"""
+import hashlib
+import os
+from dataclasses import fields
+from typing import Dict, Iterable, Optional
+
+import joblib
+
+# Bump whenever the set or meaning of persisted fields changes
+ARTIFACT_VERSION = 6
+
+# Destination columns that influence the trained model
+CATALOG_HASH_FIELDS = (
+    'destination_id', 'name', 'category', 'description', 'difficulty_level',
+    'best_season', 'avg_cost_per_day', 'popularity_score', 'altitude',
+    'permits_required', 'image_url', 'latitude', 'longitude',
+)
+
+
+def compute_row_hashes(destinations: Iterable) -> Dict[int, str]:
+    """Hash the model-relevant fields of each destination row, keyed by id"""
+
+    row_hashes = {}
+    for dest in destinations:
+        row = '\x1f'.join(str(getattr(dest, field)) for field in CATALOG_HASH_FIELDS)
+        row_hashes[dest.destination_id] = hashlib.sha1(row.encode('utf-8')).hexdigest()
+    return row_hashes
+
+
+def compute_catalog_hash(row_hashes: Dict[int, str]) -> str:
+    """Combine per-row hashes into one catalog hash, independent of row order"""
+
+    digest = hashlib.sha256()
+    for dest_id in sorted(row_hashes):
+        digest.update(f"{dest_id}:{row_hashes[dest_id]};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def save_artifact(snapshot, path: str):
+    """Write a fitted model snapshot to disk atomically"""
+
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'catalog_hash': snapshot.catalog_hash,
+        'snapshot': {field.name: getattr(snapshot, field.name) for field in fields(snapshot)},
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Write to a temp file first so readers never see a partial artifact
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: str) -> Optional[Dict]:
+    """
+    Load a persisted artifact's snapshot fields, or None if the artifact is
+    missing or from another version
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    try:
+        artifact = joblib.load(path)
+    except Exception as e:
+        print(f"Warning: could not load model artifact {path}: {e}")
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get('version') != ARTIFACT_VERSION:
+        return None
+
+    return artifact['snapshot']
@@ -0,0 +1,102 @@
+"""
+Materialized recommendations for NepalTourAI
+Scores users in chunks with the batch engine and stores their top-N lists
+in the recommendations table, so the API can serve them without scoring.
+"""
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.preference import UserPreference
+from app.models.recommendation import Recommendation
+from app.ml_engine.recommender import (
+    TourismRecommender,
+    recommender as default_recommender,
+    preferences_to_dict,
+    preferences_hash,
+)
+
+
+def _store_chunk(
+    db: Session,
+    recommender: TourismRecommender,
+    prefs_rows: List[UserPreference],
+    top_n: int
+) -> int:
+    """Score one chunk of users and replace their stored rows in bulk"""
+
+    # One preference row per user (the first one wins, as in the API)
+    prefs_rows = list({prefs.user_id: prefs for prefs in reversed(prefs_rows)}.values())[::-1]
+    prefs_dicts = [preferences_to_dict(prefs) for prefs in prefs_rows]
+
+    # Read the version before scoring: if a refresh lands mid-batch the rows
+    # are labelled with the older version and simply get rescored later
+    model_version = recommender.model_version
+    batch = recommender.get_recommendations_batch(prefs_dicts, db, n_recommendations=top_n)
+
+    rows = []
+    for prefs, prefs_dict, recommendations in zip(prefs_rows, prefs_dicts, batch):
+        prefs_key = preferences_hash(prefs_dict)
+        for rank, (dest_id, _, score) in enumerate(recommendations, start=1):
+            rows.append({
+                'user_id': prefs.user_id,
+                'destination_id': dest_id,
+                'score': round(score, 4),
+                'rank': rank,
+                'model_version': model_version,
+                'preference_hash': prefs_key,
+            })
+
+    db.execute(delete(Recommendation).where(
+        Recommendation.user_id.in_([prefs.user_id for prefs in prefs_rows])
+    ))
+    if rows:
+        db.execute(insert(Recommendation), rows)
+    db.commit()
+
+    return len(rows)
+
+
+def precompute_recommendations(
+    db: Session,
+    user_ids: Optional[Iterable[int]] = None,
+    top_n: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    recommender: TourismRecommender = default_recommender
+) -> int:
+    """
+    Recompute stored top-N lists for every user with preferences
+    (or only the given users). Returns the number of users processed.
+    """
+
+    top_n = top_n or settings.PRECOMPUTE_TOP_N
+    chunk_size = chunk_size or settings.PRECOMPUTE_CHUNK_SIZE
+    recommender.ensure_fresh(db)
+
+    query = db.query(UserPreference)
+    if user_ids is not None:
+        query = query.filter(UserPreference.user_id.in_(list(user_ids)))
+
+    start = time.perf_counter()
+    users = 0
+    last_user_id = 0
+
+    # Walk users in user_id order so each chunk is a cheap range query
+    while True:
+        prefs_rows = query.filter(
+            UserPreference.user_id > last_user_id
+        ).order_by(UserPreference.user_id).limit(chunk_size).all()
+
+        if not prefs_rows:
+            break
+
+        _store_chunk(db, recommender, prefs_rows, top_n)
+        users += len(prefs_rows)
+        last_user_id = prefs_rows[-1].user_id
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Precomputed recommendations for {users} users in {elapsed:.2f}s")
+    return users
@@ -1,29 +1,376 @@
 """
 ML-based Recommendation Engine for NepalTourAI
 Implements hybrid approach: KNN + Content-Based Filtering (TF-IDF)
+
+The fitted state lives in an immutable ModelSnapshot. Training and refreshes
+build a new snapshot off to the side and publish it with a single reference
+swap, so request threads always read one consistent model.
 """
+import hashlib
+import json
+import threading
+import time
 import numpy as np
 import pandas as pd
-from sklearn.neighbors import NearestNeighbors
+from dataclasses import dataclass, replace
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Tuple
+from sklearn.metrics.pairwise import euclidean_distances
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database import SessionLocal
 from app.models.destination import Destination
+from app.models.preference import UserPreference
+from app.ml_engine import model_store
+from app.ml_engine.spatial import SpatialIndex
+from app.services.catalog_version import read_catalog_version
+
+# Features for KNN
+KNN_FEATURES = [
+    'difficulty_level', 'avg_cost_per_day', 'popularity_score',
+    'altitude', 'permits_required',
+    'cat_trekking', 'cat_cultural', 'cat_religious',
+    'cat_nature', 'cat_wildlife', 'cat_adventure',
+    'season_spring', 'season_summer', 'season_autumn',
+    'season_winter', 'season_all'
+]
+
+# Tokenization shared by the TF-IDF content model and the search index
+TEXT_ANALYZER_OPTIONS = {'stop_words': 'english'}
+
+# Upper bound on (rows x catalog) cells scored at once (~32 MB of float64)
+SCORE_CHUNK_CELLS = 4_000_000
+
+
+def preferences_to_dict(prefs: UserPreference) -> Dict:
+    """Convert a stored preference row to the dict the ML engine expects"""
+    return {
+        'interests': prefs.interests or {},
+        'budget_range': prefs.budget_range or 'mid-range',
+        'fitness_level': prefs.fitness_level or 3,
+        'difficulty_preference': prefs.difficulty_preference or 2,
+        'preferred_seasons': prefs.preferred_seasons or ['Spring', 'Autumn']
+    }
+
+
+def preferences_hash(user_preferences: Dict) -> str:
+    """Stable hash of the preference fields that affect scoring"""
+    encoded = json.dumps(user_preferences, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact top-k per row: argpartition, then sort only the k winners"""
+
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(int), empty
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _count_oov_tokens(vectorizer: TfidfVectorizer, descriptions: List[str]) -> Tuple[int, int]:
+    """Count description tokens and how many fall outside the TF-IDF vocabulary"""
+
+    analyzer = vectorizer.build_analyzer()
+    vocabulary = vectorizer.vocabulary_
+
+    tokens = 0
+    oov_tokens = 0
+    for description in descriptions:
+        for token in analyzer(description):
+            tokens += 1
+            if token not in vocabulary:
+                oov_tokens += 1
+    return tokens, oov_tokens
+
+
+def _similarity_scores(
+    feature_matrix: np.ndarray,
+    tfidf_matrix: sparse.csr_matrix,
+    tfidf_matrix_t: sparse.csr_matrix,
+    rows: np.ndarray,
+    columns: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Item-to-item similarity of the given rows against the given columns (all
+    rows by default; tfidf_matrix_t must hold the transposed TF-IDF rows of
+    those columns). Blends TF-IDF cosine with feature-space similarity using
+    the same 60/40 weights as the hybrid user scorer.
+    """
+
+    column_features = feature_matrix if columns is None else feature_matrix[columns]
+    content_scores = (tfidf_matrix[rows] @ tfidf_matrix_t).toarray()
+    feature_scores = 1 / (1 + euclidean_distances(feature_matrix[rows], column_features))
+    return 0.6 * feature_scores + 0.4 * content_scores
+
+
+def _similarity_rows(
+    feature_matrix: np.ndarray,
+    tfidf_matrix: sparse.csr_matrix,
+    tfidf_matrix_t: sparse.csr_matrix,
+    dest_ids: np.ndarray,
+    rows: np.ndarray,
+    top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-K most similar destinations for the given rows, against the whole catalog"""
+
+    n_items = feature_matrix.shape[0]
+    similar_ids = np.empty((len(rows), top_k), dtype=np.int32)
+    similar_scores = np.empty((len(rows), top_k), dtype=np.float32)
+
+    # Work in row chunks so memory stays bounded on large catalogs
+    chunk_size = max(1, SCORE_CHUNK_CELLS // n_items)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        scores = _similarity_scores(feature_matrix, tfidf_matrix, tfidf_matrix_t, chunk)
+
+        # A destination is never similar to itself
+        scores[np.arange(len(chunk)), chunk] = -np.inf
+
+        top, top_scores = _top_k(scores, top_k)
+        similar_ids[start:start + len(chunk)] = dest_ids[top]
+        similar_scores[start:start + len(chunk)] = top_scores
+
+    return similar_ids, similar_scores
+
+
+def _similarity_width(n_items: int) -> int:
+    return max(min(settings.SIMILAR_TOP_K, n_items - 1), 0)
+
+
+def _build_similarity(
+    feature_matrix: np.ndarray,
+    tfidf_matrix: sparse.csr_matrix,
+    tfidf_matrix_t: sparse.csr_matrix,
+    dest_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Precompute the top-K most similar destinations for every destination"""
+
+    n_items = feature_matrix.shape[0]
+    return _similarity_rows(
+        feature_matrix, tfidf_matrix, tfidf_matrix_t, dest_ids, np.arange(n_items), _similarity_width(n_items)
+    )
+
+
+def _update_similarity(
+    current: 'ModelSnapshot',
+    keep: np.ndarray,
+    stale_ids: np.ndarray,
+    feature_matrix: np.ndarray,
+    tfidf_matrix: sparse.csr_matrix,
+    tfidf_matrix_t: sparse.csr_matrix,
+    dest_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Patch the current top-K table after an incremental refresh instead of
+    rebuilding it. The new catalog is current's kept rows followed by the
+    changed and added rows (stale_ids are the removed and changed ids).
+
+    Changed rows get full lists. A kept row merges its surviving old
+    neighbours with its scores against the changed rows; that is exact when
+    the merged K-th score is at least the old K-th score, since no other
+    unchanged row scored above it. Rows that lost too many neighbours are
+    recomputed in full.
+    """
+
+    n_items = feature_matrix.shape[0]
+    top_k = _similarity_width(n_items)
+    n_kept = int(keep.sum())
+    changed_rows = np.arange(n_kept, n_items)
+
+    # Different list width, or a large share of the catalog changed: rebuild
+    if top_k == 0 or current.similar_ids.shape[1] != top_k or 2 * len(changed_rows) > n_items:
+        return _build_similarity(feature_matrix, tfidf_matrix, tfidf_matrix_t, dest_ids)
+
+    similar_ids = np.empty((n_items, top_k), dtype=np.int32)
+    similar_scores = np.empty((n_items, top_k), dtype=np.float32)
+    similar_ids[n_kept:], similar_scores[n_kept:] = _similarity_rows(
+        feature_matrix, tfidf_matrix, tfidf_matrix_t, dest_ids, changed_rows, top_k
+    )
+
+    old_ids = current.similar_ids[keep]
+    old_scores = current.similar_scores[keep].astype(float)
+    old_scores[np.isin(old_ids, stale_ids)] = -np.inf
+    threshold = current.similar_scores[keep, -1]
+    changed_ids = dest_ids[changed_rows]
+    changed_tfidf_t = tfidf_matrix[changed_rows].T.tocsr()
+
+    incomplete = []
+    chunk_size = max(1, SCORE_CHUNK_CELLS // max(len(changed_rows) + top_k, 1))
+    for start in range(0, n_kept, chunk_size):
+        stop = min(start + chunk_size, n_kept)
+        rows = np.arange(start, stop)
+
+        candidate_ids = old_ids[start:stop]
+        candidate_scores = old_scores[start:stop]
+        if len(changed_rows):
+            block = _similarity_scores(feature_matrix, tfidf_matrix, changed_tfidf_t, rows, changed_rows)
+            candidate_ids = np.hstack([candidate_ids, np.broadcast_to(changed_ids, block.shape)])
+            candidate_scores = np.hstack([candidate_scores, block])
+
+        top, top_scores = _top_k(candidate_scores, top_k)
+        similar_ids[start:stop] = np.take_along_axis(candidate_ids, top, axis=1)
+        similar_scores[start:stop] = top_scores
+        incomplete.append(rows[top_scores[:, -1] < threshold[start:stop]])
+
+    incomplete = np.concatenate(incomplete) if incomplete else np.empty(0, dtype=int)
+    if len(incomplete):
+        similar_ids[incomplete], similar_scores[incomplete] = _similarity_rows(
+            feature_matrix, tfidf_matrix, tfidf_matrix_t, dest_ids, incomplete, top_k
+        )
+
+    return similar_ids, similar_scores
+
+
+@dataclass(frozen=True, eq=False)
+class ModelSnapshot:
+    """One fitted, read-only version of the recommender"""
+
+    scaler: StandardScaler
+    tfidf_vectorizer: TfidfVectorizer
+    tfidf_matrix: sparse.csr_matrix
+    feature_matrix: np.ndarray
+    destinations_df: pd.DataFrame
+    row_hashes: Dict[int, str]
+    catalog_hash: str
+    trained_at: datetime
+
+    # Precomputed item-to-item similarity (row i -> top-K neighbours of destination i)
+    similar_ids: np.ndarray
+    similar_scores: np.ndarray
+
+    # Vocabulary drift bookkeeping for incremental refreshes
+    baseline_oov_rate: float = 0.0
+    incremental_tokens: int = 0
+    incremental_oov_tokens: int = 0
+
+    def __post_init__(self):
+        # Derived lookups, rebuilt rather than persisted
+        df = self.destinations_df
+        object.__setattr__(self, 'tfidf_matrix_t', self.tfidf_matrix.T.tocsr())
+        object.__setattr__(self, 'dest_ids', df['destination_id'].to_numpy())
+        object.__setattr__(self, 'row_index', {int(dest_id): row for row, dest_id in enumerate(self.dest_ids)})
+        object.__setattr__(self, 'costs', df['avg_cost_per_day'].to_numpy(dtype=float))
+        object.__setattr__(self, 'difficulty', df['difficulty_level'].to_numpy(dtype=float))
+        object.__setattr__(
+            self, 'display_columns', df[['name', 'category', 'description', 'image_url']].to_numpy()
+        )
+        object.__setattr__(self, 'spatial_index', SpatialIndex(
+            df['latitude'].to_numpy(dtype=float), df['longitude'].to_numpy(dtype=float)
+        ))
+
+    @property
+    def n_items(self) -> int:
+        return self.feature_matrix.shape[0]
+
+    def score_catalog(
+        self,
+        user_matrix_scaled: np.ndarray,
+        user_tfidf: sparse.spmatrix,
+        budgets: np.ndarray,
+        fitness: np.ndarray
+    ) -> np.ndarray:
+        """Compute the hybrid score of every destination for every user row"""
+
+        # Feature-distance (KNN) similarity against the whole catalog
+        distances = euclidean_distances(user_matrix_scaled, self.feature_matrix)
+        knn_scores = 1 / (1 + distances)  # Convert distance to similarity
+
+        # Content-based similarity (TF-IDF rows are L2-normalized, so the
+        # sparse dot product is the cosine similarity)
+        content_scores = (user_tfidf @ self.tfidf_matrix_t).toarray()
+
+        # Hybrid scoring (60% KNN, 40% Content)
+        final_scores = 0.6 * knn_scores + 0.4 * content_scores
+
+        # Apply budget filter (allow 50% over budget)
+        final_scores *= np.where(self.costs > budgets[:, None] * 1.5, 0.7, 1.0)
+
+        # Apply difficulty filter
+        final_scores *= np.where(self.difficulty > fitness[:, None] + 1, 0.8, 1.0)
+
+        return final_scores
+
+    def get_similar(self, destination_id: int, n_similar: int = 10) -> Optional[List[Dict]]:
+        """Return precomputed 'more like this' destinations, or None if the id is unknown"""
+
+        row = self.row_index.get(destination_id)
+        if row is None:
+            return None
+
+        ids = self.similar_ids[row, :n_similar]
+        scores = self.similar_scores[row, :n_similar]
+        rows = [self.row_index[int(dest_id)] for dest_id in ids]
+
+        return self.payloads(rows, scores)
+
+    def payloads(self, rows, scores) -> List[Dict]:
+        """Display payloads for catalog rows, read from the snapshot instead of the database"""
+
+        details = self.display_columns[rows]
+        return [
+            {
+                'destination_id': int(self.dest_ids[row]),
+                'name': name,
+                'score': round(float(score), 4),
+                'category': category or "Unknown",
+                'description': description or "",
+                'image_url': image_url,
+            }
+            for row, score, (name, category, description, image_url) in zip(rows, scores, details)
+        ]
 
 
 class TourismRecommender:
     """Hybrid recommendation system using KNN and TF-IDF"""
 
-    def __init__(self):
-        self.knn_model = None
-        self.scaler = StandardScaler()
-        self.tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_features=500)
-        self.tfidf_matrix = None
-        self.destinations_df = None
-        self.is_trained = False
+    def __init__(self, max_features: int = 500):
+        self.max_features = max_features
+        self._snapshot: Optional[ModelSnapshot] = None
+
+        # Serializes builds; readers never take it
+        self._build_lock = threading.RLock()
+        # Lets only one request start a background refresh per interval
+        self._refresh_guard = threading.Lock()
+        # Catalog version counter the model was last checked against
+        self._catalog_version: Optional[int] = None
+
+        self.artifact_path = None
+        self.last_refresh_check = 0.0
+
+    @property
+    def snapshot(self) -> Optional[ModelSnapshot]:
+        """The currently published model (read it once per request)"""
+        return self._snapshot
+
+    @property
+    def is_trained(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifies the fitted model; changes whenever the catalog it was built on changes"""
+        snapshot = self._snapshot
+        return snapshot.catalog_hash if snapshot else None
+
+    @property
+    def destinations_df(self) -> Optional[pd.DataFrame]:
+        snapshot = self._snapshot
+        return snapshot.destinations_df if snapshot else None
+
+    def _publish(self, snapshot: ModelSnapshot):
+        """Make a new snapshot visible to readers with one reference swap"""
+        self._snapshot = snapshot
 
     def prepare_features(self, destinations: List[Destination]) -> pd.DataFrame:
         """Convert destination objects to feature dataframe"""
@@ -56,6 +403,9 @@ class TourismRecommender:
                 'name': dest.name,
                 'category': dest.category,
                 'description': dest.description or "",
+                'image_url': dest.image_url,
+                'latitude': float(dest.latitude) if dest.latitude is not None else np.nan,
+                'longitude': float(dest.longitude) if dest.longitude is not None else np.nan,
                 'difficulty_level': dest.difficulty_level or 2,
                 'avg_cost_per_day': dest.avg_cost_per_day or 40,
                 'popularity_score': dest.popularity_score or 50,
@@ -88,50 +438,225 @@ class TourismRecommender:
         if len(destinations) == 0:
             raise ValueError("No destinations found in database")
 
-        # Prepare features
-        self.destinations_df = self.prepare_features(destinations)
-
-        # Features for KNN
-        knn_features = [
-            'difficulty_level', 'avg_cost_per_day', 'popularity_score',
-            'altitude', 'permits_required',
-            'cat_trekking', 'cat_cultural', 'cat_religious',
-            'cat_nature', 'cat_wildlife', 'cat_adventure',
-            'season_spring', 'season_summer', 'season_autumn',
-            'season_winter', 'season_all'
-        ]
+        self.fit(destinations)
+
+        # The model now reflects the catalog; no need to re-check it straight away
+        self.last_refresh_check = time.monotonic()
+
+    def fit(self, destinations: List[Destination], build_similarity: bool = True):
+        """Fit scaler and TF-IDF from scratch and publish the result"""
+
+        with self._build_lock:
+            # Fresh estimators: the published snapshot keeps its own
+            scaler = StandardScaler()
+            tfidf_vectorizer = TfidfVectorizer(**TEXT_ANALYZER_OPTIONS, max_features=self.max_features)
+
+            # Prepare features
+            destinations_df = self.prepare_features(destinations)
+
+            # Scale features
+            feature_matrix = scaler.fit_transform(destinations_df[KNN_FEATURES].values)
+
+            # Train TF-IDF on descriptions
+            descriptions = destinations_df['description'].fillna('').tolist()
+            tfidf_matrix = tfidf_vectorizer.fit_transform(descriptions)
+
+            tokens, oov_tokens = _count_oov_tokens(tfidf_vectorizer, descriptions)
+
+            if build_similarity:
+                similar_ids, similar_scores = _build_similarity(
+                    feature_matrix, tfidf_matrix, tfidf_matrix.T.tocsr(),
+                    destinations_df['destination_id'].to_numpy()
+                )
+            else:
+                similar_ids = np.empty((len(destinations_df), 0), dtype=np.int32)
+                similar_scores = np.empty((len(destinations_df), 0), dtype=np.float32)
+
+            row_hashes = model_store.compute_row_hashes(destinations)
+
+            self._publish(ModelSnapshot(
+                scaler=scaler,
+                tfidf_vectorizer=tfidf_vectorizer,
+                tfidf_matrix=tfidf_matrix,
+                feature_matrix=feature_matrix,
+                destinations_df=destinations_df,
+                row_hashes=row_hashes,
+                catalog_hash=model_store.compute_catalog_hash(row_hashes),
+                trained_at=datetime.utcnow(),
+                similar_ids=similar_ids,
+                similar_scores=similar_scores,
+                baseline_oov_rate=oov_tokens / tokens if tokens else 0.0,
+            ))
+            print(f"✓ ML models trained on {len(destinations)} destinations")
+
+    def refresh(self, db: Session) -> bool:
+        """
+        Bring the model in line with the destinations table.
+        Changed rows are replaced and new rows appended in a new snapshot;
+        a full refit only happens when vocabulary drift passes the threshold.
+        Returns True if the model changed.
+        """
+
+        with self._build_lock:
+            return self._refresh_locked(db)
+
+    def _refresh_locked(self, db: Session) -> bool:
+        # Read before the rows: a write racing the refresh only causes one more check
+        catalog_version = read_catalog_version(db)
+        if self._snapshot is not None and catalog_version is not None and catalog_version == self._catalog_version:
+            return False
+
+        changed = self._sync_with_catalog(db)
+        self._catalog_version = catalog_version
+        return changed
+
+    def _sync_with_catalog(self, db: Session) -> bool:
+        current = self._snapshot
+
+        if current is None:
+            self.train(db)
+            self._save()
+            return True
 
-        X = self.destinations_df[knn_features].values
+        # Compare per-row content hashes without loading full rows
+        hash_columns = [getattr(Destination, field) for field in model_store.CATALOG_HASH_FIELDS]
+        row_hashes = model_store.compute_row_hashes(db.query(*hash_columns).all())
 
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        if row_hashes == current.row_hashes:
+            return False
 
-        # Train KNN
-        self.knn_model = NearestNeighbors(
-            n_neighbors=min(10, len(destinations)),
-            metric='euclidean'
-        )
-        self.knn_model.fit(X_scaled)
+        if not row_hashes:
+            raise ValueError("No destinations found in database")
 
-        # Train TF-IDF on descriptions
-        descriptions = self.destinations_df['description'].fillna('').tolist()
-        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(descriptions)
+        changed_ids = [
+            dest_id for dest_id, row_hash in row_hashes.items()
+            if current.row_hashes.get(dest_id) != row_hash
+        ]
+        removed_ids = set(current.row_hashes) - set(row_hashes)
+
+        changed = db.query(Destination).filter(
+            Destination.destination_id.in_(changed_ids)
+        ).all() if changed_ids else []
+        changed_df = self.prepare_features(changed)
+        descriptions = changed_df['description'].fillna('').tolist() if changed else []
+
+        # Full refit once the new text drifts too far from the fitted vocabulary
+        tokens, oov_tokens = _count_oov_tokens(current.tfidf_vectorizer, descriptions)
+        total_tokens = current.incremental_tokens + tokens
+        total_oov_tokens = current.incremental_oov_tokens + oov_tokens
+        drift = (total_oov_tokens / total_tokens - current.baseline_oov_rate) if total_tokens else 0.0
+
+        if drift > settings.MODEL_VOCAB_DRIFT_THRESHOLD:
+            print(f"Vocabulary drift {drift:.2f} over threshold, refitting")
+            self.train(db)
+            self._save()
+            return True
 
-        self.is_trained = True
-        print(f"✓ ML models trained on {len(destinations)} destinations")
+        # Drop removed and changed rows, then append the fresh versions
+        stale_ids = removed_ids.union(changed_ids)
+        keep = ~current.destinations_df['destination_id'].isin(stale_ids).to_numpy()
 
-    def get_recommendations(
-        self,
-        user_preferences: Dict,
-        db: Session,
-        n_recommendations: int = 10
-    ) -> List[Tuple[int, str, float]]:
-        """Generate recommendations based on user preferences"""
+        destinations_df = pd.concat(
+            [current.destinations_df[keep], changed_df], ignore_index=True
+        )
+        if changed:
+            feature_matrix = np.vstack([
+                current.feature_matrix[keep],
+                current.scaler.transform(changed_df[KNN_FEATURES].values)
+            ])
+            tfidf_matrix = sparse.vstack([
+                current.tfidf_matrix[keep],
+                current.tfidf_vectorizer.transform(descriptions)
+            ]).tocsr()
+        else:
+            feature_matrix = current.feature_matrix[keep]
+            tfidf_matrix = current.tfidf_matrix[keep]
+
+        similar_ids, similar_scores = _update_similarity(
+            current, keep, np.fromiter(stale_ids, dtype=np.int64, count=len(stale_ids)),
+            feature_matrix, tfidf_matrix, tfidf_matrix.T.tocsr(),
+            destinations_df['destination_id'].to_numpy()
+        )
 
-        if not self.is_trained:
-            self.train(db)
+        self._publish(replace(
+            current,
+            tfidf_matrix=tfidf_matrix,
+            feature_matrix=feature_matrix,
+            destinations_df=destinations_df,
+            row_hashes=row_hashes,
+            catalog_hash=model_store.compute_catalog_hash(row_hashes),
+            trained_at=datetime.utcnow(),
+            similar_ids=similar_ids,
+            similar_scores=similar_scores,
+            incremental_tokens=total_tokens,
+            incremental_oov_tokens=total_oov_tokens,
+        ))
+        print(f"✓ ML models refreshed: {len(changed_ids)} changed, {len(removed_ids)} removed")
+
+        self._save()
+        return True
+
+    def ensure_fresh(self, db: Session):
+        """
+        Train on first use and periodically pick up catalog changes.
+        Concurrent first requests wait on a single in-flight build; after
+        that, refreshes run on a background thread and requests keep using
+        the current snapshot until the new one is published.
+        """
+
+        if self._snapshot is None:
+            with self._build_lock:
+                # Another thread may have finished the build while we waited
+                if self._snapshot is None:
+                    self._refresh_locked(db)
+                    self.last_refresh_check = time.monotonic()
+            return
+
+        if time.monotonic() - self.last_refresh_check < settings.MODEL_REFRESH_INTERVAL_SECONDS:
+            return
+
+        with self._refresh_guard:
+            if time.monotonic() - self.last_refresh_check < settings.MODEL_REFRESH_INTERVAL_SECONDS:
+                return
+            self.last_refresh_check = time.monotonic()
+            threading.Thread(target=self._refresh_in_background, name="recommender-refresh", daemon=True).start()
+
+    def _refresh_in_background(self):
+        """Refresh on a session of its own; failures leave the current snapshot in place"""
+
+        db = SessionLocal()
+        try:
+            with self._build_lock:
+                self._refresh_locked(db)
+        except Exception as e:
+            print(f"Warning: recommender refresh failed: {e}")
+        finally:
+            db.close()
+
+    def _save(self):
+        """Persist the current model if an artifact path is configured"""
+
+        if self.artifact_path and self._snapshot is not None:
+            model_store.save_artifact(self._snapshot, self.artifact_path)
+
+    def load_or_train(self, db: Session, artifact_path: str):
+        """Load the persisted model artifact, then refresh it against the catalog"""
+
+        with self._build_lock:
+            self.artifact_path = artifact_path
+            snapshot_fields = model_store.load_artifact(artifact_path)
+
+            if snapshot_fields is not None:
+                self._publish(ModelSnapshot(**snapshot_fields))
+                print(f"✓ ML models loaded from {artifact_path}")
+
+            self.last_refresh_check = time.monotonic()
+            if self._refresh_locked(db):
+                print(f"✓ ML models saved to {artifact_path}")
+
+    def _build_user_features(self, user_preferences: Dict) -> List[float]:
+        """Build the KNN feature row for a single user"""
 
-        # Build user feature vector
         interests = user_preferences.get('interests', {})
         budget_map = {'budget': 30, 'mid-range': 50, 'luxury': 100}
         budget = budget_map.get(user_preferences.get('budget_range', 'mid-range'), 50)
@@ -160,7 +685,7 @@ class TourismRecommender:
             1  # All seasons always acceptable
         ]
 
-        user_features = [
+        return [
             user_preferences.get('difficulty_preference', 2),
             budget,
             50,  # Neutral popularity preference
@@ -168,16 +693,11 @@ class TourismRecommender:
             0,  # Permits OK
         ] + category_one_hot + season_one_hot
 
-        # KNN-based recommendations
-        user_vector_scaled = self.scaler.transform([user_features])
-        distances, indices = self.knn_model.kneighbors(user_vector_scaled, n_neighbors=n_recommendations * 2)
-
-        knn_scores = 1 / (1 + distances[0])  # Convert distance to similarity
+    def _build_user_description(self, user_preferences: Dict) -> str:
+        """Build the user interest description for content-based matching"""
 
-        # Content-based recommendations (TF-IDF)
-        # Build user interest description
         interest_keywords = []
-        for interest, score in interests.items():
+        for interest, score in user_preferences.get('interests', {}).items():
             if score >= 7:
                 interest_keywords.extend([interest] * 3)
             elif score >= 5:
@@ -185,46 +705,115 @@ class TourismRecommender:
             elif score >= 3:
                 interest_keywords.append(interest)
 
-        user_description = ' '.join(interest_keywords) if interest_keywords else "tourism travel nepal"
-        user_tfidf = self.tfidf_vectorizer.transform([user_description])
-        content_scores = cosine_similarity(user_tfidf, self.tfidf_matrix)[0]
+        return ' '.join(interest_keywords) if interest_keywords else "tourism travel nepal"
 
-        # Hybrid scoring (60% KNN, 40% Content)
-        hybrid_scores = {}
-        for idx, knn_idx in enumerate(indices[0]):
-            dest_id = self.destinations_df.iloc[knn_idx]['destination_id']
-            knn_score = knn_scores[idx]
-            content_score = content_scores[knn_idx]
-
-            # Hybrid formula
-            final_score = 0.6 * knn_score + 0.4 * content_score
-
-            # Apply budget filter
-            dest_cost = self.destinations_df.iloc[knn_idx]['avg_cost_per_day']
-            if dest_cost > budget * 1.5:  # Allow 50% over budget
-                final_score *= 0.7
-
-            # Apply difficulty filter
-            dest_difficulty = self.destinations_df.iloc[knn_idx]['difficulty_level']
-            user_fitness = user_preferences.get('fitness_level', 3)
-            if dest_difficulty > user_fitness + 1:
-                final_score *= 0.8
-
-            hybrid_scores[knn_idx] = final_score
-
-        # Sort by score and get top N
-        sorted_indices = sorted(hybrid_scores.keys(), key=lambda x: hybrid_scores[x], reverse=True)
-        top_indices = sorted_indices[:n_recommendations]
-
-        # Prepare results
-        recommendations = []
-        for idx in top_indices:
-            dest_id = int(self.destinations_df.iloc[idx]['destination_id'])
-            dest_name = self.destinations_df.iloc[idx]['name']
-            score = float(hybrid_scores[idx])
-            recommendations.append((dest_id, dest_name, score))
-
-        return recommendations
+    def _user_inputs(self, snapshot: ModelSnapshot, list_of_preferences: List[Dict]):
+        """Scaled feature rows, TF-IDF rows, budgets and fitness levels for score_catalog"""
+
+        # Build the user matrix (one row per user)
+        user_matrix = np.array(
+            [self._build_user_features(prefs) for prefs in list_of_preferences],
+            dtype=float
+        )
+        budgets = user_matrix[:, 1]
+        fitness = np.array(
+            [prefs.get('fitness_level', 3) for prefs in list_of_preferences],
+            dtype=float
+        )
+
+        user_matrix_scaled = snapshot.scaler.transform(user_matrix)
+        user_descriptions = [self._build_user_description(prefs) for prefs in list_of_preferences]
+        user_tfidf = snapshot.tfidf_vectorizer.transform(user_descriptions)
+
+        return user_matrix_scaled, user_tfidf, budgets, fitness
+
+    def score_destinations(self, user_preferences: Dict, db: Session) -> Tuple[np.ndarray, np.ndarray]:
+        """Score of every destination for one user, as (destination ids, scores)"""
+
+        self.ensure_fresh(db)
+        snapshot = self._snapshot
+
+        scores = snapshot.score_catalog(*self._user_inputs(snapshot, [user_preferences]))
+        return snapshot.dest_ids, scores[0]
+
+    def get_recommendations(
+        self,
+        user_preferences: Dict,
+        db: Session,
+        n_recommendations: int = 10,
+        details: bool = False,
+        near: Optional[Tuple[float, float]] = None
+    ) -> List:
+        """Generate recommendations based on user preferences"""
+
+        return self.get_recommendations_batch([user_preferences], db, n_recommendations, details, near)[0]
+
+    def get_recommendations_batch(
+        self,
+        list_of_preferences: List[Dict],
+        db: Session,
+        n_recommendations: int = 10,
+        details: bool = False,
+        near: Optional[Tuple[float, float]] = None
+    ) -> List[List]:
+        """Generate recommendations for many users in one vectorized pass
+
+        Each result is an (id, name, score) tuple, or with details=True a full
+        display payload taken from the same snapshot that produced the scores.
+        near=(lat, lon) boosts destinations close to that point.
+        """
+
+        self.ensure_fresh(db)
+        snapshot = self._snapshot
+
+        if not list_of_preferences:
+            return []
+
+        user_matrix_scaled, user_tfidf, budgets, fitness = self._user_inputs(snapshot, list_of_preferences)
+
+        dest_names = snapshot.display_columns[:, 0]
+
+        # Proximity multiplier from the spatial index (only rows inside the radius change)
+        boost = None
+        if near is not None:
+            boost = snapshot.spatial_index.proximity_boost(
+                near[0], near[1], settings.NEARBY_BOOST_RADIUS_KM, settings.NEARBY_BOOST_WEIGHT
+            )
+
+        # Score users in chunks so the (users x catalog) matrix stays bounded
+        chunk_size = max(1, SCORE_CHUNK_CELLS // snapshot.n_items)
+
+        results = []
+        for start in range(0, len(list_of_preferences), chunk_size):
+            stop = start + chunk_size
+            scores = snapshot.score_catalog(
+                user_matrix_scaled[start:stop],
+                user_tfidf[start:stop],
+                budgets[start:stop],
+                fitness[start:stop]
+            )
+            if boost is not None:
+                scores *= boost
+            top_indices, top_scores = _top_k(scores, n_recommendations)
+
+            for row_indices, row_scores in zip(top_indices, top_scores):
+                if details:
+                    results.append(snapshot.payloads(row_indices, row_scores))
+                    continue
+                results.append([
+                    (int(snapshot.dest_ids[idx]), dest_names[idx], float(score))
+                    for idx, score in zip(row_indices, row_scores)
+                ])
+
+        return results
+
+    def get_similar(self, destination_id: int, n_similar: int = 10) -> Optional[List[Dict]]:
+        """Return precomputed 'more like this' destinations, or None if the id is unknown"""
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.get_similar(destination_id, n_similar)
 
 
 # Global recommender instance
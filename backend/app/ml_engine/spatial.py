@@ -0,0 +1,84 @@
+"""
+Geospatial index for NepalTourAI
+A haversine BallTree over destination coordinates, built with each model
+snapshot, for radius and k-nearest queries.
+"""
+from typing import Tuple
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+# Mean Earth radius used to convert between radians and kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+
+def parse_coordinates(value: str) -> Tuple[float, float]:
+    """Parse a "lat,lon" string; ValueError if it is malformed or out of range"""
+
+    try:
+        lat, lon = (float(part) for part in value.split(','))
+    except ValueError as e:
+        raise ValueError("Coordinates must be given as 'lat,lon'") from e
+
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("Coordinates out of range")
+    return lat, lon
+
+
+class SpatialIndex:
+    """BallTree (haversine) over the rows that have coordinates; results are catalog row indices"""
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray):
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+
+        # Destinations without coordinates simply never show up as nearby
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        self.rows = np.flatnonzero(valid)
+        self.n_items = len(latitudes)
+        self.tree = BallTree(
+            np.radians(np.column_stack([latitudes[valid], longitudes[valid]])),
+            metric='haversine'
+        ) if len(self.rows) else None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows within radius_km of the point, nearest first, with their distances in km"""
+
+        if self.tree is None:
+            return np.array([], dtype=np.int64), np.array([])
+
+        point = np.radians([[lat, lon]])
+        indices, distances = self.tree.query_radius(
+            point, r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True
+        )
+        return self.rows[indices[0]], distances[0] * EARTH_RADIUS_KM
+
+    def nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The k rows closest to the point, nearest first, with their distances in km"""
+
+        if self.tree is None:
+            return np.array([], dtype=np.int64), np.array([])
+
+        k = min(k, len(self.rows))
+        distances, indices = self.tree.query(np.radians([[lat, lon]]), k=k)
+        return self.rows[indices[0]], distances[0] * EARTH_RADIUS_KM
+
+    def proximity_boost(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        weight: float
+    ) -> np.ndarray:
+        """
+        Per-row score multiplier: 1 + weight at the point, falling linearly to
+        1 at radius_km and beyond. Only rows inside the radius are touched.
+        """
+
+        rows, distances = self.within(lat, lon, radius_km)
+        boost = np.ones(self.n_items)
+        boost[rows] += weight * (1 - distances / radius_km)
+        return boost
@@ -1,8 +1,8 @@
 from app.models.user import User
 from app.models.preference import UserPreference
-from app.models.destination import Destination
+from app.models.destination import Destination, CatalogVersion
 from app.models.recommendation import Recommendation
-from app.models.itinerary import Itinerary
+from app.models.itinerary import Itinerary, ItineraryItem
 from app.models.review import Review
 from app.models.admin import AdminUser
 
@@ -10,8 +10,10 @@ __all__ = [
     "User",
     "UserPreference",
     "Destination",
+    "CatalogVersion",
     "Recommendation",
     "Itinerary",
+    "ItineraryItem",
     "Review",
     "AdminUser",
 ]
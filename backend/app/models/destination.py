@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Numeric, JSON
+from itertools import chain
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, Numeric, JSON, Index, DDL, event, update
+from sqlalchemy.orm import Session
 from app.database import Base
 
 
@@ -21,3 +24,45 @@ class Destination(Base):
     altitude = Column(Integer)  # Meters
     permits_required = Column(Boolean, default=False)
     image_url = Column(String(500))
+
+
+# Combined browse filter (category + difficulty + cost range)
+Index(
+    'ix_destinations_category_difficulty_cost',
+    Destination.category, Destination.difficulty_level, Destination.avg_cost_per_day
+)
+
+# Keyset pagination order for browse listings: (popularity_score DESC, destination_id)
+Index('ix_destinations_popularity_id', Destination.popularity_score.desc(), Destination.destination_id)
+Index(
+    'ix_destinations_category_popularity_id',
+    Destination.category, Destination.popularity_score.desc(), Destination.destination_id
+)
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped with every destinations write, so workers can detect changes cheaply"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Tables built with create_all (outside migrations) get their row too
+event.listen(
+    CatalogVersion.__table__,
+    "after_create",
+    DDL("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+)
+
+# Run in the same transaction as every destinations write (ORM flushes and bulk ingest)
+CATALOG_VERSION_BUMP = (
+    update(CatalogVersion).where(CatalogVersion.id == 1).values(version=CatalogVersion.version + 1)
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_catalog_version(session, flush_context):
+    """One version bump per flush that wrote destinations"""
+    if any(isinstance(obj, Destination) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.connection().execute(CATALOG_VERSION_BUMP)
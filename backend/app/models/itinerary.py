@@ -1,15 +1,36 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 
 class Itinerary(Base):
     __tablename__ = "itineraries"
+    __table_args__ = (
+        Index('ix_itineraries_user_created', 'user_id', 'created_at'),
+    )
 
     itinerary_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     title = Column(String(255))
-    destinations = Column(JSON)  # Array of destination_ids with days
     total_days = Column(Integer)
     total_cost = Column(Integer)  # USD
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ItineraryItem(Base):
+    """One stop of an itinerary; destination details come from the catalog"""
+
+    __tablename__ = "itinerary_items"
+    __table_args__ = (
+        Index('uq_itinerary_items_itinerary_position', 'itinerary_id', 'position', unique=True),
+    )
+
+    item_id = Column(Integer, primary_key=True)
+    itinerary_id = Column(Integer, ForeignKey("itineraries.itinerary_id", ondelete="CASCADE"), nullable=False)
+    destination_id = Column(Integer, ForeignKey("destinations.destination_id"), nullable=False)
+    position = Column(Integer, nullable=False)  # 0 = first stop
+    start_day = Column(Integer)
+    end_day = Column(Integer)
+    cost = Column(Integer)  # USD, as priced when the itinerary was created
+    transfer_distance_km = Column(Float)  # From the previous stop (NULL for the first)
+    transfer_days = Column(Integer)
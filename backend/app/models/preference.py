@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class UserPreference(Base):
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        # One preference row per user; also serves every recommend lookup
+        Index('uq_user_preferences_user_id', 'user_id', unique=True),
+    )
 
     preference_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 
 class Recommendation(Base):
     __tablename__ = "recommendations"
+    __table_args__ = (
+        Index('ix_recommendations_user_rank', 'user_id', 'rank'),
+    )
 
     recommendation_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     destination_id = Column(Integer, ForeignKey("destinations.destination_id"), nullable=False)
     score = Column(Numeric(5, 4))  # ML similarity score
+    rank = Column(Integer)  # 1 = best match
+    model_version = Column(String(64))  # Recommender catalog hash the row was scored with
+    preference_hash = Column(String(40))  # Hash of the preferences the row was scored with
     created_at = Column(DateTime(timezone=True), server_default=func.now())
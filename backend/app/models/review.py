@@ -11,7 +11,7 @@ class Review(Base):
 
     review_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
-    destination_id = Column(Integer, ForeignKey("destinations.destination_id"), nullable=False)
+    destination_id = Column(Integer, ForeignKey("destinations.destination_id"), nullable=False, index=True)
     rating = Column(Integer, nullable=False)  # 1-5
     comment = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,30 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, User as UserSchema, Token
-from app.utils.auth import get_password_hash, verify_password, create_access_token
+from app.utils.auth import create_access_token, password_hasher
+from app.utils.hashing import HashingBusy
 from app.config import settings
 
 router = APIRouter()
 
+hashing_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many authentication requests, please retry shortly",
+    headers={"Retry-After": "1"},
+)
+
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
 
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (hashing runs on the dedicated process pool)
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except HashingBusy:
+        raise hashing_busy_exception
+
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -33,26 +47,39 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return JWT token"""
 
     # Find user
-    user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    user = result.scalars().first()
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify(user_data.password, user.password_hash)
+        except HashingBusy:
+            raise hashing_busy_exception
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Transparently upgrade hashes created with a different bcrypt cost
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -63,6 +90,12 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.get("/hashing/metrics")
+def get_hashing_metrics():
+    """Password hashing pool latency, queue wait and load counters"""
+    return password_hasher.metrics()
+
+
 @router.get("/me", response_model=UserSchema)
 def get_current_user(token: str, db: Session = Depends(get_db)):
     """Get current user from token"""
@@ -75,8 +108,8 @@ def get_current_user(token: str, db: Session = Depends(get_db)):
             detail="Invalid token"
         )
 
-    email = payload.get("sub")
-    user = db.query(User).filter(User.email == email).first()
+    user_id = payload.get("user_id")
+    user = db.query(User).filter(User.user_id == user_id).first()
 
     if not user:
         raise HTTPException(
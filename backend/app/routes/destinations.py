@@ -1,97 +1,257 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from app.database import get_db
+from app.config import settings
+from app.database import engine, get_db
 from app.models.destination import Destination
-from app.schemas.destination import Destination as DestinationSchema
+from app.schemas.destination import Destination as DestinationSchema, NearbyDestination, SimilarDestination
+from app.ml_engine.recommender import recommender
+from app.services.catalog import catalog, decode_cursor, encode_cursor
+from app.services.export import EXPORT_FORMAT_PATTERN, ExportEncoder, export_response
 
 router = APIRouter()
 
+similar_adapter = TypeAdapter(List[SimilarDestination])
+
+
+def _json_response(request: Request, body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Send pre-encoded JSON with a strong ETag (a hash of the body), or an
+    empty 304 when the client's If-None-Match already names that body.
+    """
+
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {**(headers or {}), "ETag": etag}
+
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    candidates = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _page_with_cursor(
+    request: Request,
+    snapshot,
+    mask,
+    key,
+    sort: str,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+):
+    """Serve one keyset page and advertise the next one in the X-Next-Cursor header"""
+
+    try:
+        after = decode_cursor(cursor, sort) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows, position = snapshot.page(mask, key, limit=limit, skip=skip, after=after)
+    headers = {"X-Next-Cursor": encode_cursor(sort, position)} if position is not None else None
+    return _json_response(request, snapshot.encode(rows), headers)
+
 
 @router.get("/", response_model=List[DestinationSchema])
 def get_all_destinations(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     min_cost: Optional[int] = None,
     max_cost: Optional[int] = None,
     difficulty: Optional[int] = None,
     season: Optional[str] = None,
-    search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    search: Optional[str] = None
 ):
-    """Get all destinations with optional filters"""
+    """Get all destinations with optional filters (most popular first, or by relevance when searching)"""
 
-    query = db.query(Destination)
+    snapshot = catalog.snapshot
+    mask = snapshot.mask(
+        category=category,
+        min_cost=min_cost,
+        max_cost=max_cost,
+        difficulty=difficulty,
+        season=season
+    )
 
-    # Apply filters
-    if category:
-        query = query.filter(Destination.category == category)
+    if search:
+        # Search results come back ordered by relevance
+        scores = snapshot.search_index.scores(search)
+        return _page_with_cursor(
+            request, snapshot, mask & (scores > 0), scores, "relevance", skip, limit, cursor
+        )
 
-    if min_cost is not None:
-        query = query.filter(Destination.avg_cost_per_day >= min_cost)
+    return _page_with_cursor(
+        request, snapshot, mask, snapshot.popularity_key, "popularity", skip, limit, cursor
+    )
 
-    if max_cost is not None:
-        query = query.filter(Destination.avg_cost_per_day <= max_cost)
 
-    if difficulty is not None:
-        query = query.filter(Destination.difficulty_level == difficulty)
+def _nearby_rows(snapshot, rows, distances) -> bytes:
+    """JSON array of the catalog rows for spatial-index hits, with their distance attached"""
 
-    if season:
-        query = query.filter(Destination.best_season == season)
+    catalog_snapshot = catalog.snapshot
+    fragments = []
+    for row, distance in zip(rows, distances):
+        index = catalog_snapshot.id_index.get(int(snapshot.dest_ids[row]))
+        if index is not None:
+            # Splice distance_km into the cached row object
+            distance_km = json.dumps(round(float(distance), 2)).encode()
+            fragments.append(catalog_snapshot.fragment(index)[:-1] + b',"distance_km":' + distance_km + b'}')
+    return b'[' + b','.join(fragments) + b']'
 
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Destination.name.ilike(search_term)) |
-            (Destination.description.ilike(search_term)) |
-            (Destination.location.ilike(search_term))
+
+def _query_nearby(
+    request: Request,
+    db: Session,
+    lat: float,
+    lon: float,
+    radius_km: Optional[float],
+    k: int,
+    exclude=None
+) -> Response:
+    """Radius query when radius_km is given (closest k inside it), otherwise k nearest"""
+
+    recommender.ensure_fresh(db)
+    snapshot = recommender.snapshot
+    index = snapshot.spatial_index
+
+    if radius_km is not None:
+        rows, distances = index.within(lat, lon, radius_km)
+    else:
+        # One extra so the origin destination can be dropped
+        rows, distances = index.nearest(lat, lon, k + (exclude is not None))
+
+    keep = snapshot.dest_ids[rows] != exclude if exclude is not None else slice(None)
+    return _json_response(request, _nearby_rows(snapshot, rows[keep][:k], distances[keep][:k]))
+
+
+@router.get("/nearby", response_model=List[NearbyDestination])
+def get_nearby_destinations(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000),
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get destinations nearest to a point, optionally limited to a radius (km)"""
+
+    return _query_nearby(request, db, lat, lon, radius_km, k)
+
+
+def _export_rows(encoder: ExportEncoder) -> Iterator[bytes]:
+    """Encode the destinations table batch by batch from a server-side cursor"""
+
+    # The connection lives as long as the stream, not the request handler;
+    # plain Core rows skip the ORM identity map, which an export never needs
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=settings.EXPORT_BATCH_SIZE).execute(
+            select(Destination.__table__).order_by(Destination.destination_id)
         )
+        for partition in result.mappings().partitions():
+            yield encoder.encode([dict(row) for row in partition])
+        yield encoder.finish()
+
 
-    destinations = query.offset(skip).limit(limit).all()
-    return destinations
+@router.get("/export")
+def export_destinations(
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False
+):
+    """
+    Stream every destination, ordered by ID, as NDJSON or CSV (optionally
+    gzip-compressed). The CSV has the columns the destination import reads.
+    """
+
+    fieldnames = [column.name for column in Destination.__table__.columns]
+    encoder = ExportEncoder(fmt, fieldnames, compress=gzip, json_fields=["activities"])
+    return export_response(_export_rows(encoder), fmt, "destinations", compress=gzip)
 
 
 @router.get("/{destination_id}", response_model=DestinationSchema)
-def get_destination(destination_id: int, db: Session = Depends(get_db)):
+def get_destination(destination_id: int, request: Request):
     """Get a single destination by ID"""
 
-    destination = db.query(Destination).filter(
-        Destination.destination_id == destination_id
-    ).first()
+    snapshot = catalog.snapshot
+    index = snapshot.id_index.get(destination_id)
+
+    if index is None:
+        raise HTTPException(status_code=404, detail="Destination not found")
+
+    return _json_response(request, snapshot.fragment(index))
+
+
+@router.get("/{destination_id}/similar", response_model=List[SimilarDestination])
+def get_similar_destinations(
+    destination_id: int,
+    request: Request,
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Get destinations most similar to the given one (precomputed by the recommender)"""
+
+    recommender.ensure_fresh(db)
+
+    similar = recommender.get_similar(destination_id, n_similar=limit)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Destination not found")
+
+    return _json_response(request, similar_adapter.dump_json(similar_adapter.validate_python(similar)))
+
+
+@router.get("/{destination_id}/nearby", response_model=List[NearbyDestination])
+def get_destinations_near_destination(
+    destination_id: int,
+    request: Request,
+    radius_km: Optional[float] = Query(None, gt=0, le=1000),
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get destinations nearest to the given one, optionally limited to a radius (km)"""
 
-    if not destination:
+    origin = catalog.snapshot.get(destination_id)
+    if not origin:
         raise HTTPException(status_code=404, detail="Destination not found")
+    if origin["latitude"] is None or origin["longitude"] is None:
+        raise HTTPException(status_code=404, detail="Destination has no coordinates")
 
-    return destination
+    return _query_nearby(
+        request, db, float(origin["latitude"]), float(origin["longitude"]), radius_km, k, exclude=destination_id
+    )
 
 
 @router.get("/category/{category}", response_model=List[DestinationSchema])
 def get_destinations_by_category(
     category: str,
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None
 ):
-    """Get destinations by category"""
+    """Get destinations by category (most popular first)"""
 
-    destinations = db.query(Destination).filter(
-        Destination.category == category
-    ).offset(skip).limit(limit).all()
-
-    return destinations
+    snapshot = catalog.snapshot
+    return _page_with_cursor(
+        request, snapshot, snapshot.mask(category=category), snapshot.popularity_key,
+        "popularity", skip, limit, cursor
+    )
 
 
 @router.get("/popular/top", response_model=List[DestinationSchema])
 def get_popular_destinations(
-    limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(10, ge=1, le=50)
 ):
     """Get most popular destinations"""
 
-    destinations = db.query(Destination).order_by(
-        Destination.popularity_score.desc()
-    ).limit(limit).all()
-
-    return destinations
+    snapshot = catalog.snapshot
+    destinations, _ = snapshot.page(snapshot.mask(), snapshot.popularity_key, limit=limit)
+    return _json_response(request, snapshot.encode(destinations))
@@ -1,33 +1,311 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 import json
+import time
+import numpy as np
 
-from app.database import get_db
-from app.models.itinerary import Itinerary
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal, get_async_db
+from app.ml_engine.recommender import preferences_to_dict, recommender
 from app.models.destination import Destination
+from app.models.itinerary import Itinerary, ItineraryItem
+from app.models.preference import UserPreference
+from app.services.catalog import CatalogSnapshot, catalog
+from app.services.export import EXPORT_FORMAT_PATTERN, ExportEncoder, export_response
+from app.services.routing import plan_route, transfer_days
+from app.services.selection import Selection, select_destinations
 from app.utils.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
 
+# Destination categories mapped to the recommender's interest keys
+CATEGORY_INTERESTS = {'Trekking': 'adventure'}
+
+# Export columns: one CSV row per stop, itinerary columns repeated on each
+EXPORT_ITINERARY_FIELDS = ['itinerary_id', 'title', 'total_days', 'total_cost', 'created_at']
+EXPORT_STOP_FIELDS = [
+    'position', 'destination_id', 'destination_name', 'start_day', 'end_day',
+    'cost', 'transfer_distance_km', 'transfer_days'
+]
+
+
+def _build_itinerary_stops(destinations: List[Dict]) -> Tuple[List[dict], dict]:
+    """
+    Order catalog rows along a short route and lay out the days, including
+    estimated transfer days between stops. Stops without coordinates go last.
+    Returns the stops as stored in itinerary_items, plus the trip totals.
+    """
+
+    located = [dest for dest in destinations if dest['latitude'] is not None and dest['longitude'] is not None]
+    unlocated = [dest for dest in destinations if dest['latitude'] is None or dest['longitude'] is None]
+
+    plan = plan_route(
+        np.array([float(dest['latitude']) for dest in located]),
+        np.array([float(dest['longitude']) for dest in located])
+    )
+    ordered = [located[i] for i in plan.order] + unlocated
+    legs = list(plan.legs_km) + [None] * len(unlocated)
+
+    stops = []
+    current_day = 1
+    total_cost = 0
+    total_transfer_days = 0
+
+    for dest, leg_km in zip(ordered, legs):
+        travel_days = transfer_days(leg_km) if leg_km is not None and stops else 0
+        current_day += travel_days
+        total_transfer_days += travel_days
+        cost = dest['avg_cost_per_day'] * dest['duration_days']
+        total_cost += cost
+
+        stops.append({
+            "destination_id": dest['destination_id'],
+            "position": len(stops),
+            "start_day": current_day,
+            "end_day": current_day + dest['duration_days'] - 1,
+            "cost": cost,
+            "transfer_distance_km": round(float(leg_km), 1) if leg_km is not None and stops else None,
+            "transfer_days": travel_days
+        })
+        current_day += dest['duration_days']
+
+    return stops, {
+        "total_days": current_day - 1,
+        "total_cost": total_cost,
+        "total_distance_km": round(plan.total_km, 1),
+        "total_transfer_days": total_transfer_days,
+    }
+
+
+def _stop_details(destination: Optional[Dict], stop: dict) -> dict:
+    """A stored stop with its destination's details from the catalog"""
+
+    destination = destination or {}
+    activities = destination.get('activities')
+
+    return {
+        "destination_id": stop["destination_id"],
+        "name": destination.get('name'),
+        "location": destination.get('location'),
+        "start_day": stop["start_day"],
+        "end_day": stop["end_day"],
+        "duration_days": stop["end_day"] - stop["start_day"] + 1,
+        "transfer_distance_km": stop["transfer_distance_km"],
+        "transfer_days": stop["transfer_days"],
+        "cost": stop["cost"],
+        "activities": json.loads(activities) if isinstance(activities, str) else activities,
+        "description": destination.get('description'),
+        "difficulty_level": destination.get('difficulty_level'),
+        "altitude": destination.get('altitude')
+    }
+
+
+async def _catalog_snapshot() -> CatalogSnapshot:
+    """Current catalog snapshot; a (re)load runs in the threadpool, off the event loop"""
+    return await run_in_threadpool(lambda: catalog.snapshot)
+
+
+async def _save_itinerary(
+    db: AsyncSession,
+    user_id: int,
+    title: str,
+    stops: List[dict],
+    route: dict
+) -> Itinerary:
+    """Insert an itinerary and its stops in one transaction"""
+
+    itinerary = Itinerary(
+        user_id=user_id,
+        title=title,
+        total_days=route["total_days"],
+        total_cost=route["total_cost"],
+        created_at=datetime.utcnow()
+    )
+    db.add(itinerary)
+    await db.flush()
+
+    db.add_all([ItineraryItem(itinerary_id=itinerary.itinerary_id, **stop) for stop in stops])
+    await db.commit()
+    await db.refresh(itinerary)
+    return itinerary
+
+
+def _itinerary_response(
+    itinerary: Itinerary,
+    snapshot: CatalogSnapshot,
+    stops: List[dict],
+    **extra
+) -> dict:
+    """Full itinerary payload with every stop's destination details"""
+
+    return {
+        "itinerary_id": itinerary.itinerary_id,
+        "title": itinerary.title,
+        "destinations": [_stop_details(snapshot.get(stop["destination_id"]), stop) for stop in stops],
+        "total_days": itinerary.total_days,
+        "total_cost": itinerary.total_cost,
+        **extra,
+        "created_at": itinerary.created_at
+    }
+
+
+def _trip_preferences(
+    stored: Optional[UserPreference],
+    budget: int,
+    duration_days: int,
+    interests: List[str],
+    difficulty_preference: int
+) -> dict:
+    """Recommender preferences for an auto-generated trip"""
+
+    if stored is not None:
+        user_preferences = preferences_to_dict(stored)
+    else:
+        user_preferences = {
+            'interests': {},
+            'fitness_level': difficulty_preference,
+            'preferred_seasons': ['Spring', 'Autumn']
+        }
+
+    if interests:
+        user_preferences['interests'] = {
+            CATEGORY_INTERESTS.get(category, category.lower()): 8 for category in interests
+        }
+
+    daily_budget = budget / max(duration_days, 1)
+    user_preferences['budget_range'] = (
+        'budget' if daily_budget < 40 else 'mid-range' if daily_budget < 80 else 'luxury'
+    )
+    user_preferences['difficulty_preference'] = difficulty_preference
+
+    return user_preferences
+
+
+def _drop_lowest_value_stops(
+    selection: Selection,
+    values: np.ndarray,
+    snapshot: CatalogSnapshot,
+    duration_days: int
+) -> Tuple[Selection, List[dict], dict]:
+    """Remove the lowest-value stops from a selection until its trip fits duration_days"""
+
+    rows = selection.rows
+    while True:
+        rows = np.delete(rows, np.argmin(values[rows]))
+        stops, route = _build_itinerary_stops([snapshot.rows[i] for i in rows])
+        if route["total_days"] <= duration_days:
+            trimmed = Selection(
+                rows=rows,
+                score=float(values[rows].sum()),
+                days=int(snapshot.duration[rows].sum()),
+                cost=float((snapshot.cost * snapshot.duration)[rows].sum()),
+                optimal=False
+            )
+            return trimmed, stops, route
+
+
+def _plan_trip(
+    values: np.ndarray,
+    snapshot: CatalogSnapshot,
+    duration_days: int,
+    budget: int,
+    time_budget_ms: Optional[float] = None
+) -> Tuple[Selection, List[dict], dict]:
+    """
+    Choose stops on the catalog arrays and lay them out along a route. The
+    selection only counts days spent at each stop, so when transfer days push
+    the trip past duration_days it is chosen again with that many fewer days,
+    and the over-long set is also cut down to its best stops that fit. The
+    highest-scoring trip that fits is returned. All selections share one
+    ITINERARY_SELECTION_TIME_BUDGET_MS; once it is spent the best trip so far
+    is returned.
+    """
+
+    time_budget_ms = settings.ITINERARY_SELECTION_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    deadline = time.perf_counter() + time_budget_ms / 1000
+
+    best = None
+    max_days = duration_days
+    while True:
+        selection = select_destinations(
+            values, snapshot.duration, snapshot.cost * snapshot.duration, max_days, budget,
+            time_budget_ms=max(deadline - time.perf_counter(), 0) * 1000
+        )
+        stops, route = _build_itinerary_stops([snapshot.rows[i] for i in selection.rows])
+        excess = route["total_days"] - duration_days
+
+        fits = excess <= 0 or not len(selection.rows)
+        plan = (selection, stops, route) if fits else _drop_lowest_value_stops(
+            selection, values, snapshot, duration_days
+        )
+        if best is None or plan[0].score > best[0].score:
+            best = plan
+
+        if fits or max_days - excess <= 0 or time.perf_counter() >= deadline:
+            return best
+        max_days -= excess
+
+
+def _select_trip_destinations(
+    user_preferences: dict,
+    budget: int,
+    duration_days: int,
+    interests: List[str],
+    difficulty_preference: int
+) -> Optional[Tuple[Selection, List[dict], dict]]:
+    """
+    Best-scoring set of matching destinations whose trip, transfers included,
+    fits the duration and budget, with its stops and totals. None when no
+    destination matches the filters.
+    """
+
+    snapshot = catalog.snapshot
+
+    mask = snapshot.difficulty <= difficulty_preference
+    if interests:
+        codes = [snapshot.categories[category] for category in interests if category in snapshot.categories]
+        mask &= np.isin(snapshot.category_codes, codes)
+    if not mask.any():
+        return None
+
+    db = SessionLocal()
+    try:
+        dest_ids, scores = recommender.score_destinations(user_preferences, db)
+    finally:
+        db.close()
+
+    # Line the model's scores up with catalog rows (both sorted by destination_id)
+    values = np.zeros(len(snapshot))
+    positions = np.minimum(np.searchsorted(snapshot.ids, dest_ids), len(snapshot) - 1)
+    found = snapshot.ids[positions] == dest_ids
+    values[positions[found]] = scores[found]
+    values[~mask] = 0
+
+    return _plan_trip(values, snapshot, duration_days, budget)
+
 
 @router.post("/create")
 async def create_itinerary(
     title: str,
     destination_ids: List[int],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Create a new itinerary from selected destinations
     """
     try:
-        # Fetch selected destinations
-        destinations = db.query(Destination).filter(
-            Destination.destination_id.in_(destination_ids)
-        ).all()
+        # Selected destinations, in request order, from the catalog
+        snapshot = await _catalog_snapshot()
+        destinations = [
+            snapshot.get(destination_id) for destination_id in dict.fromkeys(destination_ids)
+            if snapshot.get(destination_id) is not None
+        ]
 
         if not destinations:
             raise HTTPException(
@@ -35,55 +313,22 @@ async def create_itinerary(
                 detail="No valid destinations found"
             )
 
-        # Calculate total days and cost
-        total_days = sum(dest.duration_days for dest in destinations)
-        total_cost = sum(dest.avg_cost_per_day * dest.duration_days for dest in destinations)
-
-        # Build itinerary structure
-        itinerary_destinations = []
-        current_day = 1
-
-        for dest in destinations:
-            itinerary_destinations.append({
-                "destination_id": dest.destination_id,
-                "name": dest.name,
-                "location": dest.location,
-                "start_day": current_day,
-                "end_day": current_day + dest.duration_days - 1,
-                "duration_days": dest.duration_days,
-                "cost": dest.avg_cost_per_day * dest.duration_days,
-                "activities": json.loads(dest.activities) if isinstance(dest.activities, str) else dest.activities,
-                "description": dest.description,
-                "difficulty_level": dest.difficulty_level,
-                "altitude": dest.altitude
-            })
-            current_day += dest.duration_days
-
-        # Create itinerary
-        itinerary = Itinerary(
-            user_id=current_user.user_id,
-            title=title,
-            destinations=json.dumps(itinerary_destinations),
-            total_days=total_days,
-            total_cost=total_cost,
-            created_at=datetime.utcnow()
-        )
-
-        db.add(itinerary)
-        db.commit()
-        db.refresh(itinerary)
+        # Order stops along a short route and lay out the days
+        stops, route = _build_itinerary_stops(destinations)
+        itinerary = await _save_itinerary(db, current_user.user_id, title, stops, route)
 
-        return {
-            "itinerary_id": itinerary.itinerary_id,
-            "title": itinerary.title,
-            "destinations": itinerary_destinations,
-            "total_days": total_days,
-            "total_cost": total_cost,
-            "created_at": itinerary.created_at
-        }
+        return _itinerary_response(
+            itinerary,
+            snapshot,
+            stops,
+            total_distance_km=route["total_distance_km"],
+            total_transfer_days=route["total_transfer_days"]
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create itinerary: {str(e)}"
@@ -92,44 +337,123 @@ async def create_itinerary(
 
 @router.get("/my-itineraries")
 async def get_user_itineraries(
-    db: Session = Depends(get_db),
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all itineraries for the current user
+    Get summaries of the current user's itineraries, newest first.
+    The total count is returned in the X-Total-Count header.
     """
-    itineraries = db.query(Itinerary).filter(
-        Itinerary.user_id == current_user.user_id
-    ).order_by(Itinerary.created_at.desc()).all()
-
-    result = []
-    for itinerary in itineraries:
-        destinations = json.loads(itinerary.destinations) if isinstance(itinerary.destinations, str) else itinerary.destinations
-        result.append({
+    destination_count = (
+        select(func.count(ItineraryItem.item_id))
+        .where(ItineraryItem.itinerary_id == Itinerary.itinerary_id)
+        .correlate(Itinerary)
+        .scalar_subquery()
+    )
+    rows = await db.execute(
+        select(Itinerary, destination_count).where(
+            Itinerary.user_id == current_user.user_id
+        ).order_by(Itinerary.created_at.desc()).offset(skip).limit(limit)
+    )
+
+    total = await db.scalar(
+        select(func.count(Itinerary.itinerary_id)).where(Itinerary.user_id == current_user.user_id)
+    )
+    response.headers["X-Total-Count"] = str(total)
+
+    return [
+        {
             "itinerary_id": itinerary.itinerary_id,
             "title": itinerary.title,
-            "destinations": destinations,
+            "destination_count": count,
             "total_days": itinerary.total_days,
             "total_cost": itinerary.total_cost,
             "created_at": itinerary.created_at
-        })
+        }
+        for itinerary, count in rows.all()
+    ]
+
 
-    return result
+async def _export_rows(user_id: int, encoder: ExportEncoder) -> AsyncIterator[bytes]:
+    """
+    Encode a user's itineraries batch by batch from a server-side cursor over
+    itineraries joined to their stops. NDJSON gets one line per itinerary with
+    its stops nested; CSV gets one row per stop.
+    """
+
+    query = (
+        select(
+            *(getattr(Itinerary, name) for name in EXPORT_ITINERARY_FIELDS),
+            *(getattr(ItineraryItem, name) for name in EXPORT_STOP_FIELDS if name != 'destination_name'),
+            Destination.name.label('destination_name')
+        )
+        .select_from(Itinerary)
+        .outerjoin(ItineraryItem, ItineraryItem.itinerary_id == Itinerary.itinerary_id)
+        .outerjoin(Destination, Destination.destination_id == ItineraryItem.destination_id)
+        .where(Itinerary.user_id == user_id)
+        .order_by(Itinerary.created_at.desc(), Itinerary.itinerary_id, ItineraryItem.position)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+
+    # The session lives as long as the stream, not the request handler
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        current = None
+        async for partition in result.mappings().partitions():
+            if encoder.fmt == 'csv':
+                yield encoder.encode(partition)
+                continue
+
+            # Rows arrive grouped by itinerary; emit each one once its last stop is seen
+            records = []
+            for row in partition:
+                if current is None or current['itinerary_id'] != row['itinerary_id']:
+                    if current is not None:
+                        records.append(current)
+                    current = {name: row[name] for name in EXPORT_ITINERARY_FIELDS}
+                    current['stops'] = []
+                if row['position'] is not None:
+                    current['stops'].append({name: row[name] for name in EXPORT_STOP_FIELDS})
+            yield encoder.encode(records)
+
+        if current is not None:
+            yield encoder.encode([current])
+        yield encoder.finish()
+
+
+@router.get("/export")
+async def export_itineraries(
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream all of the current user's itineraries with their stops, newest
+    first, as NDJSON or CSV (optionally gzip-compressed)
+    """
+    encoder = ExportEncoder(fmt, EXPORT_ITINERARY_FIELDS + EXPORT_STOP_FIELDS, compress=gzip)
+    return export_response(_export_rows(current_user.user_id, encoder), fmt, "itineraries", compress=gzip)
 
 
 @router.get("/{itinerary_id}")
 async def get_itinerary(
     itinerary_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get a specific itinerary by ID
+    Get a specific itinerary by ID, with full destination details
     """
-    itinerary = db.query(Itinerary).filter(
-        Itinerary.itinerary_id == itinerary_id,
-        Itinerary.user_id == current_user.user_id
-    ).first()
+    result = await db.execute(
+        select(Itinerary).where(
+            Itinerary.itinerary_id == itinerary_id,
+            Itinerary.user_id == current_user.user_id
+        )
+    )
+    itinerary = result.scalars().first()
 
     if not itinerary:
         raise HTTPException(
@@ -137,31 +461,42 @@ async def get_itinerary(
             detail="Itinerary not found"
         )
 
-    destinations = json.loads(itinerary.destinations) if isinstance(itinerary.destinations, str) else itinerary.destinations
+    result = await db.execute(
+        select(ItineraryItem)
+        .where(ItineraryItem.itinerary_id == itinerary_id)
+        .order_by(ItineraryItem.position)
+    )
+    stops = [
+        {
+            "destination_id": item.destination_id,
+            "start_day": item.start_day,
+            "end_day": item.end_day,
+            "cost": item.cost,
+            "transfer_distance_km": item.transfer_distance_km,
+            "transfer_days": item.transfer_days
+        }
+        for item in result.scalars().all()
+    ]
 
-    return {
-        "itinerary_id": itinerary.itinerary_id,
-        "title": itinerary.title,
-        "destinations": destinations,
-        "total_days": itinerary.total_days,
-        "total_cost": itinerary.total_cost,
-        "created_at": itinerary.created_at
-    }
+    return _itinerary_response(itinerary, await _catalog_snapshot(), stops)
 
 
 @router.delete("/{itinerary_id}")
 async def delete_itinerary(
     itinerary_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Delete an itinerary
     """
-    itinerary = db.query(Itinerary).filter(
-        Itinerary.itinerary_id == itinerary_id,
-        Itinerary.user_id == current_user.user_id
-    ).first()
+    result = await db.execute(
+        select(Itinerary).where(
+            Itinerary.itinerary_id == itinerary_id,
+            Itinerary.user_id == current_user.user_id
+        )
+    )
+    itinerary = result.scalars().first()
 
     if not itinerary:
         raise HTTPException(
@@ -169,8 +504,9 @@ async def delete_itinerary(
             detail="Itinerary not found"
         )
 
-    db.delete(itinerary)
-    db.commit()
+    await db.execute(delete(ItineraryItem).where(ItineraryItem.itinerary_id == itinerary_id))
+    await db.delete(itinerary)
+    await db.commit()
 
     return {"message": "Itinerary deleted successfully"}
 
@@ -181,108 +517,56 @@ async def auto_generate_itinerary(
     duration_days: int,
     interests: List[str],
     difficulty_preference: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Auto-generate an itinerary based on user preferences
     """
     try:
-        # Query destinations matching preferences
-        query = db.query(Destination)
-
-        # Filter by interests (categories)
-        if interests:
-            query = query.filter(Destination.category.in_(interests))
-
-        # Filter by difficulty
-        query = query.filter(Destination.difficulty_level <= difficulty_preference)
+        # The user's stored profile shapes the scores; the request fields win
+        result = await db.execute(
+            select(UserPreference).where(UserPreference.user_id == current_user.user_id)
+        )
+        user_preferences = _trip_preferences(
+            result.scalars().first(), budget, duration_days, interests, difficulty_preference
+        )
 
-        # Get destinations sorted by popularity
-        destinations = query.order_by(Destination.popularity_score.desc()).all()
+        # Scoring, selection and routing are CPU-bound: keep them off the event loop
+        picked = await run_in_threadpool(
+            _select_trip_destinations, user_preferences, budget, duration_days, interests, difficulty_preference
+        )
 
-        if not destinations:
+        if picked is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No destinations match your preferences"
             )
 
-        # Select destinations that fit the duration and budget
-        selected_destinations = []
-        current_days = 0
-        current_cost = 0
-
-        for dest in destinations:
-            projected_days = current_days + dest.duration_days
-            projected_cost = current_cost + (dest.avg_cost_per_day * dest.duration_days)
-
-            if projected_days <= duration_days and projected_cost <= budget:
-                selected_destinations.append(dest.destination_id)
-                current_days = projected_days
-                current_cost = projected_cost
-
-            if current_days >= duration_days * 0.9:  # Fill at least 90% of duration
-                break
-
-        if not selected_destinations:
+        selection, stops, route = picked
+        if not stops:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Unable to create itinerary within budget and duration constraints"
             )
 
-        # Create itinerary using the create endpoint logic
-        destinations_data = db.query(Destination).filter(
-            Destination.destination_id.in_(selected_destinations)
-        ).all()
-
-        total_days = sum(dest.duration_days for dest in destinations_data)
-        total_cost = sum(dest.avg_cost_per_day * dest.duration_days for dest in destinations_data)
-
-        itinerary_destinations = []
-        current_day = 1
-
-        for dest in destinations_data:
-            itinerary_destinations.append({
-                "destination_id": dest.destination_id,
-                "name": dest.name,
-                "location": dest.location,
-                "start_day": current_day,
-                "end_day": current_day + dest.duration_days - 1,
-                "duration_days": dest.duration_days,
-                "cost": dest.avg_cost_per_day * dest.duration_days,
-                "activities": json.loads(dest.activities) if isinstance(dest.activities, str) else dest.activities,
-                "description": dest.description,
-                "difficulty_level": dest.difficulty_level,
-                "altitude": dest.altitude
-            })
-            current_day += dest.duration_days
-
-        itinerary = Itinerary(
-            user_id=current_user.user_id,
-            title=f"Auto-Generated Trip - {duration_days} Days",
-            destinations=json.dumps(itinerary_destinations),
-            total_days=total_days,
-            total_cost=total_cost,
-            created_at=datetime.utcnow()
+        itinerary = await _save_itinerary(
+            db, current_user.user_id, f"Auto-Generated Trip - {duration_days} Days", stops, route
         )
 
-        db.add(itinerary)
-        db.commit()
-        db.refresh(itinerary)
-
-        return {
-            "itinerary_id": itinerary.itinerary_id,
-            "title": itinerary.title,
-            "destinations": itinerary_destinations,
-            "total_days": total_days,
-            "total_cost": total_cost,
-            "created_at": itinerary.created_at
-        }
+        return _itinerary_response(
+            itinerary,
+            await _catalog_snapshot(),
+            stops,
+            total_distance_km=route["total_distance_km"],
+            total_transfer_days=route["total_transfer_days"],
+            score=round(selection.score, 4)
+        )
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate itinerary: {str(e)}"
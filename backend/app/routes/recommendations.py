@@ -1,29 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, SessionLocal
 from app.schemas.preference import (
     PreferenceCreate,
     Preference,
     RecommendationRequest,
-    RecommendationResponse
+    RecommendationResponse,
+    BatchRecommendationRequest,
+    BatchRecommendationResponse
 )
 from app.models.preference import UserPreference
-from app.models.destination import Destination
-from app.ml_engine.recommender import recommender
+from app.models.recommendation import Recommendation
+from app.ml_engine.precompute import precompute_recommendations
+from app.ml_engine.recommender import recommender, preferences_to_dict, preferences_hash
+from app.ml_engine.spatial import parse_coordinates
+from app.utils.cache import TTLCache
 
 router = APIRouter()
 
+# Recommendation lists keyed by (user_id, preference hash, limit, model version)
+recommendation_cache = TTLCache(
+    maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl_seconds=settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
+
+
+def _parse_near(near: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Parse the optional near=lat,lon query parameter"""
+    if near is None:
+        return None
+    try:
+        return parse_coordinates(near)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _refresh_stored_recommendations(user_id: int):
+    """Background task: rescore one user and store the result"""
+    db = SessionLocal()
+    try:
+        precompute_recommendations(db, user_ids=[user_id])
+    except Exception as e:
+        print(f"Warning: could not precompute recommendations for user {user_id}: {e}")
+    finally:
+        db.close()
+
+
+def _load_stored_recommendations(
+    db: Session,
+    user_id: int,
+    prefs_key: str,
+    limit: int
+) -> Optional[List[RecommendationResponse]]:
+    """Read precomputed recommendations, or None if they are missing or stale"""
+
+    snapshot = recommender.snapshot
+    if snapshot is None:
+        return None
+
+    rows = db.query(Recommendation).filter(
+        Recommendation.user_id == user_id
+    ).order_by(Recommendation.rank).limit(limit).all()
+
+    if not rows:
+        return None
+
+    # Stored rows must come from the current model and current preferences
+    for stored in rows:
+        if stored.model_version != snapshot.catalog_hash or stored.preference_hash != prefs_key:
+            return None
+
+    # The stored list may be shorter than what was asked for
+    if len(rows) < min(limit, snapshot.n_items):
+        return None
+
+    # Destination details come from the same snapshot the rows were scored against
+    payloads = snapshot.payloads(
+        [snapshot.row_index[stored.destination_id] for stored in rows],
+        [stored.score for stored in rows]
+    )
+    return [RecommendationResponse(**payload) for payload in payloads]
+
 
 @router.post("/preferences", response_model=Preference)
 def save_preferences(
     user_id: int,
     preferences: PreferenceCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Save or update user preferences"""
 
+    # Any cached or stored recommendations for this user are now stale
+    recommendation_cache.invalidate_where(lambda key: key[0] == user_id)
+    background_tasks.add_task(_refresh_stored_recommendations, user_id)
+
     # Check if preferences exist
     existing = db.query(UserPreference).filter(
         UserPreference.user_id == user_id
@@ -40,7 +115,19 @@ def save_preferences(
         # Create new
         new_pref = UserPreference(user_id=user_id, **preferences.dict())
         db.add(new_pref)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request created the row first (one row per user): update it instead
+            db.rollback()
+            existing = db.query(UserPreference).filter(
+                UserPreference.user_id == user_id
+            ).first()
+            for key, value in preferences.dict(exclude_unset=True).items():
+                setattr(existing, key, value)
+            db.commit()
+            db.refresh(existing)
+            return existing
         db.refresh(new_pref)
         return new_pref
 
@@ -59,14 +146,64 @@ def get_preferences(user_id: int, db: Session = Depends(get_db)):
     return pref
 
 
+@router.post("/recommend/batch", response_model=List[BatchRecommendationResponse])
+def get_recommendations_batch(
+    request: BatchRecommendationRequest,
+    near: Optional[str] = Query(None, description="Boost destinations near 'lat,lon'"),
+    db: Session = Depends(get_db)
+):
+    """Get ML-based recommendations for many users in one scoring pass"""
+
+    location = _parse_near(near)
+
+    # Get preferences for all requested users in one query
+    prefs_rows = db.query(UserPreference).filter(
+        UserPreference.user_id.in_(request.user_ids)
+    ).all()
+    prefs_by_user = {prefs.user_id: prefs for prefs in prefs_rows}
+    scored_user_ids = [user_id for user_id in request.user_ids if user_id in prefs_by_user]
+
+    try:
+        # Score every user with preferences in a single batch
+        batch = recommender.get_recommendations_batch(
+            list_of_preferences=[preferences_to_dict(prefs_by_user[user_id]) for user_id in scored_user_ids],
+            db=db,
+            n_recommendations=request.limit,
+            details=True,
+            near=location
+        )
+        recommendations_by_user = dict(zip(scored_user_ids, batch))
+
+        return [
+            BatchRecommendationResponse(
+                user_id=user_id,
+                recommendations=[
+                    RecommendationResponse(**payload)
+                    for payload in recommendations_by_user.get(user_id, [])
+                ]
+            )
+            for user_id in request.user_ids
+        ]
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating recommendations: {str(e)}"
+        )
+
+
 @router.post("/recommend/{user_id}", response_model=List[RecommendationResponse])
 def get_recommendations(
     user_id: int,
     request: RecommendationRequest,
+    background_tasks: BackgroundTasks,
+    near: Optional[str] = Query(None, description="Boost destinations near 'lat,lon'"),
     db: Session = Depends(get_db)
 ):
     """Get ML-based recommendations for user"""
 
+    location = _parse_near(near)
+
     # Get user preferences
     prefs = db.query(UserPreference).filter(
         UserPreference.user_id == user_id
@@ -79,39 +216,39 @@ def get_recommendations(
         )
 
     # Convert to dict for ML engine
-    user_prefs_dict = {
-        'interests': prefs.interests or {},
-        'budget_range': prefs.budget_range or 'mid-range',
-        'fitness_level': prefs.fitness_level or 3,
-        'difficulty_preference': prefs.difficulty_preference or 2,
-        'preferred_seasons': prefs.preferred_seasons or ['Spring', 'Autumn']
-    }
+    user_prefs_dict = preferences_to_dict(prefs)
 
     try:
-        # Get recommendations from ML engine
+        # Serve repeated requests from the cache while preferences and model are unchanged
+        recommender.ensure_fresh(db)
+        prefs_key = preferences_hash(user_prefs_dict)
+        cache_key = (user_id, prefs_key, request.limit, recommender.model_version, location)
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Precomputed rows carry no location boost, so they only serve plain requests
+        if location is None:
+            # Precomputed rows are used while they match the current model and preferences
+            stored = _load_stored_recommendations(db, user_id, prefs_key, request.limit)
+            if stored is not None:
+                recommendation_cache.set(cache_key, stored)
+                return stored
+
+            # Stale or missing: score live now and refresh the stored rows afterwards
+            background_tasks.add_task(_refresh_stored_recommendations, user_id)
+
+        # Get recommendations from ML engine, with display details from the model snapshot
         recommendations = recommender.get_recommendations(
             user_preferences=user_prefs_dict,
             db=db,
-            n_recommendations=request.limit
+            n_recommendations=request.limit,
+            details=True,
+            near=location
         )
+        result = [RecommendationResponse(**payload) for payload in recommendations]
 
-        # Fetch destination details
-        result = []
-        for dest_id, dest_name, score in recommendations:
-            dest = db.query(Destination).filter(
-                Destination.destination_id == dest_id
-            ).first()
-
-            if dest:
-                result.append(RecommendationResponse(
-                    destination_id=dest.destination_id,
-                    name=dest.name,
-                    score=round(score, 4),
-                    category=dest.category or "Unknown",
-                    description=dest.description or "",
-                    image_url=dest.image_url
-                ))
-
+        recommendation_cache.set(cache_key, result)
         return result
 
     except Exception as e:
@@ -119,3 +256,9 @@ def get_recommendations(
             status_code=500,
             detail=f"Error generating recommendations: {str(e)}"
         )
+
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Recommendation cache hit/miss counters"""
+    return recommendation_cache.stats()
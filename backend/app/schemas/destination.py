@@ -32,6 +32,19 @@ class Destination(DestinationBase):
         from_attributes = True
 
 
+class NearbyDestination(Destination):
+    distance_km: float
+
+
+class SimilarDestination(BaseModel):
+    destination_id: int
+    name: str
+    score: float
+    category: str
+    description: str
+    image_url: Optional[str] = None
+
+
 class DestinationFilter(BaseModel):
     category: Optional[str] = None
     min_cost: Optional[int] = None
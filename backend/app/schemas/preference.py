@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, List
 
+from app.config import settings
+
 
 class PreferenceBase(BaseModel):
     interests: Optional[Dict[str, int]] = None  # {"adventure": 8, "cultural": 6}
@@ -25,7 +27,13 @@ class Preference(PreferenceBase):
 
 
 class RecommendationRequest(BaseModel):
-    limit: Optional[int] = 10
+    # Capped at the precomputed list length, so stored rows can serve any request
+    limit: int = Field(10, ge=1, le=settings.PRECOMPUTE_TOP_N)
+
+
+class BatchRecommendationRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    limit: int = Field(10, ge=1, le=settings.PRECOMPUTE_TOP_N)
 
 
 class RecommendationResponse(BaseModel):
@@ -35,3 +43,8 @@ class RecommendationResponse(BaseModel):
     category: str
     description: str
     image_url: Optional[str] = None
+
+
+class BatchRecommendationResponse(BaseModel):
+    user_id: int
+    recommendations: List[RecommendationResponse]
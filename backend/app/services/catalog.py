@@ -0,0 +1,318 @@
+"""
+In-memory destination catalog for NepalTourAI
+Browse routes filter, sort and page a columnar snapshot of the destinations
+table instead of querying the database on every request.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.destination import Destination
+from app.schemas.destination import Destination as DestinationSchema
+from app.services.catalog_version import read_catalog_version
+from app.services.search import SearchIndex, top_ordered
+
+# Fields returned by the destination routes, in schema order
+DISPLAY_FIELDS = [
+    'destination_id', 'name', 'location', 'latitude', 'longitude', 'category',
+    'description', 'activities', 'difficulty_level', 'best_season',
+    'avg_cost_per_day', 'duration_days', 'popularity_score', 'altitude',
+    'permits_required', 'image_url',
+]
+
+
+def _encode(values: List[Optional[str]]):
+    """Dictionary-encode a string column: (labels, int32 codes with -1 for NULL)"""
+
+    labels = sorted({value for value in values if value is not None})
+    lookup = {label: code for code, label in enumerate(labels)}
+    codes = np.array([lookup.get(value, -1) for value in values], dtype=np.int32)
+    return labels, codes
+
+
+def _numeric(values: List) -> np.ndarray:
+    """Numeric column as float64 with NaN for NULL, so comparisons exclude it like SQL does"""
+    return np.array([np.nan if value is None else float(value) for value in values], dtype=float)
+
+
+def encode_cursor(sort: str, position: Tuple[float, int]) -> str:
+    """Opaque keyset cursor for the position of the last row on a page"""
+    payload = json.dumps([sort, position[0], position[1]]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[float, int]:
+    """Position encoded in a cursor; ValueError if it is malformed or from another ordering"""
+
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, key, destination_id = json.loads(payload)
+        position = (float(key), int(destination_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if cursor_sort != sort:
+        raise ValueError("Cursor belongs to a different ordering")
+    return position
+
+
+@dataclass(frozen=True, eq=False)
+class CatalogSnapshot:
+    """Immutable columnar view of the destinations table"""
+
+    version: str
+    loaded_at: datetime
+    rows: List[Dict]
+
+    def __post_init__(self):
+        rows = self.rows
+        object.__setattr__(self, 'ids', np.array([row['destination_id'] for row in rows], dtype=np.int64))
+        object.__setattr__(self, 'id_index', {row['destination_id']: i for i, row in enumerate(rows)})
+
+        categories, category_codes = _encode([row['category'] for row in rows])
+        seasons, season_codes = _encode([row['best_season'] for row in rows])
+        object.__setattr__(self, 'categories', {label: code for code, label in enumerate(categories)})
+        object.__setattr__(self, 'category_codes', category_codes)
+        object.__setattr__(self, 'seasons', {label: code for code, label in enumerate(seasons)})
+        object.__setattr__(self, 'season_codes', season_codes)
+
+        object.__setattr__(self, 'cost', _numeric([row['avg_cost_per_day'] for row in rows]))
+        object.__setattr__(self, 'difficulty', _numeric([row['difficulty_level'] for row in rows]))
+        object.__setattr__(self, 'duration', _numeric([row['duration_days'] for row in rows]))
+        object.__setattr__(self, 'popularity', _numeric([row['popularity_score'] for row in rows]))
+
+        # Sort key for browse listings: most popular first, NULLs last
+        object.__setattr__(
+            self, 'popularity_key', np.where(np.isnan(self.popularity), -np.inf, self.popularity)
+        )
+
+        # Full-text index, rebuilt with every snapshot so it follows catalog changes
+        object.__setattr__(self, 'search_index', SearchIndex(
+            [row['name'] for row in rows],
+            [row['location'] for row in rows],
+            [row['description'] for row in rows]
+        ))
+
+        # Encoded JSON of each row, filled in on first use and dropped with the snapshot
+        object.__setattr__(self, 'fragments', [None] * len(rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def fragment(self, index: int) -> bytes:
+        """JSON bytes of one row exactly as the destination routes return it"""
+
+        fragment = self.fragments[index]
+        if fragment is None:
+            fragment = DestinationSchema.model_validate(self.rows[index]).model_dump_json().encode()
+            self.fragments[index] = fragment
+        return fragment
+
+    def encode(self, rows: List[Dict]) -> bytes:
+        """JSON array of catalog rows, assembled from the cached fragments"""
+        return b'[' + b','.join(self.fragment(self.id_index[row['destination_id']]) for row in rows) + b']'
+
+    def get(self, destination_id: int) -> Optional[Dict]:
+        index = self.id_index.get(destination_id)
+        return None if index is None else self.rows[index]
+
+    def mask(
+        self,
+        category: Optional[str] = None,
+        min_cost: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        difficulty: Optional[int] = None,
+        season: Optional[str] = None
+    ) -> np.ndarray:
+        """Boolean row mask for the given filters (None means no filter)"""
+
+        mask = np.ones(len(self.rows), dtype=bool)
+
+        if category:
+            mask &= self.category_codes == self.categories.get(category, -2)
+
+        if min_cost is not None:
+            mask &= self.cost >= min_cost
+
+        if max_cost is not None:
+            mask &= self.cost <= max_cost
+
+        if difficulty is not None:
+            mask &= self.difficulty == difficulty
+
+        if season:
+            mask &= self.season_codes == self.seasons.get(season, -2)
+
+        return mask
+
+    def page(
+        self,
+        mask: np.ndarray,
+        key: np.ndarray,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[float, int]]]:
+        """
+        One page of the rows selected by mask, ordered by key descending and
+        then destination_id. after is the (key, destination_id) of the last row
+        already seen (keyset pagination). Returns the rows and the position of
+        the last one, or None when nothing follows.
+        """
+
+        if after is not None:
+            after_key, after_id = after
+            mask = mask & ((key < after_key) | ((key == after_key) & (self.ids > after_id)))
+
+        # Rows are stored in destination_id order, so row order breaks ties
+        candidates = np.flatnonzero(mask)
+        indices = top_ordered(key, candidates, skip + limit)[skip:]
+
+        position = None
+        if len(indices) and len(candidates) > skip + limit:
+            last = indices[-1]
+            position = (float(key[last]), int(self.ids[last]))
+
+        return [self.rows[i] for i in indices], position
+
+
+class CatalogService:
+    """
+    Holds the current catalog snapshot and reloads it when the table changes.
+    Changes are detected with the catalog version counter, a single-row read;
+    the table itself is only read again when the counter has moved.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Held by whoever is loading, including a background refresh thread
+        self._lock = threading.Lock()
+        self._stale = False
+        # Catalog version the current snapshot was read at
+        self._loaded_version: Optional[int] = None
+        self.last_refresh_check = 0.0
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """Current snapshot, loading it first when needed"""
+        self.ensure_fresh()
+        return self._snapshot
+
+    def invalidate(self):
+        """Mark the snapshot stale (called automatically when a destination write commits)"""
+        self._stale = True
+
+    def load(self) -> CatalogSnapshot:
+        """Read the whole destinations table into a new snapshot and publish it"""
+
+        db = SessionLocal()
+        try:
+            # Read before the rows: a write racing the load only causes one more reload
+            loaded_version = read_catalog_version(db)
+            destinations = db.query(Destination).order_by(Destination.destination_id).all()
+            rows = [{field: getattr(dest, field) for field in DISPLAY_FIELDS} for dest in destinations]
+        finally:
+            db.close()
+
+        version = hashlib.sha1(
+            json.dumps([list(row.values()) for row in rows], default=str).encode()
+        ).hexdigest()
+
+        # Unchanged table: keep the existing snapshot (and its derived arrays)
+        if self._snapshot is None or self._snapshot.version != version:
+            self._snapshot = CatalogSnapshot(version=version, loaded_at=datetime.utcnow(), rows=rows)
+        self._loaded_version = loaded_version
+        return self._snapshot
+
+    def _refresh_locked(self) -> bool:
+        self._stale = False
+        self.last_refresh_check = time.monotonic()
+
+        db = SessionLocal()
+        try:
+            current_version = read_catalog_version(db)
+        finally:
+            db.close()
+
+        # Without a counter every check has to reload
+        if self._snapshot is not None and current_version is not None and current_version == self._loaded_version:
+            return False
+        self.load()
+        return True
+
+    def refresh(self) -> bool:
+        """Reload now if the catalog version moved; returns True if the table was read"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_in_background(self):
+        try:
+            self._refresh_locked()
+        except Exception as e:
+            print(f"Warning: destination catalog refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+    def ensure_fresh(self):
+        """
+        Load on first use. After that, check the catalog version after local
+        writes or at most once per refresh interval, on a background thread:
+        requests keep reading the current snapshot while a reload runs.
+        """
+
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._refresh_locked()
+            return
+
+        if not self._stale and time.monotonic() - self.last_refresh_check < settings.CATALOG_REFRESH_INTERVAL_SECONDS:
+            return
+
+        # A check is already running; the worker thread releases the lock when it is done
+        if not self._lock.acquire(blocking=False):
+            return
+        self.last_refresh_check = time.monotonic()
+        try:
+            threading.Thread(target=self._refresh_in_background, name="catalog-refresh", daemon=True).start()
+        except Exception:
+            self._lock.release()
+            raise
+
+
+# Global catalog instance
+catalog = CatalogService()
+
+
+# Session.info key set when a flush wrote destinations and the commit is still to come
+_CATALOG_WRITE_PENDING = 'catalog_write_pending'
+
+
+@event.listens_for(Session, "after_flush")
+def _note_catalog_write(session, flush_context):
+    if any(isinstance(obj, Destination) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_CATALOG_WRITE_PENDING] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session):
+    # Only once committed: a reload started earlier would still read the old version
+    if session.info.pop(_CATALOG_WRITE_PENDING, False):
+        catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_write(session):
+    session.info.pop(_CATALOG_WRITE_PENDING, None)
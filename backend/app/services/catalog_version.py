@@ -0,0 +1,22 @@
+"""
+Catalog version counter for NepalTourAI
+Every destinations write bumps a single-row counter in the same transaction,
+so in-memory copies of the catalog (the browse snapshot, the recommender) can
+tell whether the table changed without reading it.
+"""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+# The bump itself runs from the model's flush event, so every ORM writer sends it
+from app.models.destination import CATALOG_VERSION_BUMP, CatalogVersion  # noqa: F401
+
+
+def read_catalog_version(db) -> Optional[int]:
+    """The catalog version counter, or None when the table or its row is missing"""
+    try:
+        return db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1))
+    except SQLAlchemyError:
+        db.rollback()
+        return None
@@ -0,0 +1,87 @@
+"""
+Bulk export encoding for NepalTourAI
+Turns batches of records (as fetched with yield_per) into NDJSON or CSV bytes,
+optionally as one continuous gzip stream, so an export of any size is sent
+without ever holding more than one batch in memory.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Dict, Iterable, List
+
+from fastapi.responses import StreamingResponse
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Query parameter pattern accepted by the export routes
+EXPORT_FORMAT_PATTERN = '^(' + '|'.join(EXPORT_FORMATS) + ')$'
+
+
+class ExportEncoder:
+    """Encodes successive batches of records; call finish() once after the last batch"""
+
+    def __init__(
+        self,
+        fmt: str,
+        fieldnames: List[str],
+        compress: bool = False,
+        json_fields: Iterable[str] = ()
+    ):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+
+        self.fmt = fmt
+        self.fieldnames = fieldnames
+        # List columns (e.g. activities) are written JSON-encoded in CSV, as the import expects
+        self.json_fields = [name for name in fieldnames if name in set(json_fields)]
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self.compressor = zlib.compressobj(wbits=31) if compress else None
+        self.header_written = False
+
+    def _encode_csv(self, records: Iterable[Dict]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self.header_written:
+            writer.writerow(self.fieldnames)
+            self.header_written = True
+        for record in records:
+            if self.json_fields:
+                record = {**record, **{name: json.dumps(record[name]) for name in self.json_fields}}
+            writer.writerow([record[name] for name in self.fieldnames])
+        return buffer.getvalue()
+
+    def encode(self, records: Iterable[Dict]) -> bytes:
+        if self.fmt == 'csv':
+            text = self._encode_csv(records)
+        else:
+            # default=str writes Decimal and datetime values as the API does
+            text = ''.join(json.dumps(record, default=str) + '\n' for record in records)
+
+        data = text.encode('utf-8')
+        if self.compressor is not None:
+            # Flush each batch so clients can start decompressing right away
+            return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    def finish(self) -> bytes:
+        # A CSV export with no rows still gets its header
+        data = self._encode_csv([]).encode('utf-8') if self.fmt == 'csv' and not self.header_written else b''
+        if self.compressor is not None:
+            return self.compressor.compress(data) + self.compressor.flush()
+        return data
+
+
+def export_response(chunks, fmt: str, filename: str, compress: bool = False) -> StreamingResponse:
+    """
+    Stream the chunks as a file download. Compressed exports are sent with
+    Content-Encoding: gzip (the body is the gzip stream of the same file).
+    """
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=EXPORT_FORMATS[fmt], headers=headers)
@@ -0,0 +1,205 @@
+"""
+Bulk destination ingest for NepalTourAI
+Streams CSV or JSONL files in fixed-size batches, validates every row with the
+destination schema and upserts it by destination_id (INSERT ... ON CONFLICT),
+one short transaction per batch. A row only updates the columns it supplies.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import engine as default_engine
+from app.models.destination import Destination
+from app.schemas.destination import Destination as DestinationSchema
+from app.services.catalog import catalog
+from app.services.catalog_version import CATALOG_VERSION_BUMP
+
+# Rejected rows reported individually; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class IngestReport:
+    """Outcome of one ingest run"""
+
+    rows: int = 0
+    rejected: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def reject(self, where: str, reason: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{where}: {reason}")
+
+
+@dataclass
+class MalformedRow:
+    """A JSONL line that is not a JSON object, passed on so the ingest can reject it and go on"""
+
+    line: int
+    message: str
+
+
+def read_rows(path: Path) -> Iterator[Union[Dict, MalformedRow]]:
+    """
+    Stream raw rows from a .csv or .jsonl/.ndjson file, one dict at a time.
+    Unparseable JSONL lines come through as MalformedRow instead of raising.
+    """
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in ('.csv', '.jsonl', '.ndjson'):
+        raise ValueError(f"Unsupported file type '{suffix}' (expected .csv, .jsonl or .ndjson)")
+
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        if suffix == '.csv':
+            for row in csv.DictReader(file):
+                # CSV has no NULL: an empty cell leaves the stored value as it is
+                yield {key: value for key, value in row.items() if value != ''}
+        else:
+            for number, line in enumerate(file, start=1):
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield MalformedRow(number, f"invalid JSON ({e.msg})")
+                        continue
+                    yield row if isinstance(row, dict) else MalformedRow(number, "not a JSON object")
+
+
+def _validate(raw: Dict) -> Dict:
+    """
+    Schema-validated values of the columns one row supplies; ValidationError if
+    it is invalid. Defaults are left out so they never overwrite stored values.
+    """
+
+    # activities arrive JSON-encoded from CSV and the legacy loaders
+    activities = raw.get('activities')
+    if isinstance(activities, str):
+        try:
+            raw = {**raw, 'activities': json.loads(activities)}
+        except ValueError:
+            pass  # Left as is for the schema to reject
+
+    return DestinationSchema.model_validate(raw).model_dump(exclude_unset=True)
+
+
+@lru_cache(maxsize=64)
+def _upsert_statement(dialect: str, columns: FrozenSet[str]):
+    """
+    INSERT ... ON CONFLICT (destination_id) DO UPDATE for the given dialect,
+    updating only the given columns of an existing row
+    """
+
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported for '{dialect}'")
+
+    table = Destination.__table__
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.destination_id],
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in table.columns if column.name in columns and not column.primary_key
+        }
+    )
+
+
+def _write_batch(engine: Engine, batch: Dict[int, Dict]):
+    # One executemany per set of supplied columns, each updating only those
+    groups: Dict[FrozenSet[str], List[Dict]] = {}
+    for values in batch.values():
+        groups.setdefault(frozenset(values), []).append(values)
+
+    with engine.begin() as conn:
+        for columns, rows in groups.items():
+            conn.execute(_upsert_statement(engine.dialect.name, columns), rows)
+        # Tells every API worker's catalog the table changed
+        conn.execute(CATALOG_VERSION_BUMP)
+
+
+def ingest_rows(
+    rows: Iterable[Dict],
+    batch_size: Optional[int] = None,
+    engine: Optional[Engine] = None
+) -> IngestReport:
+    """
+    Validate and upsert destination rows in batches. Invalid rows are skipped
+    and counted. Columns a row leaves out keep their stored values (or the
+    column default on insert), also when an id repeats within a batch.
+    Returns the counts and throughput.
+    """
+
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    engine = engine or default_engine
+    if engine.dialect.name not in ('postgresql', 'sqlite'):
+        raise ValueError(f"Bulk upsert is not supported for '{engine.dialect.name}'")
+    report = IngestReport()
+    start = time.perf_counter()
+
+    batch: Dict[int, Dict] = {}
+    for number, raw in enumerate(rows, start=1):
+        if isinstance(raw, MalformedRow):
+            report.reject(f"line {raw.line}", raw.message)
+            continue
+        try:
+            values = _validate(raw)
+        except ValidationError as e:
+            report.reject(f"row {number}", f"{e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+            continue
+
+        # A repeated id merges, so each row's supplied columns still apply in order
+        batch[values['destination_id']] = {**batch.get(values['destination_id'], {}), **values}
+        if len(batch) >= batch_size:
+            _write_batch(engine, batch)
+            report.rows += len(batch)
+            report.batches += 1
+            batch = {}
+
+    if batch:
+        _write_batch(engine, batch)
+        report.rows += len(batch)
+        report.batches += 1
+
+    # Explicit ids do not advance a PostgreSQL serial; keep later ORM inserts clear of them
+    if engine.dialect.name == 'postgresql' and report.rows:
+        with engine.begin() as conn:
+            max_id = conn.execute(select(func.max(Destination.destination_id))).scalar()
+            conn.execute(
+                text("SELECT setval(pg_get_serial_sequence('destinations', 'destination_id'), :max_id)"),
+                {"max_id": max_id}
+            )
+
+    report.seconds = time.perf_counter() - start
+
+    # Core upserts bypass the ORM events that normally invalidate the local catalog
+    catalog.invalidate()
+    return report
+
+
+def ingest_file(
+    path: Path,
+    batch_size: Optional[int] = None,
+    engine: Optional[Engine] = None
+) -> IngestReport:
+    """Stream one CSV or JSONL file into the destinations table"""
+    return ingest_rows(read_rows(path), batch_size=batch_size, engine=engine)
@@ -0,0 +1,127 @@
+"""
+Itinerary route ordering for NepalTourAI
+Orders itinerary stops to keep travel short: a vectorized haversine distance
+matrix, nearest-neighbour construction, then 2-opt improvement under a time budget.
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+from app.ml_engine.spatial import EARTH_RADIUS_KM
+
+
+@dataclass
+class RoutePlan:
+    """Visiting order (indices into the input stops) and the leg distance into each stop"""
+
+    order: np.ndarray
+    legs_km: np.ndarray
+    total_km: float
+
+
+def haversine_matrix(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km, computed in one vectorized pass"""
+
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def transfer_days(distance_km: float) -> int:
+    """Estimated travel days for one leg; short hops happen on the same day"""
+
+    if distance_km <= settings.ITINERARY_SAME_DAY_TRANSFER_KM:
+        return 0
+    return math.ceil(distance_km / settings.ITINERARY_TRANSFER_KM_PER_DAY)
+
+
+def _nearest_neighbour(dist: np.ndarray, deadline: float) -> np.ndarray:
+    """
+    Best nearest-neighbour path over several start stops. Remote stops are
+    tried first (they tend to be the ends of a good path); at least one start
+    always runs, further ones only while time remains.
+    """
+
+    n = len(dist)
+    best_path, best_length = None, np.inf
+    for start in np.argsort(-dist.sum(axis=1)):
+        if best_path is not None and time.perf_counter() >= deadline:
+            break
+        path = [start]
+        visited = np.zeros(n, dtype=bool)
+        visited[start] = True
+        length = 0.0
+        for _ in range(n - 1):
+            candidates = np.where(visited, np.inf, dist[path[-1]])
+            nxt = int(np.argmin(candidates))
+            length += candidates[nxt]
+            path.append(nxt)
+            visited[nxt] = True
+        if length < best_length:
+            best_path, best_length = path, length
+    return np.array(best_path)
+
+
+def _two_opt(path: np.ndarray, dist: np.ndarray, deadline: float) -> np.ndarray:
+    """
+    Improve an open path with 2-opt moves until no move helps or time runs out.
+    A zero-distance dummy node closes the path into a tour, so reversing a
+    prefix or suffix is just another 2-opt move.
+    """
+
+    n = len(path)
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = dist
+    tour = np.append(path, n)
+    m = n + 1
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(m - 2):
+            a, b = tour[i], tour[i + 1]
+            c = tour[i + 2:]
+            d = tour[np.r_[i + 3:m, 0]][:len(c)]
+            # Gain of replacing edges (a,b) and (c,d) by (a,c) and (b,d), for every j at once
+            delta = padded[a, c] + padded[b, d] - padded[a, b] - padded[c, d]
+            j = int(np.argmin(delta))
+            if delta[j] < -1e-9:
+                tour[i + 1:i + 3 + j] = tour[i + 1:i + 3 + j][::-1]
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+
+    # Open the tour at the dummy node
+    dummy = int(np.flatnonzero(tour == n)[0])
+    return np.concatenate([tour[dummy + 1:], tour[:dummy]])
+
+
+def plan_route(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    time_budget_ms: Optional[float] = None
+) -> RoutePlan:
+    """Order stops (all with coordinates) to minimise total travel distance"""
+
+    n = len(latitudes)
+    if n == 0:
+        return RoutePlan(order=np.array([], dtype=int), legs_km=np.array([]), total_km=0.0)
+
+    budget = settings.ITINERARY_ROUTE_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    deadline = time.perf_counter() + budget / 1000
+
+    dist = haversine_matrix(latitudes, longitudes)
+    # Construction gets half the budget, 2-opt the rest
+    order = _nearest_neighbour(dist, time.perf_counter() + budget / 2000) if n > 2 else np.arange(n)
+    if n > 3:
+        order = _two_opt(order, dist, deadline)
+
+    legs = np.concatenate([[0.0], dist[order[:-1], order[1:]]])
+    return RoutePlan(order=order, legs_km=legs, total_km=float(legs.sum()))
@@ -0,0 +1,135 @@
+"""
+Full-text destination search for NepalTourAI
+A static BM25 inverted index over destination name, location and description,
+tokenized exactly like the recommender's TF-IDF content model.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from app.ml_engine.recommender import TEXT_ANALYZER_OPTIONS
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Name terms count this many times, a simple field boost over the description
+NAME_WEIGHT = 2
+
+# Maximum vocabulary terms a trailing partial word expands to, and their weight
+MAX_PREFIX_EXPANSION = 50
+PREFIX_WEIGHT = 0.5
+
+
+class SearchIndex:
+    """BM25 index built once per catalog snapshot; queries touch only the postings of their terms"""
+
+    def __init__(self, names: List[str], locations: List[str], descriptions: List[str]):
+        documents = [
+            ' '.join([name or ''] * NAME_WEIGHT + [location or '', description or ''])
+            for name, location, description in zip(names, locations, descriptions)
+        ]
+        self.n_docs = len(documents)
+        vectorizer = CountVectorizer(**TEXT_ANALYZER_OPTIONS, dtype=np.float64)
+        self.analyzer = vectorizer.build_analyzer()
+        self.tokenizer = vectorizer.build_tokenizer()
+
+        try:
+            counts = vectorizer.fit_transform(documents).tocsr()
+        except ValueError:
+            # Empty catalog (or nothing but stop words): nothing can match
+            self.vocabulary = {}
+            self.terms = np.array([], dtype=object)
+            self.postings = None
+            return
+
+        self.vocabulary = vectorizer.vocabulary_
+        self.terms = vectorizer.get_feature_names_out()
+
+        # Okapi BM25 weight of every (document, term) pair, precomputed
+        n_docs = counts.shape[0]
+        doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+        avg_length = doc_lengths.mean() or 1.0
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+        tf = counts.data
+        row_lengths = np.repeat(doc_lengths, np.diff(counts.indptr))
+        counts.data = idf[counts.indices] * tf * (BM25_K1 + 1) / (
+            tf + BM25_K1 * (1 - BM25_B + BM25_B * row_lengths / avg_length)
+        )
+
+        # Term-major postings: row t lists the documents containing term t
+        self.postings = counts.T.tocsr()
+
+    def _query_terms(self, query: str) -> Dict[int, float]:
+        """Vocabulary term ids of a query, with the weight each contributes"""
+
+        tokens = self.analyzer(query)
+        term_weights = {self.vocabulary[token]: 1.0 for token in tokens if token in self.vocabulary}
+
+        # Search-as-you-type: a trailing partial word matches the terms it
+        # prefixes ("pokh" -> "pokhara"), at a lower weight than whole words
+        words = self.tokenizer(query.lower())
+        if words and words[-1] not in self.vocabulary and self.analyzer(words[-1]):
+            prefix = words[-1]
+            start = np.searchsorted(self.terms, prefix)
+            stop = np.searchsorted(self.terms, prefix + '\uffff')
+            for term_id in range(start, min(stop, start + MAX_PREFIX_EXPANSION)):
+                term_weights.setdefault(term_id, PREFIX_WEIGHT)
+
+        return term_weights
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for the query (0 means no match)"""
+
+        scores = np.zeros(self.n_docs)
+        if self.postings is None:
+            return scores
+
+        term_weights = self._query_terms(query)
+        if not term_weights:
+            return scores
+
+        indptr = self.postings.indptr
+        docs = np.concatenate([
+            self.postings.indices[indptr[t]:indptr[t + 1]] for t in term_weights
+        ])
+        weights = np.concatenate([
+            self.postings.data[indptr[t]:indptr[t + 1]] * weight for t, weight in term_weights.items()
+        ])
+
+        # Every BM25 weight is positive, so only matched documents end up non-zero
+        return np.bincount(docs, weights=weights, minlength=self.n_docs)
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Row indices of matching documents, best BM25 score first (ties in row order).
+        mask restricts the candidates to rows that pass other filters.
+        """
+
+        scores = self.scores(query)
+        if mask is not None:
+            scores[~mask] = 0
+        return top_ordered(scores, np.flatnonzero(scores), limit)
+
+
+def top_ordered(key: np.ndarray, candidates: np.ndarray, count: Optional[int] = None) -> np.ndarray:
+    """
+    Order candidate rows by key descending, ties by row ascending. With count,
+    only the first count rows are returned; the rest are never fully sorted.
+    """
+
+    if count is not None and count < len(candidates):
+        # Keep everything tied with the count-th best so the tie-break stays exact
+        kth = np.partition(key[candidates], len(candidates) - count)[len(candidates) - count]
+        candidates = candidates[key[candidates] >= kth]
+
+    ordered = candidates[np.lexsort((candidates, -key[candidates]))]
+    return ordered if count is None else ordered[:count]
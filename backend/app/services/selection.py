@@ -0,0 +1,159 @@
+"""
+Itinerary destination selection for NepalTourAI
+Chooses the set of destinations with the highest total recommender score that
+fits a trip's duration and budget: a 0/1 knapsack dynamic program over
+(days, cost buckets), run on NumPy arrays under a hard time budget.
+"""
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+
+
+@dataclass
+class Selection:
+    """Chosen rows (indices into the input arrays) and their totals"""
+
+    rows: np.ndarray
+    score: float
+    days: int
+    cost: float
+    # False when the time budget ran out and the best set found so far was returned
+    optimal: bool
+
+
+def _prune_dominated(candidates: np.ndarray, days: np.ndarray, weights: np.ndarray, values: np.ndarray, max_days: int, n_buckets: int) -> np.ndarray:
+    """
+    Drop candidates that can never be needed. If at least k other items have
+    the same duration, no higher cost bucket and no lower value, where k is the
+    most stops of that duration a trip can hold, any set using the item has a
+    spare one of them to swap in.
+    """
+
+    d, w, v = days[candidates], weights[candidates], values[candidates]
+    capacity = max_days // d
+
+    # Same duration and bucket: only the best `capacity` of each class survive
+    order = np.lexsort((-v, w, d))
+    key = d[order] * (n_buckets + 1) + w[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(key)) + 1]
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    order = order[rank < capacity[order]]
+
+    # Across cheaper buckets of the same duration: keep a running top-k of values
+    kept = []
+    current_days, best = None, []
+    for i in order:
+        if d[i] != current_days:
+            current_days, best = d[i], []
+        if len(best) < capacity[i]:
+            heapq.heappush(best, v[i])
+        elif v[i] > best[0]:
+            heapq.heapreplace(best, v[i])
+        else:
+            continue
+        kept.append(i)
+
+    return candidates[np.array(kept, dtype=np.int64)]
+
+
+def _greedy(order: np.ndarray, days: np.ndarray, weights: np.ndarray, max_days: int, n_buckets: int) -> list:
+    """First-fit in the given order; the fallback when the program cannot run to completion"""
+
+    chosen, days_left, buckets_left = [], max_days, n_buckets
+    for i in order:
+        if days[i] <= days_left and weights[i] <= buckets_left:
+            chosen.append(i)
+            days_left -= days[i]
+            buckets_left -= weights[i]
+            if days_left == 0:
+                break
+    return chosen
+
+
+def select_destinations(
+    values: np.ndarray,
+    days: np.ndarray,
+    costs: np.ndarray,
+    max_days: int,
+    budget: float,
+    time_budget_ms: Optional[float] = None,
+    cost_buckets: Optional[int] = None
+) -> Selection:
+    """
+    Maximise the total value of the chosen rows subject to total days <= max_days
+    and total cost <= budget. Rows with a non-positive value are never chosen.
+
+    Costs are rounded up to 1/cost_buckets of the budget, so every returned
+    set is within budget. Rows are added to the program best value-per-size
+    first; if the time budget runs out, the optimum over the rows processed so
+    far (or the greedy set, if better) is returned with optimal=False.
+    """
+
+    time_budget_ms = settings.ITINERARY_SELECTION_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    n_buckets = settings.ITINERARY_SELECTION_COST_BUCKETS if cost_buckets is None else cost_buckets
+    deadline = time.perf_counter() + time_budget_ms / 1000
+
+    values = np.asarray(values, dtype=float)
+    days = np.asarray(days, dtype=float)
+    costs = np.asarray(costs, dtype=float)
+
+    eligible = (
+        (values > 0) & (days >= 1) & (days <= max_days) &
+        (costs >= 0) & (costs <= budget)
+    )
+    candidates = np.flatnonzero(eligible)
+    if not len(candidates):
+        return Selection(rows=np.array([], dtype=np.int64), score=0.0, days=0, cost=0.0, optimal=True)
+
+    int_days = np.zeros(len(values), dtype=np.int64)
+    int_days[candidates] = days[candidates].astype(np.int64)
+    weights = np.zeros(len(values), dtype=np.int64)
+    weights[candidates] = np.ceil(costs[candidates] * n_buckets / budget - 1e-9).astype(np.int64) if budget > 0 else 0
+
+    candidates = _prune_dominated(candidates, int_days, weights, values, max_days, n_buckets)
+
+    # Most value per unit of (days, budget) first, so a cut-off keeps the best rows
+    density = values[candidates] / (int_days[candidates] / max_days + weights[candidates] / n_buckets + 1e-9)
+    candidates = candidates[np.argsort(-density, kind='stable')]
+
+    greedy = _greedy(candidates, int_days, weights, max_days, n_buckets)
+
+    # best[t, b]: highest value using at most t days and b cost buckets
+    best = np.zeros((max_days + 1, n_buckets + 1))
+    taken = []
+    optimal = True
+    for i in candidates:
+        if time.perf_counter() >= deadline:
+            optimal = False
+            break
+        d, w = int_days[i], weights[i]
+        with_item = best[:max_days + 1 - d, :n_buckets + 1 - w] + values[i]
+        take = with_item > best[d:, w:]
+        best[d:, w:] = np.where(take, with_item, best[d:, w:])
+        taken.append(take)
+
+    # Walk the decisions back from the full capacity
+    chosen, t, b = [], max_days, n_buckets
+    for i, take in zip(candidates[len(taken) - 1::-1], reversed(taken)):
+        d, w = int_days[i], weights[i]
+        if t >= d and b >= w and take[t - d, b - w]:
+            chosen.append(i)
+            t -= d
+            b -= w
+
+    if values[greedy].sum() > values[chosen].sum():
+        chosen = greedy
+
+    rows = np.sort(np.array(chosen, dtype=np.int64))
+    return Selection(
+        rows=rows,
+        score=float(values[rows].sum()),
+        days=int(int_days[rows].sum()),
+        cost=float(costs[rows].sum()),
+        optimal=optimal
+    )
@@ -1,20 +1,47 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.hashing import PasswordHasher, build_crypt_context
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (sync helpers for scripts; routes use password_hasher)
+pwd_context = build_crypt_context(settings.BCRYPT_ROUNDS)
+
+# Bounded process pool for hashing on the request path
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    rounds=settings.BCRYPT_ROUNDS,
+)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Fast path for authenticated requests: decoded claims keyed by token and
+# detached user rows keyed by user_id, so most requests skip JWT decoding
+# and the users lookup entirely
+token_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """Drop a cached user row (called automatically when a user is updated or deleted)"""
+    user_cache.invalidate(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_user(target.user_id)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -50,9 +77,25 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def verify_token_cached(token: str) -> Optional[dict]:
+    """verify_token with a TTL cache; cached claims are still checked for expiry"""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = verify_token(token)
+        if payload is None:
+            return None
+        token_cache.set(token, payload)
+
+    if payload.get("exp", 0) <= time.time():
+        token_cache.invalidate(token)
+        return None
+
+    return payload
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get the current authenticated user from the JWT token"""
     credentials_exception = HTTPException(
@@ -61,16 +104,24 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = verify_token(token)
+    payload = verify_token_cached(token)
     if payload is None:
         raise credentials_exception
 
-    user_id: int = payload.get("sub")
+    # login puts the email in "sub" and the numeric id in "user_id"
+    user_id: int = payload.get("user_id")
     if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = user_cache.get(user_id)
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User).where(User.user_id == user_id))
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+
+        # Detach so the cached row outlives this request's session
+        db.expunge(user)
+        user_cache.set(user_id, user)
 
     return user
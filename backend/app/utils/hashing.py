@@ -0,0 +1,161 @@
+"""
+Password hashing on a bounded process pool
+
+bcrypt is CPU-bound; running it inline ties up the request thread pool, so a
+burst of logins stalls unrelated endpoints. Hashing runs on a dedicated
+process pool with a bounded queue instead, and callers get HashingBusy when
+the queue is full so they can shed load.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Per-process contexts, keyed by bcrypt cost (populated inside the workers)
+_contexts = {}
+
+
+def build_crypt_context(rounds: int) -> CryptContext:
+    """bcrypt context that flags any hash with a different cost for rehashing"""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _context(rounds: int) -> CryptContext:
+    if rounds not in _contexts:
+        _contexts[rounds] = build_crypt_context(rounds)
+    return _contexts[rounds]
+
+
+def _warm_up(rounds: int):
+    _context(rounds)
+
+
+def _hash_in_worker(password: str, rounds: int) -> Tuple[str, float, float]:
+    started = time.time()
+    hashed = _context(rounds).hash(password)
+    return hashed, started, time.time()
+
+
+def _verify_in_worker(password: str, hashed: str, rounds: int) -> Tuple[Tuple[bool, Optional[str]], float, float]:
+    started = time.time()
+    result = _context(rounds).verify_and_update(password, hashed)
+    return result, started, time.time()
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded process pool and records timings"""
+
+    def __init__(self, max_workers: int, max_queue: int, rounds: int, window: int = 1000):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Rolling windows of recent timings (milliseconds)
+        self._hash_ms = deque(maxlen=window)
+        self._wait_ms = deque(maxlen=window)
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the server's threads and sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HashingBusy("Password hashing queue is full")
+            self._in_flight += 1
+
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self.completed += 1
+            self._wait_ms.append(max(started - submitted, 0.0) * 1000)
+            self._hash_ms.append((finished - started) * 1000)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        return await self._run(_hash_in_worker, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password. Returns (valid, new_hash); new_hash is set when the
+        stored hash uses a different cost and should be replaced.
+        """
+        valid, new_hash = await self._run(_verify_in_worker, password, hashed, self.rounds)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def start(self):
+        """Create the pool and spawn its workers up front so the first login does not pay for it"""
+        executor = self._get_executor()
+        for future in [executor.submit(_warm_up, self.rounds) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    @staticmethod
+    def _percentiles(samples) -> dict:
+        ordered = sorted(samples)
+        if not ordered:
+            return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "p50_ms": round(ordered[len(ordered) // 2], 2),
+            "p95_ms": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+
+    def metrics(self) -> dict:
+        """Hash latency, queue wait and load counters"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "bcrypt_rounds": self.rounds,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "hash_latency": self._percentiles(self._hash_ms),
+                "queue_wait": self._percentiles(self._wait_ms),
+            }
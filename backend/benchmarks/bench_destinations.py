@@ -0,0 +1,81 @@
+"""
+Benchmark for the destination browse routes
+Seeds a throwaway database with a synthetic catalog, then times each
+/api/destinations route in-process, for full responses and for conditional
+requests that send the ETag back (If-None-Match).
+
+Usage (from backend/):
+    python -m benchmarks.bench_destinations
+    python -m benchmarks.bench_destinations --destinations 100000 --requests 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import benchmarks.throwaway  # noqa: F401  (before the app imports)
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+from app.services.catalog import catalog
+from benchmarks.synthetic import seed_database
+
+PATHS = [
+    "/api/destinations/?limit=100",
+    "/api/destinations/?category=Trekking&limit=50",
+    "/api/destinations/?search=lake%20trek&limit=20",
+    "/api/destinations/popular/top?limit=10",
+    "/api/destinations/1",
+]
+
+
+async def run(path: str, n_requests: int, conditional: bool) -> dict:
+    """Issue n_requests sequential GETs; conditional ones send the first response's ETag"""
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(path)
+        first.raise_for_status()
+        etag = first.headers.get("etag")
+        if conditional and etag is None:
+            return None
+        headers = {"If-None-Match": etag} if conditional else {}
+
+        latencies = []
+        for _ in range(n_requests):
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == (304 if conditional else 200)
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "bytes": len(first.content),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the destination browse routes")
+    parser.add_argument("--destinations", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, args.destinations, n_users=0)
+    catalog.ensure_fresh()
+    print(f"✓ Seeded {args.destinations} destinations\n")
+
+    print(f"{'route':<48} {'bytes':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'304 p50 (ms)':>13}")
+    for path in PATHS:
+        full = asyncio.run(run(path, args.requests, conditional=False))
+        cached = asyncio.run(run(path, args.requests, conditional=True))
+        cached_p50 = f"{cached['p50_ms']:>13.2f}" if cached else f"{'n/a':>13}"
+        print(f"{path:<48} {full['bytes']:>8} {full['p50_ms']:>9.2f} {full['p95_ms']:>9.2f} {cached_p50}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark for the bulk export routes
+Seeds a throwaway database with a synthetic catalog of each size in turn and
+streams /api/destinations/export in every format, then pulls the same catalog
+by following the paged list route's cursors (what bulk consumers did before).
+With --memory, peak traced memory shows whether an export grows with the table.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --sizes 10000,100000,300000 --memory
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import benchmarks.throwaway  # noqa: F401  (before the app imports)
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+from app.models.destination import Destination
+from app.services.catalog import catalog
+from benchmarks.synthetic import seed_database
+
+EXPORTS = [
+    "/api/destinations/export?format=ndjson",
+    "/api/destinations/export?format=csv",
+    "/api/destinations/export?format=csv&gzip=true",
+]
+
+
+def seed(n_destinations: int):
+    """Replace the catalog with n_destinations synthetic rows"""
+
+    with engine.begin() as conn:
+        conn.execute(Destination.__table__.delete())
+    # Bumps the catalog version, so the snapshot is rebuilt for the new size
+    seed_database(engine, n_destinations, n_users=0)
+
+
+async def export(path: str) -> dict:
+    """
+    Stream one export through the ASGI app, counting and discarding wire bytes.
+    httpx's ASGITransport buffers whole bodies, so the app is driven directly.
+    """
+
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": route, "raw_path": route.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("bench", 0), "server": ("bench", 80),
+    }
+    state = {"bytes": 0, "status": None, "requested": False}
+    finished = asyncio.Event()
+
+    async def receive():
+        if not state["requested"]:
+            state["requested"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            state["bytes"] += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    assert state["status"] == 200, state["status"]
+    return {"seconds": time.perf_counter() - start, "bytes": state["bytes"], "requests": 1}
+
+
+async def paged(client: httpx.AsyncClient, limit: int = 100) -> dict:
+    """Walk the whole catalog through the list route, limit rows a page"""
+
+    start = time.perf_counter()
+    n_bytes, requests, cursor = 0, 0, None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/destinations/", params=params)
+        response.raise_for_status()
+        n_bytes += len(response.content)
+        requests += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    return {"seconds": time.perf_counter() - start, "bytes": n_bytes, "requests": requests}
+
+
+async def measure(fn, *args, memory: bool) -> dict:
+    if memory:
+        tracemalloc.start()
+    result = await fn(*args)
+    if memory:
+        result["peak_mib"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result
+
+
+async def run(size: int, memory: bool):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        results = [(path, await measure(export, path, memory=memory)) for path in EXPORTS]
+        # Build the snapshot first so paging is timed warm, as a running server would serve it
+        catalog.refresh()
+        results.append(("paged /api/destinations/?limit=100", await measure(paged, client, memory=memory)))
+
+    for label, result in results:
+        peak = f"{result['peak_mib']:>10.1f}" if "peak_mib" in result else f"{'n/a':>10}"
+        print(
+            f"{size:>8} {label:<48} {result['requests']:>6} {result['bytes'] / 2 ** 20:>9.1f} "
+            f"{result['seconds']:>8.2f} {size / result['seconds']:>10,.0f} {peak}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bulk export routes against paging")
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated catalog sizes")
+    parser.add_argument("--memory", action="store_true", help="trace peak Python memory (slows every run)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"{'rows':>8} {'route':<48} {'reqs':>6} {'MiB':>9} {'seconds':>8} {'rows/s':>10} {'peak MiB':>10}")
+
+    for size in sorted(int(value) for value in args.sizes.split(",")):
+        seed(size)
+        asyncio.run(run(size, args.memory))
+
+
+if __name__ == "__main__":
+    main()
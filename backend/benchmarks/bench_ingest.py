@@ -0,0 +1,135 @@
+"""
+Benchmark for the bulk destination ingest
+Writes a synthetic catalog to CSV and JSONL, then times the legacy loader (one
+ORM object per row, single commit) against the streaming batched upsert, for
+a fresh load and for a re-load where every row already exists.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --destinations 500000 --batch-size 5000
+    python -m benchmarks.bench_ingest --memory   # also trace peak memory (much slower)
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.destination import Destination
+from app.services.ingest import ingest_file
+from benchmarks.synthetic import generate_destinations
+
+COLUMNS = [column.name for column in Destination.__table__.columns]
+
+
+def write_files(directory: str, n: int):
+    """The same synthetic catalog as CSV (activities JSON-encoded) and JSONL"""
+
+    csv_path = os.path.join(directory, "destinations.csv")
+    jsonl_path = os.path.join(directory, "destinations.jsonl")
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_file, \
+            open(jsonl_path, "w", encoding="utf-8") as jsonl_file:
+        writer = csv.DictWriter(csv_file, fieldnames=COLUMNS)
+        writer.writeheader()
+        for dest in generate_destinations(n):
+            row = {name: getattr(dest, name) for name in COLUMNS}
+            jsonl_file.write(json.dumps(row) + "\n")
+            writer.writerow({**row, "activities": json.dumps(row["activities"])})
+    return csv_path, jsonl_path
+
+
+def legacy_load(engine, csv_path: str) -> int:
+    """The previous init_db loader: parse each row by hand, add it to the session, commit once"""
+
+    db = sessionmaker(bind=engine)()
+    try:
+        db.query(Destination).delete()
+        count = 0
+        with open(csv_path, "r", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                db.add(Destination(
+                    destination_id=int(row["destination_id"]),
+                    name=row["name"],
+                    location=row["location"],
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    category=row["category"],
+                    description=row["description"],
+                    activities=json.loads(row["activities"]) if row["activities"] else [],
+                    difficulty_level=int(row["difficulty_level"]),
+                    best_season=row["best_season"],
+                    avg_cost_per_day=int(row["avg_cost_per_day"]),
+                    duration_days=int(row["duration_days"]),
+                    popularity_score=int(row["popularity_score"]),
+                    altitude=int(row["altitude"]),
+                    permits_required=row["permits_required"].lower() == "true",
+                    image_url=row["image_url"],
+                ))
+                count += 1
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def timed(fn, *args, memory: bool = False):
+    """Run fn, returning (result, seconds, peak traced memory in MiB or None)"""
+
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _peak(peak) -> str:
+    return f"  peak {peak:>7.1f} MiB" if peak is not None else ""
+
+
+def fresh_engine(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bulk destination ingest")
+    parser.add_argument("--destinations", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per upsert (default: INGEST_BATCH_SIZE)")
+    parser.add_argument("--memory", action="store_true", help="trace peak Python memory (slows every run)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="nepaltour-ingest-")
+    csv_path, jsonl_path = write_files(directory, args.destinations)
+    print(f"✓ Wrote {args.destinations} synthetic destinations to {directory}")
+
+    engine = fresh_engine(directory, "legacy.db")
+    rows, seconds, peak = timed(legacy_load, engine, csv_path, memory=args.memory)
+    print(f"\nlegacy ORM load     {seconds:>7.2f}s  {rows / seconds:>10,.0f} rows/s{_peak(peak)}")
+    engine.dispose()
+
+    for label, path in (("csv", csv_path), ("jsonl", jsonl_path)):
+        engine = fresh_engine(directory, f"ingest-{label}.db")
+        for run in ("insert", "update"):
+            report, seconds, peak = timed(ingest_file, path, args.batch_size, engine, memory=args.memory)
+            assert report.rows == args.destinations and report.rejected == 0
+            print(
+                f"ingest {label:<5} {run:<6} {seconds:>7.2f}s  {report.rows_per_second:>10,.0f} rows/s"
+                f"{_peak(peak)}  ({report.batches} batches)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Concurrency benchmark for the itinerary endpoints
+Seeds a throwaway database, runs the app's startup hooks (recommender load,
+catalog warm-up, password hashing pool), then drives the app in-process with
+1 and 100 concurrent clients and reports throughput for each itinerary route.
+Startup itself is not timed: requests are measured against a warm app, as a
+running server would serve them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_itineraries
+    python -m benchmarks.bench_itineraries --requests 2000 --concurrency 1 10 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import benchmarks.throwaway  # noqa: F401  (before the app imports)
+
+import httpx
+
+from app.database import Base, async_engine, engine
+from app.main import app
+from app.utils.auth import create_access_token
+from benchmarks.synthetic import seed_database
+
+# Every seeded itinerary belongs to the single seeded user
+USER_ID = 1
+
+
+async def run(client: httpx.AsyncClient, path: str, n_requests: int, concurrency: int) -> dict:
+    """Issue n_requests GETs with the given number of concurrent clients"""
+
+    latencies = []
+    remaining = iter(range(n_requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "throughput": n_requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+    }
+
+
+async def run_suite(paths: List[str], n_requests: int, concurrency_levels: List[int]):
+    token = create_access_token({"sub": f"user{USER_ID}@example.com", "user_id": USER_ID})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            print(f"{'route':<36} {'clients':>8} {'req/s':>9} {'p50 (ms)':>9}")
+            for path in paths:
+                for concurrency in concurrency_levels:
+                    result = await run(client, path, n_requests, concurrency)
+                    print(f"{path:<36} {concurrency:>8} {result['throughput']:>9.0f} {result['p50_ms']:>9.2f}")
+    finally:
+        await app.router.shutdown()
+        # Connections are bound to this event loop; drop them before it closes
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark itinerary endpoints under concurrency")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--destinations", type=int, default=200)
+    parser.add_argument("--itineraries", type=int, default=20)
+    parser.add_argument("--stops", type=int, default=6, help="most stops per itinerary")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, args.destinations, n_users=1, n_itineraries=args.itineraries, max_stops=args.stops)
+
+    paths = ["/api/itineraries/my-itineraries", "/api/itineraries/1"]
+    asyncio.run(run_suite(paths, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+End-to-end load benchmark for every API route
+Seeds a throwaway database with the synthetic generator, runs the app's
+startup hooks, then drives each route registered in app/main.py in-process
+with concurrent clients and reports p50/p95/p99 latency and throughput.
+
+A route without a scenario below fails the run, so new endpoints get one.
+--output writes the results as a JSON baseline; --compare reruns against a
+baseline and exits non-zero when a route's p95 regresses past the tolerance.
+Latencies include the in-process client and, for routes with background tasks,
+the task itself (ASGITransport waits for the app to finish).
+
+Usage (from backend/):
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --requests 500 --concurrency 1 10 50 --output baseline.json
+    python -m benchmarks.bench_load --compare baseline.json --tolerance 0.5
+    python -m benchmarks.bench_load --routes destinations --users 20000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+import benchmarks.throwaway  # noqa: F401  (before the app imports)
+
+import httpx
+from fastapi.routing import APIRoute
+
+from app.config import settings
+from app.database import Base, async_engine, engine
+from app.main import app
+from app.utils.auth import create_access_token
+from app.utils.hashing import build_crypt_context
+from benchmarks.synthetic import CATEGORIES, generate_preferences, seed_database
+
+# Shared by every seeded user, so /login can succeed for any of them
+PASSWORD = "bench-password"
+
+
+@dataclass
+class LoadContext:
+    """Dataset sizes plus the state scenarios draw from"""
+
+    destinations: int
+    users: int
+    itineraries: Dict[int, int]  # itinerary_id -> owner user_id
+    deletable: List[int] = field(default_factory=list)
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def user(self, rng: random.Random) -> int:
+        return rng.randint(1, self.users)
+
+    def auth(self, user_id: int) -> Dict[str, str]:
+        token = create_access_token({"sub": f"user{user_id}@example.com", "user_id": user_id})
+        return {"Authorization": f"Bearer {token}"}
+
+    def owned_itinerary(self, rng: random.Random) -> Tuple[int, int]:
+        itinerary_id = rng.choice(list(self.itineraries))
+        return itinerary_id, self.itineraries[itinerary_id]
+
+
+def _point(rng: random.Random) -> str:
+    return f"{rng.uniform(26.4, 30.4):.4f},{rng.uniform(80.1, 88.2):.4f}"
+
+
+def _get_itinerary(ctx: LoadContext, rng: random.Random) -> dict:
+    itinerary_id, user_id = ctx.owned_itinerary(rng)
+    return {"url": f"/api/itineraries/{itinerary_id}", "headers": ctx.auth(user_id)}
+
+
+def _delete_itinerary(ctx: LoadContext, rng: random.Random) -> dict:
+    # Each request consumes one seeded itinerary; this scenario runs last
+    itinerary_id = ctx.deletable.pop()
+    return {"url": f"/api/itineraries/{itinerary_id}", "headers": ctx.auth(ctx.itineraries.pop(itinerary_id))}
+
+
+def _register(ctx: LoadContext, rng: random.Random) -> dict:
+    return {"json": {"email": f"load{next(ctx.counter)}@example.com", "password": PASSWORD, "full_name": "Load"}}
+
+
+# (method, route path) -> request builder returning httpx.request keyword arguments.
+# "url" defaults to the route path itself.
+SCENARIOS: Dict[Tuple[str, str], Callable[[LoadContext, random.Random], dict]] = {
+    ("GET", "/"): lambda ctx, rng: {},
+    ("GET", "/health"): lambda ctx, rng: {},
+
+    ("POST", "/api/auth/register"): _register,
+    ("POST", "/api/auth/login"): lambda ctx, rng: {
+        "json": {"email": f"user{ctx.user(rng)}@example.com", "password": PASSWORD}
+    },
+    ("GET", "/api/auth/hashing/metrics"): lambda ctx, rng: {},
+    ("GET", "/api/auth/me"): lambda ctx, rng: {
+        "params": {"token": ctx.auth(ctx.user(rng))["Authorization"].split()[1]}
+    },
+
+    ("GET", "/api/destinations/"): lambda ctx, rng: {"params": {"limit": 20, "skip": rng.randint(0, 200)}},
+    ("GET", "/api/destinations/nearby"): lambda ctx, rng: {
+        "params": {"lat": rng.uniform(26.4, 30.4), "lon": rng.uniform(80.1, 88.2), "k": 10}
+    },
+    ("GET", "/api/destinations/export"): lambda ctx, rng: {"params": {"format": rng.choice(["ndjson", "csv"])}},
+    ("GET", "/api/destinations/{destination_id}"): lambda ctx, rng: {
+        "url": f"/api/destinations/{rng.randint(1, ctx.destinations)}"
+    },
+    ("GET", "/api/destinations/{destination_id}/similar"): lambda ctx, rng: {
+        "url": f"/api/destinations/{rng.randint(1, ctx.destinations)}/similar"
+    },
+    ("GET", "/api/destinations/{destination_id}/nearby"): lambda ctx, rng: {
+        "url": f"/api/destinations/{rng.randint(1, ctx.destinations)}/nearby"
+    },
+    ("GET", "/api/destinations/category/{category}"): lambda ctx, rng: {
+        "url": f"/api/destinations/category/{rng.choice(CATEGORIES)}", "params": {"limit": 20}
+    },
+    ("GET", "/api/destinations/popular/top"): lambda ctx, rng: {"params": {"limit": 10}},
+
+    ("POST", "/api/recommendations/preferences"): lambda ctx, rng: {
+        "params": {"user_id": ctx.user(rng)},
+        "json": generate_preferences(1, seed=rng.randint(0, 2 ** 31))[0],
+    },
+    ("GET", "/api/recommendations/preferences/{user_id}"): lambda ctx, rng: {
+        "url": f"/api/recommendations/preferences/{ctx.user(rng)}"
+    },
+    ("POST", "/api/recommendations/recommend/batch"): lambda ctx, rng: {
+        "json": {"user_ids": rng.sample(range(1, ctx.users + 1), min(50, ctx.users)), "limit": 10}
+    },
+    ("POST", "/api/recommendations/recommend/{user_id}"): lambda ctx, rng: {
+        "url": f"/api/recommendations/recommend/{ctx.user(rng)}",
+        "json": {"limit": 10},
+        **({"params": {"near": _point(rng)}} if rng.random() < 0.2 else {}),
+    },
+    ("GET", "/api/recommendations/cache/stats"): lambda ctx, rng: {},
+
+    ("POST", "/api/itineraries/create"): lambda ctx, rng: {
+        "params": {"title": "Load trip"},
+        "json": rng.sample(range(1, ctx.destinations + 1), min(rng.randint(2, 6), ctx.destinations)),
+        "headers": ctx.auth(ctx.user(rng)),
+    },
+    ("GET", "/api/itineraries/my-itineraries"): lambda ctx, rng: {"headers": ctx.auth(ctx.owned_itinerary(rng)[1])},
+    ("GET", "/api/itineraries/export"): lambda ctx, rng: {"headers": ctx.auth(ctx.owned_itinerary(rng)[1])},
+    ("GET", "/api/itineraries/{itinerary_id}"): _get_itinerary,
+    ("DELETE", "/api/itineraries/{itinerary_id}"): _delete_itinerary,
+    ("POST", "/api/itineraries/auto-generate"): lambda ctx, rng: {
+        "params": {
+            "budget": rng.randint(300, 3000),
+            "duration_days": rng.randint(5, 21),
+            "difficulty_preference": rng.randint(1, 5),
+        },
+        "json": rng.sample(CATEGORIES, 2),
+        "headers": ctx.auth(ctx.user(rng)),
+    },
+}
+
+
+def app_routes() -> List[Tuple[str, str]]:
+    """Every (method, path) the app serves, in registration order; destructive routes last"""
+
+    routes = [
+        (method, route.path)
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in sorted(route.methods)
+    ]
+    return sorted(routes, key=lambda route: route[0] == "DELETE")
+
+
+def percentile_summary(latencies: List[float], elapsed: float) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": cuts[49],
+        "p95_ms": cuts[94],
+        "p99_ms": cuts[98],
+    }
+
+
+async def run_route(
+    client: httpx.AsyncClient,
+    ctx: LoadContext,
+    method: str,
+    path: str,
+    n_requests: int,
+    concurrency: int,
+    seed: int
+) -> dict:
+    """Issue n_requests against one route with the given number of concurrent clients"""
+
+    rng = random.Random(seed)
+    build = SCENARIOS[(method, path)]
+    latencies, errors = [], 0
+    remaining = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            kwargs = build(ctx, rng)
+            url = kwargs.pop("url", path)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {**percentile_summary(latencies, time.perf_counter() - start), "errors": errors}
+
+
+async def run_suite(ctx: LoadContext, routes, n_requests: int, concurrency_levels: List[int], seed: int) -> dict:
+    results = {}
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"{'route':<52} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+            for method, path in routes:
+                name = f"{method} {path}"
+                results[name] = {}
+                for concurrency in concurrency_levels:
+                    # Background tasks print progress lines that would break up the table
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = await run_route(client, ctx, method, path, n_requests, concurrency, seed)
+                    results[name][str(concurrency)] = result
+                    print(
+                        f"{name:<52} {concurrency:>7} {result['throughput']:>8.0f} {result['p50_ms']:>8.2f} "
+                        f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7}"
+                    )
+    finally:
+        await app.router.shutdown()
+        await async_engine.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Routes whose p95 grew by more than tolerance (a fraction) over the baseline"""
+
+    regressions = []
+    for name, levels in results.items():
+        for concurrency, result in levels.items():
+            before = baseline.get("results", {}).get(name, {}).get(concurrency)
+            if before is None:
+                continue
+            ratio = result["p95_ms"] / before["p95_ms"] if before["p95_ms"] else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name} @{concurrency}: p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test every API route in-process")
+    parser.add_argument("--destinations", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--itineraries", type=int, default=3000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--routes", help="only run routes whose 'METHOD /path' contains this text")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as a JSON baseline to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed p95 growth over the baseline (0.5 = +50%%)")
+    args = parser.parse_args()
+
+    routes = app_routes()
+    missing = [f"{method} {path}" for method, path in routes if (method, path) not in SCENARIOS]
+    if missing:
+        sys.exit("No load scenario for: " + ", ".join(missing))
+    if args.routes:
+        routes = [(method, path) for method, path in routes if args.routes in f"{method} {path}"]
+
+    deletes = sum(method == "DELETE" for method, _ in routes) * args.requests * len(args.concurrency)
+    if deletes > args.itineraries:
+        sys.exit(f"--itineraries must be at least {deletes} for the DELETE scenarios")
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed_database(
+        engine, args.destinations, args.users, args.reviews, args.itineraries,
+        password_hash=build_crypt_context(settings.BCRYPT_ROUNDS).hash(PASSWORD),
+        seed=args.seed
+    )
+    print(f"✓ Seeded {args.destinations} destinations, {args.users} users, {args.reviews} reviews "
+          f"and {args.itineraries} itineraries in {time.perf_counter() - start:.1f}s\n")
+
+    with engine.connect() as conn:
+        owners = dict(conn.exec_driver_sql("SELECT itinerary_id, user_id FROM itineraries").all())
+    ctx = LoadContext(destinations=args.destinations, users=args.users, itineraries=owners)
+    ctx.deletable = random.Random(args.seed).sample(list(owners), deletes)
+
+    results = asyncio.run(run_suite(ctx, routes, args.requests, args.concurrency, args.seed))
+
+    report = {
+        "config": {
+            key: getattr(args, key)
+            for key in ("destinations", "users", "reviews", "itineraries", "requests", "concurrency", "seed")
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\n✓ Baseline written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get("config") != report["config"]:
+            print("⚠️  Baseline was recorded with a different configuration; comparing anyway")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"✗ {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"✓ No route regressed more than {args.tolerance:.0%} at p95")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Recommender microbenchmark with regression thresholds
+For every catalog size and TF-IDF max_features setting, measures training wall
+time and peak traced memory, per-call get_recommendations latency and batch
+throughput, then checks each number against recommender_thresholds.json and
+exits non-zero when any of them regresses past its limit.
+
+train() reads the catalog from a seeded throwaway SQLite database and builds
+the item-to-item similarity table, which is O(n^2). Catalogs larger than
+--train-max are timed with fit(build_similarity=False) instead and marked
+"fit" in the output.
+
+Usage (from backend/):
+    python -m benchmarks.bench_recommender
+    python -m benchmarks.bench_recommender --sizes 100 1000 --max-features 500
+    python -m benchmarks.bench_recommender --write-thresholds   # re-baseline on the reference machine
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.ml_engine.recommender import TourismRecommender
+from app.models.destination import Destination
+from benchmarks.synthetic import generate_preferences, seed_database
+
+THRESHOLDS_PATH = Path(__file__).resolve().parent / "recommender_thresholds.json"
+
+# Upper limits (lower for throughput) written by --write-thresholds: the measured
+# value scaled by the headroom, but never tighter than these absolute margins
+MARGINS = {"train_s": 0.05, "train_peak_mib": 1.0, "p50_ms": 0.5, "p95_ms": 0.5}
+
+
+def seeded_session(n_destinations: int):
+    """Session on a throwaway SQLite database holding a synthetic catalog"""
+
+    path = os.path.join(tempfile.mkdtemp(prefix="nepaltour-bench-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, n_destinations, n_users=0)
+    return sessionmaker(bind=engine)()
+
+
+def train_once(db, n_destinations: int, max_features: int, full: bool, memory: bool):
+    """Train a fresh recommender; returns (recommender, seconds, peak MiB or None)"""
+
+    recommender = TourismRecommender(max_features=max_features)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if full:
+        recommender.train(db)
+    else:
+        recommender.fit(db.query(Destination).all(), build_similarity=False)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return recommender, seconds, peak
+
+
+def bench_case(db, n_destinations: int, max_features: int, args) -> dict:
+    full = n_destinations <= args.train_max
+
+    # Timed and traced separately: tracing slows the pandas feature preparation
+    recommender, train_seconds, _ = train_once(db, n_destinations, max_features, full, memory=False)
+    _, _, peak = train_once(db, n_destinations, max_features, full, memory=True)
+
+    # Skip the periodic catalog check; scoring is timed on its own
+    recommender.last_refresh_check = float('inf')
+    preferences = generate_preferences(max(args.requests, args.batch_size))
+
+    latencies = []
+    for prefs in preferences[:args.requests]:
+        start = time.perf_counter()
+        recommender.get_recommendations(prefs, db=None, n_recommendations=args.limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    start = time.perf_counter()
+    recommender.get_recommendations_batch(preferences[:args.batch_size], db=None, n_recommendations=args.limit)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "mode": "train" if full else "fit",
+        "train_s": train_seconds,
+        "train_peak_mib": peak,
+        "p50_ms": cuts[49],
+        "p95_ms": cuts[94],
+        "p99_ms": cuts[98],
+        "batch_users_per_s": args.batch_size / batch_seconds,
+    }
+
+
+def check(name: str, result: dict, limits: dict) -> list:
+    """Human-readable failures for one case"""
+
+    failures = []
+    for metric in MARGINS:
+        if metric in limits and result[metric] > limits[metric]:
+            failures.append(f"{name}: {metric} {result[metric]:.2f} > {limits[metric]:.2f}")
+    minimum = limits.get("batch_users_per_s_min")
+    if minimum is not None and result["batch_users_per_s"] < minimum:
+        failures.append(f"{name}: batch_users_per_s {result['batch_users_per_s']:.0f} < {minimum:.0f}")
+    return failures
+
+
+def thresholds_for(result: dict, headroom: float) -> dict:
+    limits = {
+        metric: round(max(result[metric] * headroom, result[metric] + margin), 3)
+        for metric, margin in MARGINS.items()
+    }
+    limits["batch_users_per_s_min"] = round(result["batch_users_per_s"] / headroom)
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recommender against stored thresholds")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--max-features", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--train-max", type=int, default=10000,
+                        help="largest catalog trained with train() (similarity is O(n^2))")
+    parser.add_argument("--requests", type=int, default=200, help="single-user calls per case")
+    parser.add_argument("--batch-size", type=int, default=1000, help="users per batch call")
+    parser.add_argument("--limit", type=int, default=10, help="recommendations per user")
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    parser.add_argument("--write-thresholds", action="store_true", help="store this run as the new thresholds")
+    parser.add_argument("--headroom", type=float, default=1.5, help="allowed slowdown factor when writing thresholds")
+    args = parser.parse_args()
+
+    stored = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    limits = stored.get("cases", {})
+
+    print(f"{'case':>14} {'mode':>5} {'train (s)':>10} {'peak MiB':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'batch users/s':>14}  status")
+    results, failures = {}, []
+    for size in args.sizes:
+        db = seeded_session(size)
+        try:
+            for max_features in args.max_features:
+                name = f"{size}/{max_features}"
+                result = bench_case(db, size, max_features, args)
+                results[name] = result
+
+                case_failures = check(name, result, limits[name]) if name in limits else []
+                failures.extend(case_failures)
+                status = "no threshold" if name not in limits else ("FAIL" if case_failures else "ok")
+                print(
+                    f"{name:>14} {result['mode']:>5} {result['train_s']:>10.2f} {result['train_peak_mib']:>9.1f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                    f"{result['batch_users_per_s']:>14.0f}  {status}"
+                )
+        finally:
+            db.close()
+
+    if args.write_thresholds:
+        stored["headroom"] = args.headroom
+        stored["cases"] = {**limits, **{name: thresholds_for(result, args.headroom) for name, result in results.items()}}
+        args.thresholds.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"\n✓ Thresholds written to {args.thresholds}")
+        return
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("\n✓ All recommender benchmarks within thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark for itinerary route ordering
+Reports planning latency and route length (relative to the input order and to
+an unbudgeted plan) for random stops spread over Nepal.
+
+Usage (from backend/):
+    python -m benchmarks.bench_routing
+    python -m benchmarks.bench_routing --stops 10 50 --trials 50 --budget-ms 10
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.routing import haversine_matrix, plan_route
+
+# Bounding box of Nepal
+LAT_RANGE = (26.4, 30.4)
+LON_RANGE = (80.1, 88.2)
+
+
+def bench_stops(n_stops: int, trials: int, budget_ms: float) -> dict:
+    """Plan routes over random stop sets with and without the time budget"""
+
+    rng = np.random.default_rng(7)
+    latencies, vs_input, vs_unbudgeted = [], [], []
+
+    for _ in range(trials):
+        lat = rng.uniform(*LAT_RANGE, n_stops)
+        lon = rng.uniform(*LON_RANGE, n_stops)
+
+        start = time.perf_counter()
+        plan = plan_route(lat, lon, time_budget_ms=budget_ms)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        dist = haversine_matrix(lat, lon)
+        input_km = dist[np.arange(n_stops - 1), np.arange(1, n_stops)].sum()
+        unbudgeted = plan_route(lat, lon, time_budget_ms=10000)
+        vs_input.append(plan.total_km / input_km)
+        vs_unbudgeted.append(plan.total_km / unbudgeted.total_km)
+
+    latencies.sort()
+    return {
+        'stops': n_stops,
+        'p50_ms': statistics.median(latencies),
+        'max_ms': latencies[-1],
+        'vs_input': statistics.mean(vs_input),
+        'vs_unbudgeted': statistics.mean(vs_unbudgeted),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark itinerary route ordering")
+    parser.add_argument('--stops', type=int, nargs='+', default=[5, 10, 30, 60, 100])
+    parser.add_argument('--trials', type=int, default=20, help="random stop sets per size")
+    parser.add_argument('--budget-ms', type=float, default=settings.ITINERARY_ROUTE_TIME_BUDGET_MS)
+    args = parser.parse_args()
+
+    print(f"{'stops':>6} {'p50 (ms)':>9} {'max (ms)':>9} {'vs input':>9} {'vs unbudgeted':>14}")
+    for n_stops in args.stops:
+        result = bench_stops(n_stops, args.trials, args.budget_ms)
+        print(
+            f"{result['stops']:>6} {result['p50_ms']:>9.2f} {result['max_ms']:>9.2f} "
+            f"{result['vs_input']:>9.3f} {result['vs_unbudgeted']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
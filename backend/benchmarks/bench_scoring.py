@@ -0,0 +1,69 @@
+"""
+Benchmark for the full-catalog hybrid scorer
+Reports per-request and batch latency for catalogs from 100 to 100k destinations.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --sizes 100 1000 --requests 200
+"""
+import argparse
+import statistics
+import time
+
+from app.ml_engine.recommender import TourismRecommender
+from benchmarks.synthetic import generate_destinations, generate_preferences
+
+
+def bench_catalog(n_destinations: int, n_requests: int, batch_size: int, limit: int) -> dict:
+    """Fit a recommender on a synthetic catalog and time single and batch scoring"""
+
+    recommender = TourismRecommender()
+    start = time.perf_counter()
+    # Item-to-item similarity is O(n^2) and not part of the request path
+    recommender.fit(generate_destinations(n_destinations), build_similarity=False)
+    fit_seconds = time.perf_counter() - start
+
+    # Skip the periodic catalog check; there is no database here
+    recommender.last_refresh_check = float('inf')
+
+    preferences = generate_preferences(max(n_requests, batch_size))
+
+    latencies = []
+    for prefs in preferences[:n_requests]:
+        start = time.perf_counter()
+        recommender.get_recommendations(prefs, db=None, n_recommendations=limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    start = time.perf_counter()
+    recommender.get_recommendations_batch(preferences[:batch_size], db=None, n_recommendations=limit)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'destinations': n_destinations,
+        'fit_s': fit_seconds,
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1],
+        'batch_users_per_s': batch_size / batch_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hybrid recommendation scorer")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--requests', type=int, default=100, help="single-user requests per size")
+    parser.add_argument('--batch-size', type=int, default=1000, help="users per batch call")
+    parser.add_argument('--limit', type=int, default=10, help="recommendations per user")
+    args = parser.parse_args()
+
+    print(f"{'destinations':>12} {'fit (s)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'batch users/s':>14}")
+    for size in args.sizes:
+        result = bench_catalog(size, args.requests, args.batch_size, args.limit)
+        print(
+            f"{result['destinations']:>12} {result['fit_s']:>9.2f} {result['p50_ms']:>9.2f} "
+            f"{result['p95_ms']:>9.2f} {result['batch_users_per_s']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
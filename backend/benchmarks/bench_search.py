@@ -0,0 +1,64 @@
+"""
+Benchmark for the BM25 destination search index
+Reports index build time and query latency for catalogs from 1k to 100k destinations.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --sizes 1000 10000 --queries 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.services.search import SearchIndex
+from benchmarks.synthetic import WORDS, generate_destinations
+
+
+def bench_index(n_destinations: int, n_queries: int) -> dict:
+    """Build an index over a synthetic catalog and time one- to three-word queries"""
+
+    destinations = generate_destinations(n_destinations)
+    start = time.perf_counter()
+    index = SearchIndex(
+        [dest.name for dest in destinations],
+        [dest.location for dest in destinations],
+        [dest.description for dest in destinations]
+    )
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(7)
+    queries = [' '.join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(n_queries)]
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    return {
+        'destinations': n_destinations,
+        'build_s': build_seconds,
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the destination search index")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200, help="queries per size")
+    args = parser.parse_args()
+
+    print(f"{'destinations':>12} {'build (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for size in args.sizes:
+        result = bench_index(size, args.queries)
+        print(
+            f"{result['destinations']:>12} {result['build_s']:>10.2f} "
+            f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
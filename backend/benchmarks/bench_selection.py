@@ -0,0 +1,90 @@
+"""
+Benchmark for auto-generated itinerary selection
+Fits the recommender on a synthetic catalog, then for each trip shape compares
+the knapsack selection with the old popularity-order first-fit on total
+recommender score, and reports selection latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_selection
+    python -m benchmarks.bench_selection --destinations 10000 --users 200 --budget-ms 20
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.ml_engine.recommender import TourismRecommender
+from app.services.selection import select_destinations
+from benchmarks.synthetic import generate_destinations, generate_preferences
+
+# (duration_days, budget) of the trips to plan
+TRIPS = [(7, 700), (14, 1500), (21, 3000), (30, 5000)]
+
+
+def first_fit(popularity, days, costs, mask, max_days, budget) -> np.ndarray:
+    """The previous auto-generate selection: most popular first, stop at 90% of the days"""
+
+    chosen, used_days, used_cost = [], 0, 0
+    for i in np.flatnonzero(mask)[np.argsort(-popularity[mask], kind='stable')]:
+        if used_days + days[i] <= max_days and used_cost + costs[i] <= budget:
+            chosen.append(i)
+            used_days += days[i]
+            used_cost += costs[i]
+        if used_days >= max_days * 0.9:
+            break
+    return np.array(chosen, dtype=np.int64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark itinerary destination selection")
+    parser.add_argument('--destinations', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=100, help="preference profiles per trip shape")
+    parser.add_argument('--budget-ms', type=float, default=settings.ITINERARY_SELECTION_TIME_BUDGET_MS)
+    args = parser.parse_args()
+
+    destinations = generate_destinations(args.destinations)
+    recommender = TourismRecommender()
+    recommender.fit(destinations, build_similarity=False)
+    recommender.last_refresh_check = float('inf')
+
+    days = np.array([dest.duration_days for dest in destinations], dtype=float)
+    costs = np.array([dest.avg_cost_per_day for dest in destinations], dtype=float) * days
+    difficulty = np.array([dest.difficulty_level for dest in destinations], dtype=float)
+    popularity = np.array([dest.popularity_score for dest in destinations], dtype=float)
+
+    preferences = generate_preferences(args.users)
+    print(f"✓ {args.destinations} destinations, {args.users} users per trip, {args.budget_ms:g} ms budget\n")
+    print(
+        f"{'trip':>12} {'p50 (ms)':>9} {'p95 (ms)':>9} {'optimal':>8} "
+        f"{'stops':>6} {'score':>7} {'first-fit score':>16} {'gain':>6}"
+    )
+
+    for max_days, budget in TRIPS:
+        latencies, scores, baseline_scores, stops, optimal = [], [], [], [], 0
+        for prefs in preferences:
+            _, values = recommender.score_destinations(prefs, db=None)
+            mask = difficulty <= prefs['difficulty_preference']
+            values = np.where(mask, values, 0)
+
+            start = time.perf_counter()
+            selection = select_destinations(values, days, costs, max_days, budget, time_budget_ms=args.budget_ms)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            scores.append(selection.score)
+            stops.append(len(selection.rows))
+            optimal += selection.optimal
+            baseline_scores.append(values[first_fit(popularity, days, costs, mask, max_days, budget)].sum())
+
+        latencies.sort()
+        score, baseline = statistics.mean(scores), statistics.mean(baseline_scores)
+        print(
+            f"{f'{max_days}d / ${budget}':>12} {statistics.median(latencies):>9.2f} "
+            f"{latencies[int(len(latencies) * 0.95) - 1]:>9.2f} {optimal / len(preferences):>8.0%} "
+            f"{statistics.mean(stops):>6.1f} {score:>7.3f} {baseline:>16.3f} {score / baseline:>5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Seeded synthetic data for NepalTourAI benchmarks
+Produces catalogs of any size with the same shape as data/destinations.csv,
+plus users, preferences, reviews and itineraries that reference them.
+
+Seed a database directly (from backend/):
+    python -m benchmarks.synthetic --database-url sqlite:////tmp/load.db --destinations 10000 --users 5000
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.models import Destination, Itinerary, ItineraryItem, Review, User, UserPreference
+from app.services.catalog_version import CATALOG_VERSION_BUMP
+
+CATEGORIES = ['Trekking', 'Cultural', 'Religious', 'Nature', 'Wildlife', 'Adventure']
+SEASONS = ['Spring', 'Summer', 'Autumn', 'Winter', 'All']
+BUDGET_RANGES = ['budget', 'mid-range', 'luxury']
+INTERESTS = ['adventure', 'cultural', 'religious', 'nature', 'wildlife']
+TRAVEL_STYLES = ['solo', 'couple', 'family', 'group']
+COUNTRIES = ['Nepal', 'India', 'China', 'United States', 'United Kingdom', 'Germany', 'Australia', 'Japan']
+
+# Rows per INSERT when seeding
+CHUNK = 10000
+
+# Vocabulary roughly matching the real destination descriptions
+WORDS = (
+    "trek trekking mountain peak himalaya himalayan base camp glacier lake river valley "
+    "village villages sherpa monastery monasteries temple temples stupa shrine pilgrimage "
+    "buddhist hindu heritage unesco culture cultural ancient medieval palace durbar square "
+    "newari architecture festival wildlife national park jungle safari rhino tiger elephant "
+    "birds bird watching forest forests rhododendron waterfall rafting paragliding bungee "
+    "adventure climbing canyon cave caves hiking views panoramic sunrise sunset annapurna "
+    "everest langtang manaslu dhaulagiri kanchenjunga pokhara kathmandu chitwan lumbini "
+    "remote pristine stunning spectacular breathtaking scenic tranquil serene traditional "
+    "local homestay tea gardens terraces rice fields hills plains desert pass altitude "
+    "acclimatization permit restricted region district trail route circuit journey"
+).split()
+
+
+def generate_destinations(n: int, seed: int = 42) -> List[Destination]:
+    """Generate n transient Destination objects (not attached to any session)"""
+
+    rng = random.Random(seed)
+    destinations = []
+    for dest_id in range(1, n + 1):
+        category = rng.choice(CATEGORIES)
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(30, 90)))
+        destinations.append(Destination(
+            destination_id=dest_id,
+            name=f"{category} Destination {dest_id}",
+            location=f"District {rng.randint(1, 77)}",
+            latitude=round(rng.uniform(26.4, 30.4), 6),
+            longitude=round(rng.uniform(80.1, 88.2), 6),
+            category=category,
+            description=description,
+            activities=rng.sample(WORDS, 4),
+            difficulty_level=rng.randint(1, 5),
+            best_season=rng.choice(SEASONS),
+            avg_cost_per_day=rng.randint(15, 150),
+            duration_days=rng.randint(1, 21),
+            popularity_score=rng.randint(1, 100),
+            altitude=rng.randint(70, 5500),
+            permits_required=rng.random() < 0.3,
+            image_url=f"https://example.com/destination-{dest_id}.jpg",
+        ))
+    return destinations
+
+
+def generate_preferences(n: int, seed: int = 42) -> List[Dict]:
+    """Generate n preference dicts in the shape the recommender expects"""
+
+    rng = random.Random(seed)
+    preferences = []
+    for _ in range(n):
+        preferences.append({
+            'interests': {interest: rng.randint(0, 10) for interest in rng.sample(INTERESTS, 3)},
+            'budget_range': rng.choice(BUDGET_RANGES),
+            'fitness_level': rng.randint(1, 5),
+            'difficulty_preference': rng.randint(1, 5),
+            'preferred_seasons': rng.sample(SEASONS[:4], 2),
+        })
+    return preferences
+
+
+def generate_users(n: int, password_hash: str, seed: int = 42) -> List[Dict]:
+    """
+    Generate n user rows (ids 1..n, emails user{id}@example.com). Every user
+    shares password_hash, so one hash of a known password lets any of them log in.
+    """
+
+    rng = random.Random(seed)
+    return [
+        {
+            'user_id': user_id,
+            'email': f"user{user_id}@example.com",
+            'password_hash': password_hash,
+            'full_name': f"User {user_id}",
+            'country': rng.choice(COUNTRIES),
+        }
+        for user_id in range(1, n + 1)
+    ]
+
+
+def generate_reviews(n: int, n_users: int, n_destinations: int, seed: int = 42) -> List[Dict]:
+    """Generate n review rows; ratings skew positive as real ones do"""
+
+    rng = random.Random(seed)
+    return [
+        {
+            'user_id': rng.randint(1, n_users),
+            'destination_id': rng.randint(1, n_destinations),
+            'rating': rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 10, 12])[0],
+            'comment': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 40))),
+        }
+        for _ in range(n)
+    ]
+
+
+def generate_itineraries(
+    n: int,
+    n_users: int,
+    n_destinations: int,
+    max_stops: int = 6,
+    seed: int = 42
+) -> Tuple[List[Dict], List[Dict]]:
+    """Generate n itinerary rows (ids 1..n) and their stop rows, 1 to max_stops each"""
+
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    itineraries, items = [], []
+    for itinerary_id in range(1, n + 1):
+        day, total_cost = 1, 0
+        stops = rng.sample(range(1, n_destinations + 1), min(rng.randint(1, max_stops), n_destinations))
+        for position, destination_id in enumerate(stops):
+            distance = None if position == 0 else round(rng.uniform(5, 400), 1)
+            transfer = 0 if distance is None or distance <= 50 else math.ceil(distance / 150)
+            day += transfer
+            days = rng.randint(1, 7)
+            cost = days * rng.randint(15, 150)
+            items.append({
+                'itinerary_id': itinerary_id,
+                'destination_id': destination_id,
+                'position': position,
+                'start_day': day,
+                'end_day': day + days - 1,
+                'cost': cost,
+                'transfer_distance_km': distance,
+                'transfer_days': transfer,
+            })
+            day += days
+            total_cost += cost
+        itineraries.append({
+            'itinerary_id': itinerary_id,
+            'user_id': rng.randint(1, n_users),
+            'title': f"Trip {itinerary_id}",
+            'total_days': day - 1,
+            'total_cost': total_cost,
+            'created_at': now - timedelta(minutes=rng.randint(0, 500000)),
+        })
+    return itineraries, items
+
+
+def _insert(conn, table, rows: List[Dict]):
+    for start in range(0, len(rows), CHUNK):
+        conn.execute(table.insert(), rows[start:start + CHUNK])
+
+
+def seed_database(
+    engine: Engine,
+    n_destinations: int,
+    n_users: int,
+    n_reviews: int = 0,
+    n_itineraries: int = 0,
+    max_stops: int = 6,
+    password_hash: str = 'x',
+    seed: int = 42
+):
+    """
+    Bulk-insert a full synthetic dataset into empty tables: destinations,
+    users with one preference row each, reviews and itineraries with stops
+    """
+
+    columns = [column.name for column in Destination.__table__.columns]
+    itineraries, items = generate_itineraries(n_itineraries, n_users, n_destinations, max_stops, seed)
+
+    with engine.begin() as conn:
+        _insert(conn, Destination.__table__, [
+            {name: getattr(dest, name) for name in columns}
+            for dest in generate_destinations(n_destinations, seed)
+        ])
+        conn.execute(CATALOG_VERSION_BUMP)
+        _insert(conn, User.__table__, generate_users(n_users, password_hash, seed))
+        _insert(conn, UserPreference.__table__, [
+            {'user_id': user_id, 'travel_style': TRAVEL_STYLES[user_id % len(TRAVEL_STYLES)], **prefs}
+            for user_id, prefs in enumerate(generate_preferences(n_users, seed), start=1)
+        ])
+        _insert(conn, Review.__table__, generate_reviews(n_reviews, n_users, n_destinations, seed))
+        _insert(conn, Itinerary.__table__, itineraries)
+        _insert(conn, ItineraryItem.__table__, items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a migrated, empty database with synthetic data")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--destinations", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--itineraries", type=int, default=10000)
+    parser.add_argument("--max-stops", type=int, default=6)
+    parser.add_argument("--password", default="password", help="login password shared by every user")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from alembic import command
+
+    from app.config import settings
+    from app.utils.hashing import build_crypt_context
+    from benchmarks.bench_query_plans import alembic_config
+
+    command.upgrade(alembic_config(args.database_url), "head")
+    engine = create_engine(args.database_url)
+    start = time.perf_counter()
+    seed_database(
+        engine, args.destinations, args.users, args.reviews, args.itineraries, args.max_stops,
+        password_hash=build_crypt_context(settings.BCRYPT_ROUNDS).hash(args.password),
+        seed=args.seed
+    )
+    engine.dispose()
+    print(f"✓ Seeded {args.destinations} destinations, {args.users} users, {args.reviews} reviews "
+          f"and {args.itineraries} itineraries in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
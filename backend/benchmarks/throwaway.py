@@ -0,0 +1,16 @@
+"""
+Throwaway database and model artifact for the in-process benchmarks
+Importing this module points DATABASE_URL and MODEL_ARTIFACT_PATH at a fresh
+temporary directory, so a benchmark never touches the development database or
+the real model artifact. It has to be imported before anything from app, which
+reads both settings when it is first imported:
+
+    import benchmarks.throwaway  # noqa: F401  (before the app imports)
+"""
+import os
+import tempfile
+
+THROWAWAY_DIR = tempfile.mkdtemp(prefix="nepaltour-bench-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(THROWAWAY_DIR, 'bench.db')}"
+os.environ["MODEL_ARTIFACT_PATH"] = os.path.join(THROWAWAY_DIR, "recommender.joblib")
@@ -0,0 +1,41 @@
+"""
+Bulk-load destinations from CSV or JSONL files
+Rows are upserted by destination_id, so re-running with an updated file only
+changes what differs; the recommender artifact is then refreshed incrementally
+"""
+import argparse
+from pathlib import Path
+
+from app.config import settings
+from app.database import SessionLocal
+from app.ml_engine.recommender import recommender
+from app.services.ingest import ingest_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upsert destinations from CSV/JSONL files")
+    parser.add_argument('paths', nargs='+', type=Path, help=".csv, .jsonl or .ndjson files")
+    parser.add_argument('--batch-size', type=int, default=settings.INGEST_BATCH_SIZE)
+    parser.add_argument('--skip-model', action='store_true', help="do not refresh the recommender artifact")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        report = ingest_file(path, batch_size=args.batch_size)
+        print(
+            f"✓ Ingested {report.rows} destinations from {path} in {report.seconds:.2f}s "
+            f"({report.rows_per_second:,.0f} rows/s), {report.rejected} rejected"
+        )
+        for error in report.errors:
+            print(f"  ⚠️  {error}")
+
+    if not args.skip_model:
+        # Only rows whose content hash changed are re-vectorized
+        db = SessionLocal()
+        try:
+            recommender.load_or_train(db, settings.MODEL_ARTIFACT_PATH)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,39 @@
 Database initialization script
 Creates all tables and optionally loads sample data
 """
-import csv
-import json
 from pathlib import Path
-from app.database import engine, Base, SessionLocal
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.config import settings
+from app.database import engine, SessionLocal
+from app.ml_engine.recommender import TourismRecommender
+from app.services.ingest import ingest_file
 from app.models import (
     User, UserPreference, Destination, Recommendation,
-    Itinerary, Review, AdminUser
+    Itinerary, ItineraryItem, Review, AdminUser
 )
 
 
 def create_tables():
-    """Create all database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tables created successfully!")
+    """Create or upgrade all database tables by running the Alembic migrations"""
+    print("Applying database migrations...")
+
+    backend_dir = Path(__file__).parent
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "migrations"))
+
+    # Databases created with create_all before migrations existed start at the baseline
+    inspector = inspect(engine)
+    if inspector.has_table("destinations") and not inspector.has_table("alembic_version"):
+        command.stamp(config, "0001")
+
+    command.upgrade(config, "head")
+    print("✓ Database schema is up to date!")
 
 
 def load_destinations_from_csv():
-    """Load destinations from CSV file into database"""
+    """Upsert destinations from the CSV file into the database"""
     print("\nLoading destinations from CSV...")
 
     csv_path = Path(__file__).parent.parent / "data" / "destinations.csv"
@@ -29,46 +43,25 @@ def load_destinations_from_csv():
         print(f"Warning: CSV file not found at {csv_path}")
         return
 
-    db = SessionLocal()
     try:
-        # Clear existing destinations
-        db.query(Destination).delete()
-        db.commit()
+        report = ingest_file(csv_path)
+        print(f"✓ Loaded {report.rows} destinations successfully! ({report.rejected} rejected)")
+        for error in report.errors:
+            print(f"  ⚠️  {error}")
+
+    except Exception as e:
+        print(f"Error loading destinations: {e}")
 
-        count = 0
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                # Parse JSON fields
-                activities = json.loads(row['activities']) if row['activities'] else []
-
-                destination = Destination(
-                    destination_id=int(row['destination_id']),
-                    name=row['name'],
-                    location=row['location'],
-                    latitude=float(row['latitude']),
-                    longitude=float(row['longitude']),
-                    category=row['category'],
-                    description=row['description'],
-                    activities=activities,
-                    difficulty_level=int(row['difficulty_level']),
-                    best_season=row['best_season'],
-                    avg_cost_per_day=int(row['avg_cost_per_day']),
-                    duration_days=int(row['duration_days']),
-                    popularity_score=int(row['popularity_score']),
-                    altitude=int(row['altitude']),
-                    permits_required=row['permits_required'].lower() == 'true',
-                    image_url=row['image_url']
-                )
-                db.add(destination)
-                count += 1
 
-        db.commit()
-        print(f"✓ Loaded {count} destinations successfully!")
+def build_model_artifact():
+    """Train the recommender and persist it for the API workers to load"""
+    print("\nBuilding recommender model artifact...")
 
+    db = SessionLocal()
+    try:
+        TourismRecommender().load_or_train(db, settings.MODEL_ARTIFACT_PATH)
     except Exception as e:
-        print(f"Error loading destinations: {e}")
-        db.rollback()
+        print(f"Error building model artifact: {e}")
     finally:
         db.close()
 
@@ -79,8 +72,8 @@ def create_admin_user():
 
     db = SessionLocal()
     try:
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        from app.utils.hashing import build_crypt_context
+        pwd_context = build_crypt_context(settings.BCRYPT_ROUNDS)
 
         # Check if admin exists
         existing = db.query(AdminUser).filter(AdminUser.username == "admin").first()
@@ -117,6 +110,9 @@ def main():
     # Load data
     load_destinations_from_csv()
 
+    # Train and persist the recommender
+    build_model_artifact()
+
     # Create admin
     create_admin_user()
 
@@ -0,0 +1,161 @@
+"""baseline schema
+
+The schema as created by Base.metadata.create_all before migrations were
+introduced. Existing databases start here with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 14:25:14.546381
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('admin_users',
+    sa.Column('admin_id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=True),
+    sa.PrimaryKeyConstraint('admin_id')
+    )
+    with op.batch_alter_table('admin_users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_admin_users_admin_id'), ['admin_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_admin_users_username'), ['username'], unique=True)
+
+    op.create_table('destinations',
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('latitude', sa.Numeric(precision=10, scale=8), nullable=True),
+    sa.Column('longitude', sa.Numeric(precision=11, scale=8), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('activities', sa.JSON(), nullable=True),
+    sa.Column('difficulty_level', sa.Integer(), nullable=True),
+    sa.Column('best_season', sa.String(length=50), nullable=True),
+    sa.Column('avg_cost_per_day', sa.Integer(), nullable=True),
+    sa.Column('duration_days', sa.Integer(), nullable=True),
+    sa.Column('popularity_score', sa.Integer(), nullable=True),
+    sa.Column('altitude', sa.Integer(), nullable=True),
+    sa.Column('permits_required', sa.Boolean(), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.PrimaryKeyConstraint('destination_id')
+    )
+    with op.batch_alter_table('destinations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_destinations_category'), ['category'], unique=False)
+        batch_op.create_index(batch_op.f('ix_destinations_destination_id'), ['destination_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_destinations_name'), ['name'], unique=False)
+
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_user_id'), ['user_id'], unique=False)
+
+    op.create_table('itineraries',
+    sa.Column('itinerary_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=True),
+    sa.Column('destinations', sa.JSON(), nullable=True),
+    sa.Column('total_days', sa.Integer(), nullable=True),
+    sa.Column('total_cost', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('itinerary_id')
+    )
+    with op.batch_alter_table('itineraries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_itineraries_itinerary_id'), ['itinerary_id'], unique=False)
+
+    op.create_table('recommendations',
+    sa.Column('recommendation_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Numeric(precision=5, scale=4), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['destination_id'], ['destinations.destination_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('recommendation_id')
+    )
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_recommendations_recommendation_id'), ['recommendation_id'], unique=False)
+
+    op.create_table('reviews',
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
+    sa.ForeignKeyConstraint(['destination_id'], ['destinations.destination_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('review_id')
+    )
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reviews_review_id'), ['review_id'], unique=False)
+
+    op.create_table('user_preferences',
+    sa.Column('preference_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('interests', sa.JSON(), nullable=True),
+    sa.Column('budget_range', sa.String(length=50), nullable=True),
+    sa.Column('fitness_level', sa.Integer(), nullable=True),
+    sa.Column('travel_style', sa.String(length=50), nullable=True),
+    sa.Column('preferred_seasons', sa.JSON(), nullable=True),
+    sa.Column('duration_days', sa.Integer(), nullable=True),
+    sa.Column('difficulty_preference', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('preference_id')
+    )
+    with op.batch_alter_table('user_preferences', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_preferences_preference_id'), ['preference_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_preferences', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_preferences_preference_id'))
+
+    op.drop_table('user_preferences')
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reviews_review_id'))
+
+    op.drop_table('reviews')
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_recommendations_recommendation_id'))
+
+    op.drop_table('recommendations')
+    with op.batch_alter_table('itineraries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_itineraries_itinerary_id'))
+
+    op.drop_table('itineraries')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_user_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('destinations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_destinations_name'))
+        batch_op.drop_index(batch_op.f('ix_destinations_destination_id'))
+        batch_op.drop_index(batch_op.f('ix_destinations_category'))
+
+    op.drop_table('destinations')
+    with op.batch_alter_table('admin_users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_admin_users_username'))
+        batch_op.drop_index(batch_op.f('ix_admin_users_admin_id'))
+
+    op.drop_table('admin_users')
\ No newline at end of file
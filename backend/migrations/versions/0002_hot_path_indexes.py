@@ -0,0 +1,55 @@
+"""hot-path indexes and one preference row per user
+
+Adds indexes for the filters every request path uses:
+- user_preferences.user_id (unique: duplicate rows are removed first,
+  keeping the most recent one per user)
+- itineraries (user_id, created_at) for /my-itineraries
+- reviews.destination_id
+- destinations (category, difficulty_level, avg_cost_per_day)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 14:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _create_index(name, table, columns, unique=False):
+    """Create an index unless a create_all-built database already has it"""
+    if not op.get_context().as_sql:
+        existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+        if name in existing:
+            return
+    op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    # Keep only the latest preference row for each user
+    op.execute(sa.text(
+        "DELETE FROM user_preferences WHERE preference_id NOT IN ("
+        "SELECT MAX(preference_id) FROM user_preferences GROUP BY user_id)"
+    ))
+    _create_index('uq_user_preferences_user_id', 'user_preferences', ['user_id'], unique=True)
+
+    _create_index('ix_itineraries_user_created', 'itineraries', ['user_id', 'created_at'])
+    _create_index('ix_reviews_destination_id', 'reviews', ['destination_id'])
+    _create_index(
+        'ix_destinations_category_difficulty_cost',
+        'destinations',
+        ['category', 'difficulty_level', 'avg_cost_per_day']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_destinations_category_difficulty_cost', table_name='destinations')
+    op.drop_index('ix_reviews_destination_id', table_name='reviews')
+    op.drop_index('ix_itineraries_user_created', table_name='itineraries')
+    op.drop_index('uq_user_preferences_user_id', table_name='user_preferences')
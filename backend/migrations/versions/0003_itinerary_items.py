@@ -0,0 +1,174 @@
+"""itinerary stops in their own table
+
+Moves the stops out of the itineraries.destinations JSON column, which held a
+full copy of every destination's details, into itinerary_items (one row per
+stop: position, days and cost). Destination details are read from the
+catalog instead. Existing itineraries are migrated, then the column is dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:10:00.000000
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+CHUNK = 1000
+
+itineraries = sa.table(
+    'itineraries',
+    sa.column('itinerary_id', sa.Integer),
+    sa.column('destinations', sa.JSON),
+)
+itinerary_items = sa.table(
+    'itinerary_items',
+    sa.column('itinerary_id', sa.Integer),
+    sa.column('destination_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('start_day', sa.Integer),
+    sa.column('end_day', sa.Integer),
+    sa.column('cost', sa.Integer),
+    sa.column('transfer_distance_km', sa.Float),
+    sa.column('transfer_days', sa.Integer),
+)
+destinations = sa.table(
+    'destinations',
+    sa.column('destination_id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('location', sa.String),
+    sa.column('duration_days', sa.Integer),
+    sa.column('activities', sa.JSON),
+    sa.column('description', sa.Text),
+    sa.column('difficulty_level', sa.Integer),
+    sa.column('altitude', sa.Integer),
+)
+
+
+def _stops(value):
+    """Stops stored in the JSON column (the app wrote them JSON-encoded a second time)"""
+    while isinstance(value, str):
+        value = json.loads(value)
+    return value or []
+
+
+def upgrade():
+    op.create_table('itinerary_items',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('itinerary_id', sa.Integer(), nullable=False),
+    sa.Column('destination_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('start_day', sa.Integer(), nullable=True),
+    sa.Column('end_day', sa.Integer(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=True),
+    sa.Column('transfer_distance_km', sa.Float(), nullable=True),
+    sa.Column('transfer_days', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['destination_id'], ['destinations.destination_id'], ),
+    sa.ForeignKeyConstraint(['itinerary_id'], ['itineraries.itinerary_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_index(
+        'uq_itinerary_items_itinerary_position', 'itinerary_items', ['itinerary_id', 'position'], unique=True
+    )
+
+    if not op.get_context().as_sql:
+        bind = op.get_bind()
+        known = set(bind.execute(sa.select(destinations.c.destination_id)).scalars())
+
+        # Keyset pages by itinerary_id, so only CHUNK itineraries' JSON is held at a time
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(itineraries)
+                .where(itineraries.c.itinerary_id > last_id)
+                .order_by(itineraries.c.itinerary_id)
+                .limit(CHUNK)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].itinerary_id
+
+            items = []
+            for itinerary_id, value in rows:
+                # Stops whose destination no longer exists cannot be kept
+                stops = [stop for stop in _stops(value) if stop.get('destination_id') in known]
+                for position, stop in enumerate(stops):
+                    items.append({
+                        'itinerary_id': itinerary_id,
+                        'destination_id': stop['destination_id'],
+                        'position': position,
+                        'start_day': stop.get('start_day'),
+                        'end_day': stop.get('end_day'),
+                        'cost': stop.get('cost'),
+                        'transfer_distance_km': stop.get('transfer_distance_km'),
+                        'transfer_days': stop.get('transfer_days', 0),
+                    })
+            if items:
+                op.bulk_insert(itinerary_items, items)
+
+    with op.batch_alter_table('itineraries', schema=None) as batch_op:
+        batch_op.drop_column('destinations')
+
+
+def downgrade():
+    with op.batch_alter_table('itineraries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('destinations', sa.JSON(), nullable=True))
+
+    if not op.get_context().as_sql:
+        bind = op.get_bind()
+        bind.execute(itineraries.update().values(destinations=json.dumps([])))
+
+        # Rebuild the stop dicts the JSON column used to hold, CHUNK itineraries at a time
+        last_id = 0
+        while True:
+            ids = bind.execute(
+                sa.select(itineraries.c.itinerary_id)
+                .where(itineraries.c.itinerary_id > last_id)
+                .order_by(itineraries.c.itinerary_id)
+                .limit(CHUNK)
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            rows = bind.execute(
+                sa.select(itinerary_items, *[c for c in destinations.c if c.name != 'destination_id'])
+                .join(destinations, destinations.c.destination_id == itinerary_items.c.destination_id)
+                .where(itinerary_items.c.itinerary_id.between(ids[0], last_id))
+                .order_by(itinerary_items.c.itinerary_id, itinerary_items.c.position)
+            ).mappings()
+
+            stops = {}
+            for row in rows:
+                activities = row['activities']
+                stops.setdefault(row['itinerary_id'], []).append({
+                    'destination_id': row['destination_id'],
+                    'name': row['name'],
+                    'location': row['location'],
+                    'start_day': row['start_day'],
+                    'end_day': row['end_day'],
+                    'duration_days': row['duration_days'],
+                    'transfer_distance_km': row['transfer_distance_km'],
+                    'transfer_days': row['transfer_days'],
+                    'cost': row['cost'],
+                    'activities': json.loads(activities) if isinstance(activities, str) else activities,
+                    'description': row['description'],
+                    'difficulty_level': row['difficulty_level'],
+                    'altitude': row['altitude'],
+                })
+            for itinerary_id, itinerary_stops in stops.items():
+                bind.execute(
+                    itineraries.update()
+                    .where(itineraries.c.itinerary_id == itinerary_id)
+                    .values(destinations=json.dumps(itinerary_stops))
+                )
+
+    op.drop_index('uq_itinerary_items_itinerary_position', table_name='itinerary_items')
+    op.drop_table('itinerary_items')
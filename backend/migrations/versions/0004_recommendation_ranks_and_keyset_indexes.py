@@ -0,0 +1,77 @@
+"""stored recommendation ranks and keyset pagination indexes
+
+Adds what the models gained after the baseline but no revision created:
+- recommendations.rank, model_version and preference_hash, with
+  (user_id, rank), for the precomputed recommendation rows
+- destinations (popularity_score DESC, destination_id) and
+  (category, popularity_score DESC, destination_id) for keyset pagination
+
+Each column and index is skipped when it already exists, so databases that
+were built while 0001 still carried them upgrade cleanly.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 16:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _recommendation_columns():
+    return [
+        sa.Column('rank', sa.Integer(), nullable=True),
+        sa.Column('model_version', sa.String(length=64), nullable=True),
+        sa.Column('preference_hash', sa.String(length=40), nullable=True),
+    ]
+
+
+def _existing(table):
+    """(column names, index names) of a table, or None when emitting SQL offline"""
+    if op.get_context().as_sql:
+        return None
+    inspector = sa.inspect(op.get_bind())
+    return (
+        {column['name'] for column in inspector.get_columns(table)},
+        {index['name'] for index in inspector.get_indexes(table)},
+    )
+
+
+def upgrade():
+    existing = _existing('recommendations')
+    missing = [column for column in _recommendation_columns() if existing is None or column.name not in existing[0]]
+    if missing:
+        with op.batch_alter_table('recommendations', schema=None) as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+    if existing is None or 'ix_recommendations_user_rank' not in existing[1]:
+        op.create_index('ix_recommendations_user_rank', 'recommendations', ['user_id', 'rank'])
+
+    existing = _existing('destinations')
+    if existing is None or 'ix_destinations_popularity_id' not in existing[1]:
+        op.create_index(
+            'ix_destinations_popularity_id',
+            'destinations',
+            [sa.text('popularity_score DESC'), 'destination_id']
+        )
+    if existing is None or 'ix_destinations_category_popularity_id' not in existing[1]:
+        op.create_index(
+            'ix_destinations_category_popularity_id',
+            'destinations',
+            ['category', sa.text('popularity_score DESC'), 'destination_id']
+        )
+
+
+def downgrade():
+    op.drop_index('ix_destinations_category_popularity_id', table_name='destinations')
+    op.drop_index('ix_destinations_popularity_id', table_name='destinations')
+    op.drop_index('ix_recommendations_user_rank', table_name='recommendations')
+    with op.batch_alter_table('recommendations', schema=None) as batch_op:
+        for column in reversed(_recommendation_columns()):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,32 @@
+"""catalog version counter
+
+A single-row counter that every destinations write bumps (the ORM events
+and the bulk ingest). API workers poll it instead of re-reading the whole
+destinations table to find out whether their in-memory catalog is stale.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 17:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('catalog_version')
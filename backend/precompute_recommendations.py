@@ -0,0 +1,28 @@
+"""
+Recompute the stored recommendations for all users with preferences
+Run after catalog updates or on a schedule (e.g. nightly cron)
+"""
+import argparse
+
+from app.config import settings
+from app.database import SessionLocal
+from app.ml_engine.precompute import precompute_recommendations
+from app.ml_engine.recommender import recommender
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute top-N recommendations for all users")
+    parser.add_argument('--top-n', type=int, default=settings.PRECOMPUTE_TOP_N)
+    parser.add_argument('--chunk-size', type=int, default=settings.PRECOMPUTE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        recommender.load_or_train(db, settings.MODEL_ARTIFACT_PATH)
+        precompute_recommendations(db, top_n=args.top_n, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep the app off the development database and model artifact, whatever a test imports first
+_scratch_dir = tempfile.mkdtemp(prefix="nepaltour-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch_dir, 'tests.db')}"
+os.environ["MODEL_ARTIFACT_PATH"] = os.path.join(_scratch_dir, "recommender.joblib")
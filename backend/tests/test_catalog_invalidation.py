@@ -0,0 +1,41 @@
+"""
+Destination writes mark the in-memory catalog stale only once they commit, so
+a reload racing the transaction cannot clear the flag before the new version
+is visible.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.destination import Destination
+from app.services.catalog import catalog
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(catalog, "_stale", False)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_write_invalidates_on_commit_not_flush(session):
+    session.add(Destination(destination_id=1, name="Rara Lake"))
+    session.flush()
+    assert not catalog._stale
+
+    session.commit()
+    assert catalog._stale
+
+
+def test_rolled_back_write_does_not_invalidate(session):
+    session.add(Destination(destination_id=1, name="Rara Lake"))
+    session.flush()
+    session.rollback()
+
+    session.commit()
+    assert not catalog._stale
@@ -0,0 +1,63 @@
+"""
+The bulk ingest only updates the columns a row supplies, and a malformed JSONL
+line is rejected on its own instead of aborting the import.
+"""
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.database import Base
+from app.models.destination import Destination
+from app.services.ingest import ingest_file, ingest_rows
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def stored(engine, destination_id):
+    with engine.connect() as conn:
+        table = Destination.__table__
+        return conn.execute(select(table).where(table.c.destination_id == destination_id)).mappings().one()
+
+
+def test_partial_row_keeps_stored_columns(engine, tmp_path):
+    ingest_rows([{
+        "destination_id": 1, "name": "Gokyo Lakes", "location": "Solukhumbu", "altitude": 4790,
+        "permits_required": True, "activities": ["trekking"],
+    }], engine=engine)
+
+    ingest_rows([{"destination_id": 1, "name": "Gokyo Ri", "altitude": 5357}], engine=engine)
+    csv_path = tmp_path / "update.csv"
+    csv_path.write_text("destination_id,name,location,category\n1,Gokyo Ri,,Trekking\n")
+    ingest_file(csv_path, engine=engine)
+
+    row = stored(engine, 1)
+    assert row["name"] == "Gokyo Ri"
+    assert row["altitude"] == 5357
+    assert row["category"] == "Trekking"
+    assert row["location"] == "Solukhumbu"
+    assert row["permits_required"] is True
+    assert row["activities"] == ["trekking"]
+
+
+def test_malformed_jsonl_lines_are_rejected(engine, tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"destination_id": 1, "name": "Lumbini"}),
+        '{"destination_id": 2, "name": ',
+        "[3]",
+        json.dumps({"destination_id": 4, "name": "Bandipur"}),
+    ]) + "\n")
+
+    report = ingest_file(path, batch_size=1, engine=engine)
+
+    assert report.rows == 2
+    assert report.rejected == 2
+    assert [error.split(":")[0] for error in report.errors] == ["line 2", "line 3"]
+    assert stored(engine, 4)["name"] == "Bandipur"
@@ -0,0 +1,67 @@
+"""
+Auto-generated itineraries must fit the requested duration once transfer
+days between stops are added to the days spent at each stop.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.routes.itineraries import _plan_trip
+from app.services.catalog import DISPLAY_FIELDS, CatalogSnapshot
+from benchmarks.synthetic import generate_destinations
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    rows = [{name: getattr(dest, name) for name in DISPLAY_FIELDS} for dest in generate_destinations(300)]
+    return CatalogSnapshot(version="test", loaded_at=datetime.utcnow(), rows=rows)
+
+
+@pytest.mark.parametrize("duration_days", [3, 7, 10, 14, 20, 30])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trip_fits_duration_with_transfers(snapshot, duration_days, seed):
+    values = np.random.default_rng(seed).random(len(snapshot))
+
+    selection, stops, route = _plan_trip(values, snapshot, duration_days, budget=duration_days * 200)
+
+    assert stops
+    assert route["total_days"] <= duration_days
+    assert stops[-1]["end_day"] == route["total_days"]
+    assert route["total_days"] == selection.days + route["total_transfer_days"]
+
+
+def test_selections_share_one_time_budget(snapshot, monkeypatch):
+    import app.routes.itineraries as itineraries
+
+    calls = []
+    select = itineraries.select_destinations
+
+    def timed_select(*args, time_budget_ms, **kwargs):
+        start = time.perf_counter()
+        selection = select(*args, time_budget_ms=time_budget_ms, **kwargs)
+        calls.append((time_budget_ms, (time.perf_counter() - start) * 1000))
+        return selection
+
+    monkeypatch.setattr(itineraries, "select_destinations", timed_select)
+    values = np.random.default_rng(0).random(len(snapshot))
+
+    _plan_trip(values, snapshot, 30, budget=6000, time_budget_ms=20)
+
+    # Transfers push the first choice over, so it is chosen again
+    assert len(calls) > 1
+    # Each selection is only given what the earlier ones left over
+    spent = 0.0
+    for budget_ms, took_ms in calls:
+        assert budget_ms <= 20 - spent
+        spent += took_ms
+
+
+def test_spent_time_budget_still_returns_a_fitting_trip(snapshot):
+    values = np.random.default_rng(0).random(len(snapshot))
+
+    selection, stops, route = _plan_trip(values, snapshot, 14, budget=2800, time_budget_ms=0)
+
+    assert stops
+    assert route["total_days"] <= 14
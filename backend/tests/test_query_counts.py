@@ -0,0 +1,92 @@
+"""
+SQL statement budgets for the recommendation routes. Each handler is called
+directly and its statements counted, so an N+1 lookup creeping back in fails
+here no matter how many results a request asks for.
+"""
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.ml_engine.precompute import precompute_recommendations
+from app.ml_engine.recommender import TourismRecommender
+from app.routes import recommendations as routes
+from app.schemas.preference import BatchRecommendationRequest, RecommendationRequest
+from benchmarks.synthetic import seed_database
+
+N_DESTINATIONS = 200
+N_USERS = 100
+
+# Maximum statements per request, independent of the number of results
+BUDGETS = {
+    "recommend (live)": 2,     # preferences + stored-rows probe
+    "recommend (stored)": 2,   # preferences + stored rows
+    "recommend/batch": 1,      # preferences for every user
+}
+
+
+class QueryCounter:
+    """Count statements executed on an engine"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def measure(self, fn) -> int:
+        self.count = 0
+        fn()
+        return self.count
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    Base.metadata.create_all(bind=engine)
+    seed_database(engine, N_DESTINATIONS, N_USERS)
+
+    # A model of its own, never persisted, in place of the app-wide one
+    monkeypatch.setattr(settings, "MODEL_ARTIFACT_PATH", str(tmp_path / "recommender.joblib"))
+    monkeypatch.setattr(routes, "recommender", TourismRecommender())
+    routes.recommendation_cache.clear()
+
+    session = sessionmaker(bind=engine)()
+    try:
+        routes.recommender.train(session)
+        yield session
+    finally:
+        session.close()
+        routes.recommendation_cache.clear()
+        engine.dispose()
+
+
+@pytest.mark.parametrize("limit", [10, settings.PRECOMPUTE_TOP_N])
+def test_recommendation_routes_within_query_budget(db, limit):
+    counter = QueryCounter(db.get_bind())
+    request = RecommendationRequest(limit=limit)
+    user_ids = list(range(1, N_USERS + 1))
+
+    def live():
+        routes.recommendation_cache.clear()
+        routes.get_recommendations(1, request, BackgroundTasks(), near=None, db=db)
+
+    def stored():
+        routes.recommendation_cache.clear()
+        routes.get_recommendations(2, request, BackgroundTasks(), near=None, db=db)
+
+    def batch():
+        routes.get_recommendations_batch(
+            BatchRecommendationRequest(user_ids=user_ids, limit=limit), near=None, db=db
+        )
+
+    counts = {"recommend (live)": counter.measure(live)}
+    precompute_recommendations(db, user_ids=[2], top_n=limit, recommender=routes.recommender)
+    counts["recommend (stored)"] = counter.measure(stored)
+    counts["recommend/batch"] = counter.measure(batch)
+
+    for route, count in counts.items():
+        assert count <= BUDGETS[route], f"{route}: {count} statements, budget {BUDGETS[route]}"
@@ -3,9 +3,13 @@ import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import api from '../services/api';
 
+const PAGE_SIZE = 20;
+
 function MyItineraries() {
   const [itineraries, setItineraries] = useState([]);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedItinerary, setSelectedItinerary] = useState(null);
   const [deleting, setDeleting] = useState(null);
 
@@ -24,8 +28,11 @@ function MyItineraries() {
   const fetchItineraries = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/itineraries/my-itineraries');
+      const response = await api.get('/itineraries/my-itineraries', {
+        params: { limit: PAGE_SIZE }
+      });
       setItineraries(response.data);
+      setTotal(Number(response.headers['x-total-count']) || response.data.length);
     } catch (err) {
       console.error('Error fetching itineraries:', err);
     } finally {
@@ -33,6 +40,31 @@ function MyItineraries() {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await api.get('/itineraries/my-itineraries', {
+        params: { skip: itineraries.length, limit: PAGE_SIZE }
+      });
+      setItineraries(prev => [...prev, ...response.data]);
+      setTotal(Number(response.headers['x-total-count']) || total);
+    } catch (err) {
+      console.error('Error loading more itineraries:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The list only holds summaries; stops are fetched when a trip is opened
+  const openItinerary = async (itinerary) => {
+    try {
+      const response = await api.get(`/itineraries/${itinerary.itinerary_id}`);
+      setSelectedItinerary(response.data);
+    } catch (err) {
+      alert('Failed to load itinerary details');
+    }
+  };
+
   const deleteItinerary = async (itineraryId) => {
     if (!window.confirm('Are you sure you want to delete this itinerary?')) {
       return;
@@ -42,6 +74,7 @@ function MyItineraries() {
       setDeleting(itineraryId);
       await api.delete(`/itineraries/${itineraryId}`);
       setItineraries(prev => prev.filter(i => i.itinerary_id !== itineraryId));
+      setTotal(prev => prev - 1);
       if (selectedItinerary?.itinerary_id === itineraryId) {
         setSelectedItinerary(null);
       }
@@ -131,7 +164,7 @@ function MyItineraries() {
       }}>
         <h1 style={{ margin: 0, fontSize: '2.5rem' }}>🗺️ My Itineraries</h1>
         <p style={{ margin: '10px 0 0', fontSize: '1.1rem' }}>
-          {itineraries.length} saved trip{itineraries.length !== 1 ? 's' : ''}
+          {total} saved trip{total !== 1 ? 's' : ''}
         </p>
       </div>
 
@@ -186,7 +219,7 @@ function MyItineraries() {
                     border: isSelected ? '2px solid #667eea' : '2px solid transparent',
                     transition: 'all 0.2s'
                   }}
-                  onClick={() => setSelectedItinerary(itinerary)}
+                  onClick={() => openItinerary(itinerary)}
                 >
                   <div style={{
                     display: 'flex',
@@ -236,7 +269,7 @@ function MyItineraries() {
                     }}>
                       <div style={{ fontSize: '20px', marginBottom: '5px' }}>📍</div>
                       <div style={{ fontSize: '18px', fontWeight: '600', color: '#667eea' }}>
-                        {itinerary.destinations.length}
+                        {itinerary.destination_count}
                       </div>
                       <div style={{ fontSize: '11px', color: '#666' }}>Destinations</div>
                     </div>
@@ -271,7 +304,7 @@ function MyItineraries() {
                   <button
                     onClick={(e) => {
                       e.stopPropagation();
-                      setSelectedItinerary(itinerary);
+                      openItinerary(itinerary);
                     }}
                     style={{
                       width: '100%',
@@ -290,6 +323,25 @@ function MyItineraries() {
                 </div>
               );
             })}
+
+            {itineraries.length < total && (
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                style={{
+                  padding: '12px',
+                  background: 'white',
+                  color: '#667eea',
+                  border: '2px solid #667eea',
+                  borderRadius: '8px',
+                  cursor: 'pointer',
+                  fontWeight: '600',
+                  fontSize: '14px'
+                }}
+              >
+                {loadingMore ? 'Loading...' : 'Load More'}
+              </button>
+            )}
           </div>
 
           {/* Detail Panel */}